@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#    Monk is an unobtrusive data modeling, manipulation and validation library.
+#    Copyright © 2011—2015  Andrey Mikhaylenko
+#
+#    This file is part of Monk.
+#
+#    Monk is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published
+#    by the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Monk is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU Lesser General Public License
+#    along with Monk.  If not, see <http://gnu.org/licenses/>.
+"""
+Compares row-wise and columnar validation of a batch of flat records.
+Requires `numpy`.
+
+Usage::
+
+    $ python benchmarks/bench_columnar.py [RECORDS]
+
+"""
+from __future__ import print_function
+import os
+import sys
+from timeit import default_timer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from monk import InRange, Length, nullable, one_of, opt_key, validate_many
+from monk.columnar import validate_columns
+
+
+SPEC = {
+    'id': int,
+    'name': Length(1, 100),
+    'age': InRange(0, 150),
+    'score': float,
+    'status': one_of(['new', 'done']),
+    opt_key('note'): nullable(str),
+}
+
+
+def make_record(i):
+    record = {
+        'id': i,
+        'name': 'user {0}'.format(i),
+        'age': 200 if i % 100 == 0 else i % 100,  # 1% is out of range
+        'score': i / 7.0,
+        'status': 'new' if i % 2 else 'done',
+    }
+    if i % 3:
+        record['note'] = None
+    return record
+
+
+def run(label, func):
+    started = default_timer()
+    failed = func()
+    print('{0:18} {1:.3f} s  ({2} invalid)'.format(
+        label, default_timer() - started, failed))
+
+
+def main(size):
+    records = [make_record(i) for i in range(size)]
+    print('{0} records'.format(size))
+    run('validate_many()',
+        lambda: sum(1 for i, e in validate_many(SPEC, records) if e))
+    run('validate_columns()', lambda: len(validate_columns(SPEC, records)))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#    Monk is an unobtrusive data modeling, manipulation and validation library.
+#    Copyright © 2011—2015  Andrey Mikhaylenko
+#
+#    This file is part of Monk.
+#
+#    Monk is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published
+#    by the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Monk is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU Lesser General Public License
+#    along with Monk.  If not, see <http://gnu.org/licenses/>.
+"""
+Compares interpreted and compiled validation of a nested document.
+
+Usage::
+
+    $ python benchmarks/bench_compiler.py
+
+"""
+from __future__ import print_function
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import monk
+from monk import InRange, Length, nullable, opt_key, optimize, translate
+
+
+ADDRESS = {
+    'street': str,
+    'city': str,
+    'zip': Length(min=5, max=10),
+    opt_key('country'): str,
+}
+
+SPEC = {
+    'name': str,
+    'age': InRange(0, 150),
+    'email': nullable(str),
+    'address': ADDRESS,
+    'tags': [str],
+    'orders': [{
+        'id': int,
+        'total': InRange(min=0),
+        'shipping': ADDRESS,
+        'items': [{'sku': str, 'qty': InRange(1, 1000)}],
+    }],
+}
+
+ADDRESS_VALUE = {'street': 'Main St. 1', 'city': 'Springfield', 'zip': '12345'}
+
+VALUE = {
+    'name': 'John',
+    'age': 42,
+    'email': None,
+    'address': ADDRESS_VALUE,
+    'tags': ['a', 'b', 'c'],
+    'orders': [{
+        'id': i,
+        'total': 100.5,
+        'shipping': ADDRESS_VALUE,
+        'items': [{'sku': 'X-{0}'.format(j), 'qty': 1} for j in range(5)],
+    } for i in range(10)],
+}
+
+
+def bench(label, func, number):
+    seconds = min(timeit.repeat(lambda: func(VALUE), number=number, repeat=3))
+    print('{0:<12} {1:>10.1f} µs/doc'.format(label, seconds / number * 1e6))
+    return seconds
+
+
+def main(number=2000):
+    interpreted = translate(SPEC)
+    compiled = monk.compile(SPEC)
+    t_interpreted = bench('interpreted', interpreted, number)
+    bench('optimized', optimize(interpreted), number)
+    t_compiled = bench('compiled', compiled, number)
+    print('speedup: {0:.1f}×'.format(t_interpreted / t_compiled))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#    Monk is an unobtrusive data modeling, manipulation and validation library.
+#    Copyright © 2011—2015  Andrey Mikhaylenko
+#
+#    This file is part of Monk.
+#
+#    Monk is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published
+#    by the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Monk is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU Lesser General Public License
+#    along with Monk.  If not, see <http://gnu.org/licenses/>.
+"""
+Measures validation of flat dictionaries with 10, 100 and 1000 keys.
+
+Usage::
+
+    $ python benchmarks/bench_dictof.py
+
+"""
+from __future__ import print_function
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from monk import opt_key, translate
+
+
+def make_case(size, with_patterns):
+    spec = {}
+    value = {}
+    for i in range(size):
+        key = 'field_{0}'.format(i)
+        if i % 3:
+            spec[key] = int
+        else:
+            spec[opt_key(key)] = int
+        value[key] = i
+    if with_patterns:
+        # free-form keys are checked after all literal ones
+        spec[opt_key(str)] = str
+        value['x-custom'] = 'custom'
+    return translate(spec), value
+
+
+def main():
+    for with_patterns in (False, True):
+        print('literal keys' + (' + a pattern key' if with_patterns else ''))
+        for size in (10, 100, 1000):
+            validator, value = make_case(size, with_patterns)
+            number = max(1, 2000 // size)
+            seconds = min(timeit.repeat(lambda: validator(value),
+                                        number=number, repeat=3))
+            print('  {0:>5} keys: {1:>12.1f} µs/doc'.format(
+                size, seconds / number * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#    Monk is an unobtrusive data modeling, manipulation and validation library.
+#    Copyright © 2011—2015  Andrey Mikhaylenko
+#
+#    This file is part of Monk.
+#
+#    Monk is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published
+#    by the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Monk is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU Lesser General Public License
+#    along with Monk.  If not, see <http://gnu.org/licenses/>.
+"""
+Measures memory taken by a registry of 300 schemas and by the errors
+collected while validating a batch of invalid documents.  Requires Python 3
+(uses `tracemalloc`).
+
+Usage::
+
+    $ python benchmarks/bench_memory.py
+
+"""
+from __future__ import print_function
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from monk import (
+    ValidationError, nullable, opt_key, optional, translate, translation_cache,
+)
+
+
+def make_spec(i):
+    address = {'street': str, 'city': str, opt_key('zip'): nullable(str)}
+    return {
+        'name_{0}'.format(i): str,
+        'billing': address,
+        'shipping': optional(address),
+        'total': {'amount': float, 'currency': 'EUR'},
+        'lines': [{'sku': str, 'qty': int, opt_key('note'): str}],
+        'audit': {'created': int, 'by': str, opt_key('tags'): [str]},
+    }
+
+
+def measure(func):
+    tracemalloc.start()
+    result = func()
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def build_registry():
+    translation_cache.maxsize = 0
+    return [translate(make_spec(i)) for i in range(300)]
+
+
+def collect_errors():
+    validator = translate({'a': int})
+    errors = []
+    for i in range(10000):
+        try:
+            validator({'a': str(i)})
+        except ValidationError as e:
+            # tracebacks keep whole frames alive; only measure the errors
+            e.__context__ = None
+            errors.append(e.with_traceback(None))
+    return errors
+
+
+def main():
+    registry, size = measure(build_registry)
+    print('registry of {0} schemas: {1:>8.1f} KiB'.format(
+        len(registry), size / 1024.))
+    errors, size = measure(collect_errors)
+    print('{0} errors:           {1:>8.1f} KiB'.format(
+        len(errors), size / 1024.))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#    Monk is an unobtrusive data modeling, manipulation and validation library.
+#    Copyright © 2011—2015  Andrey Mikhaylenko
+#
+#    This file is part of Monk.
+#
+#    Monk is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published
+#    by the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Monk is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU Lesser General Public License
+#    along with Monk.  If not, see <http://gnu.org/licenses/>.
+"""
+Measures merging of defaults into a typical document: an empty one, a
+partially filled one and a complete one.  Then compares merging into
+a copy with merging in place (as `StructuredDictMixin` does), merging
+followed by validation with `normalize()` on valid documents and the
+merge plans with a merger generated by `compile_merger()`.
+
+Usage::
+
+    $ python benchmarks/bench_merge.py
+
+"""
+from __future__ import print_function
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from monk import (
+    compile_merger, merge_defaults, normalize, nullable, one_of, opt_key,
+    translate, validate,
+)
+
+
+SPEC = {
+    'title': 'untitled',
+    'status': one_of(['draft', 'published'], first_is_default=True),
+    'views': 0,
+    'rating': nullable(float),
+    opt_key('summary'): str,
+    'author': {
+        'name': str,
+        'email': nullable(str),
+        'roles': [str],
+    },
+    'tags': [str],
+    'comments': [{
+        'text': str,
+        'score': 0,
+        'flags': {'spam': False, 'hidden': False},
+    }],
+}
+
+EMPTY = {}
+
+PARTIAL = {
+    'title': 'Hello',
+    'author': {'name': 'john'},
+    'comments': [{'text': 'first'}, {'text': 'second', 'score': 5}],
+}
+
+COMPLETE = merge_defaults(SPEC, dict(PARTIAL, tags=['a', 'b', 'c']))
+
+VALID = {
+    'title': 'Hello',
+    'author': {'name': 'john', 'roles': ['admin']},
+    'tags': ['a', 'b', 'c'],
+    'comments': [{'text': 'first'}, {'text': 'second', 'score': 5}],
+}
+
+VALID_LONG = dict(VALID, comments=VALID['comments'] * 50)
+
+
+def insert_defaults(validator, value):
+    # same as `StructuredDictMixin._insert_defaults()`
+    document = dict(value)
+    document.update(merge_defaults(validator, document))
+    return document
+
+
+def insert_defaults_inplace(validator, value):
+    document = dict(value)
+    merge_defaults(validator, document, inplace=True)
+    return document
+
+
+def merge_and_validate(validator, value):
+    merged = merge_defaults(validator, value)
+    validate(validator, merged)
+    return merged
+
+
+def measure(func, number):
+    seconds = min(timeit.repeat(func, number=number, repeat=3))
+    return seconds / number * 1e6
+
+
+def main():
+    validator = translate(SPEC)
+    print('merge_defaults')
+    for label, value in ('empty', EMPTY), ('partial', PARTIAL), \
+            ('complete', COMPLETE):
+        print('  {0:>10}: {1:>8.1f} µs/doc'.format(
+            label, measure(lambda: merge_defaults(validator, value), 20000)))
+
+    print('inserting defaults into a document: copy + update vs in place')
+    for label, value, number in ('complete', VALID_LONG, 1000), \
+            ('partial', PARTIAL, 20000):
+        copied = measure(lambda: insert_defaults(validator, value), number)
+        # the nested containers are only updated on the first run
+        inplace = measure(lambda: insert_defaults_inplace(validator, value),
+                          number)
+        print('  {0:>12}: {1:>8.1f} → {2:>8.1f} µs/doc'.format(
+            label, copied, inplace))
+
+    print('merge_defaults + validate vs normalize')
+    for label, value, number in ('valid', VALID, 20000), \
+            ('100 comments', VALID_LONG, 1000):
+        assert normalize(validator, value) == merge_and_validate(validator,
+                                                                 value)
+        two_pass = measure(lambda: merge_and_validate(validator, value),
+                           number)
+        one_pass = measure(lambda: normalize(validator, value), number)
+        print('  {0:>12}: {1:>8.1f} → {2:>8.1f} µs/doc'.format(
+            label, two_pass, one_pass))
+
+    print('merge_defaults vs compile_merger')
+    merge = compile_merger(SPEC)
+    for label, value in ('empty', EMPTY), ('partial', PARTIAL), \
+            ('complete', COMPLETE):
+        assert merge(value) == merge_defaults(validator, value)
+        planned = measure(lambda: merge_defaults(validator, value), 20000)
+        compiled = measure(lambda: merge(value), 20000)
+        print('  {0:>12}: {1:>8.1f} → {2:>8.1f} µs/doc'.format(
+            label, planned, compiled))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#    Monk is an unobtrusive data modeling, manipulation and validation library.
+#    Copyright © 2011—2015  Andrey Mikhaylenko
+#
+#    This file is part of Monk.
+#
+#    Monk is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published
+#    by the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Monk is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU Lesser General Public License
+#    along with Monk.  If not, see <http://gnu.org/licenses/>.
+"""
+Measures `validate_many()` with 1 to N worker processes (N being the number
+of CPUs) against the single-process mode.  Requires Python 3.7+.
+
+Usage::
+
+    $ python benchmarks/bench_parallel.py
+
+"""
+from __future__ import print_function
+import multiprocessing
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from monk import BatchStats, nullable, opt_key, validate_many
+
+
+SPEC = {
+    'id': int,
+    'title': str,
+    'tags': [str],
+    'lines': [{'sku': str, 'qty': int, opt_key('note'): nullable(str)}],
+}
+
+
+def make_values(count):
+    values = []
+    for i in range(count):
+        lines = [{'sku': 'x{0}'.format(j), 'qty': j} for j in range(10)]
+        if i % 100 == 0:
+            lines[-1]['qty'] = 'many'
+        values.append({'id': i, 'title': 'item', 'tags': ['a', 'b'],
+                       'lines': lines})
+    return values
+
+
+def run(values, workers):
+    stats = BatchStats()
+    for _ in validate_many(SPEC, values, stats=stats, workers=workers):
+        pass
+    return stats
+
+
+def main():
+    values = make_values(100000)
+    baseline = run(values, None)
+    print('single process: {0:>9.0f} docs/s'.format(baseline.per_second))
+    for workers in range(1, multiprocessing.cpu_count() + 1):
+        stats = run(values, workers)
+        print('{0:>2} workers:    {1:>9.0f} docs/s  ({2:.1f}×)'.format(
+            workers, stats.per_second,
+            stats.per_second / baseline.per_second))
+
+
+if __name__ == '__main__':
+    main()
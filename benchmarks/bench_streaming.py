@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#    Monk is an unobtrusive data modeling, manipulation and validation library.
+#    Copyright © 2011—2015  Andrey Mikhaylenko
+#
+#    This file is part of Monk.
+#
+#    Monk is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published
+#    by the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Monk is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU Lesser General Public License
+#    along with Monk.  If not, see <http://gnu.org/licenses/>.
+"""
+Compares peak memory and time of validating a JSON export loaded as a whole
+and read as a stream.  Requires Python 3 (uses `tracemalloc`).
+
+Usage::
+
+    $ python benchmarks/bench_streaming.py [ITEMS]
+
+"""
+from __future__ import print_function
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+from timeit import default_timer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from monk import opt_key, translate, validate_json
+
+
+SPEC = [{
+    'name': str,
+    'total': {'amount': float, 'currency': str},
+    'lines': [{'sku': str, 'qty': int, opt_key('note'): str}],
+}]
+
+
+def make_item(i):
+    return {
+        'name': 'order {0}'.format(i),
+        'total': {'amount': i * 1.5, 'currency': 'EUR'},
+        'lines': [{'sku': 'sku-{0}'.format(j), 'qty': j} for j in range(5)],
+    }
+
+
+def measure(func):
+    tracemalloc.start()
+    started = default_timer()
+    func()
+    elapsed = default_timer() - started
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, elapsed
+
+
+def main(items):
+    validator = translate(SPEC)
+    with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+        json.dump([make_item(i) for i in range(items)], f)
+    try:
+        print('{0} items, {1} KiB'.format(
+            items, os.path.getsize(f.name) // 1024))
+
+        def loaded():
+            with open(f.name) as stream:
+                validator(json.load(stream))
+
+        def streamed():
+            with open(f.name) as stream:
+                validate_json(validator, stream)
+
+        for label, func in ('json.load()', loaded), ('validate_json()',
+                                                      streamed):
+            peak, elapsed = measure(func)
+            print('{0:16} peak {1:7} KiB  {2:.3f} s'.format(
+                label, peak // 1024, elapsed))
+    finally:
+        os.unlink(f.name)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
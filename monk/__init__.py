@@ -36,3 +36,11 @@ from .validators import *
 from .manipulation import *
 from .shortcuts import *
 from .helpers import *
+from .compiler import *
+from .streaming import *
+
+
+# `compile` is available as `monk.compile` but `from monk import *` must not
+# shadow the built-in function
+__all__ = sorted(name for name in globals()
+                 if not name.startswith('_') and name != 'compile')
@@ -0,0 +1,237 @@
+# coding: utf-8
+#
+#    Monk is an unobtrusive data modeling, manipulation and validation library.
+#    Copyright © 2011—2015  Andrey Mikhaylenko
+#
+#    This file is part of Monk.
+#
+#    Monk is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published
+#    by the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Monk is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU Lesser General Public License
+#    along with Monk.  If not, see <http://gnu.org/licenses/>.
+"""
+~~~~~~~~~~~~~~~
+Asyncio support
+~~~~~~~~~~~~~~~
+
+Validation of a large document can block the event loop for a noticeable
+time.  :func:`validate_async` checks the value exactly as
+:func:`~monk.helpers.validate` does but lets other tasks run every now and
+then::
+
+    async def handle(request):
+        payload = await request.json()
+        await validate_async(spec, payload)
+
+Requires Python 3.5+.  This module is not imported by the `monk` package.
+"""
+import asyncio
+from timeit import default_timer
+
+from .errors import ValidationError, InvalidKeys, MissingKeys
+from .validators import (
+    MISSING, All, Any, DictOf, Equals, ListOfAll, ListOfAny, translate,
+    _current_sample,
+    _dict_value_error,
+    _is_collecting_all_errors,
+    _matches_or_type_error,
+)
+
+
+__all__ = ['validate_async']
+
+
+async def validate_async(spec, value, nodes=1000, microseconds=1000):
+    """
+    Validates given value against given spec.  Raises the same exceptions
+    as :func:`~monk.helpers.validate`.
+
+    The validator tree is walked as usual but control is returned to the
+    event loop after checking `nodes` values or after `microseconds` have
+    passed since the last pause, whichever comes first.  Lists, dictionaries
+    and combinators are walked cooperatively; other validators are called
+    as is.
+    """
+    validator = translate(spec)
+    if _is_collecting_all_errors():
+        # the flag is thread-local, so it could change during a pause
+        validator(value)
+        return
+    await _check(validator, value, _Budget(nodes, microseconds))
+
+
+class _Budget(object):
+    def __init__(self, nodes, microseconds):
+        self.nodes = nodes
+        self.seconds = microseconds / 1e6
+        self.reset()
+
+    def reset(self):
+        self._left = self.nodes
+        self._deadline = default_timer() + self.seconds
+
+    def spend(self):
+        "Returns `True` if it's time to let other tasks run."
+        self._left -= 1
+        return self._left <= 0 or default_timer() >= self._deadline
+
+    async def pause(self):
+        await asyncio.sleep(0)
+        self.reset()
+
+
+async def _check(validator, value, budget):
+    # see BaseValidator.__call__ and BaseRequirement.__call__
+    if budget.spend():
+        await budget.pause()
+
+    handler = _HANDLERS.get(type(validator))
+    if handler is None:
+        validator(value)
+        return
+
+    implies = getattr(validator, 'implies', NotImplemented)
+    if implies is not NotImplemented:
+        implies(value)
+
+    if validator.negated:
+        try:
+            await handler(validator, value, budget)
+        except ValidationError:
+            return
+        validator._raise_error(value)
+    else:
+        await handler(validator, value, budget)
+
+
+def _combined_error(validator, errors):
+    # see BaseCombinator._check
+    error = validator.error_class(*errors)
+    error._validator = validator
+    error._combined = True
+    return error
+
+
+async def _check_all(validator, value, budget):
+    for spec in validator._specs:
+        await _check(spec, value, budget)
+
+
+async def _check_any(validator, value, budget):
+    errors = []
+    for spec in validator._specs:
+        try:
+            await _check(spec, value, budget)
+        except ValidationError as e:
+            errors.append(e)
+        else:
+            return
+    raise _combined_error(validator, errors)
+
+
+async def _check_list_of(validator, value, budget):
+    # see BaseListOf._check
+    if validator._sample is not None or _current_sample() is not None:
+        # only a few items are checked anyway
+        validator._check(value)
+        return
+
+    nested = validator._nested_validator
+    if not value:
+        try:
+            nested(MISSING)
+        except ValidationError as e:
+            raise ValidationError._wrap(e, 'lacks item: {error}')
+
+    # values of simple validators are checked in place to avoid creating
+    # a coroutine for each item
+    simple = type(nested) not in _HANDLERS
+    if type(validator) is ListOfAll:
+        for i, item in enumerate(value):
+            try:
+                if simple:
+                    nested(item)
+                    if budget.spend():
+                        await budget.pause()
+                else:
+                    await _check(nested, item, budget)
+            except ValidationError as e:
+                raise ValidationError._wrap(e, 'item #{0}: {error}', i)
+        return
+
+    errors = []
+    for i, item in enumerate(value):
+        try:
+            if simple:
+                nested(item)
+            else:
+                await _check(nested, item, budget)
+        except ValidationError as e:
+            errors.append(ValidationError._wrap(e, 'item #{0}: {error}', i))
+        else:
+            return
+        # most items fail here, so the budget is spent on failures
+        if simple and budget.spend():
+            await budget.pause()
+    raise _combined_error(validator, errors)
+
+
+async def _check_dict_of(validator, value, budget):
+    # see DictOf._check; the order of checks must be preserved
+    value = value or {}
+    validated_data_keys = set()
+    missing_key_specs = []
+    pairs = zip(validator._pairs, validator._index)
+    for (k_validator, v_validator), literal in pairs:
+        if literal is not None:
+            k, is_required = literal
+            if k in value and k not in validated_data_keys:
+                try:
+                    await _check(v_validator, value[k], budget)
+                except (ValidationError, TypeError) as e:
+                    raise _dict_value_error(k, e)
+                validated_data_keys.add(k)
+            elif is_required:
+                missing_key_specs.append(k_validator)
+            continue
+
+        matched = False
+        for k, v in value.items():
+            if k in validated_data_keys:
+                continue
+            if not _matches_or_type_error(k_validator, k):
+                continue
+            try:
+                await _check(v_validator, v, budget)
+            except (ValidationError, TypeError) as e:
+                raise _dict_value_error(k, e)
+            validated_data_keys.add(k)
+            matched = True
+
+        if not matched and not k_validator.matches(MISSING):
+            missing_key_specs.append(k_validator)
+
+    if len(validated_data_keys) < len(value):
+        raise InvalidKeys(*(set(value) - validated_data_keys))
+
+    if missing_key_specs:
+        reprs = (spec._expected_value if isinstance(spec, Equals) else spec
+                 for spec in missing_key_specs)
+        raise MissingKeys(*reprs)
+
+
+_HANDLERS = {
+    All: _check_all,
+    Any: _check_any,
+    ListOfAll: _check_list_of,
+    ListOfAny: _check_list_of,
+    DictOf: _check_dict_of,
+}
@@ -0,0 +1,273 @@
+# coding: utf-8
+#
+#    Monk is an unobtrusive data modeling, manipulation and validation library.
+#    Copyright © 2011—2015  Andrey Mikhaylenko
+#
+#    This file is part of Monk.
+#
+#    Monk is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published
+#    by the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Monk is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU Lesser General Public License
+#    along with Monk.  If not, see <http://gnu.org/licenses/>.
+"""
+~~~~~~~~~~~~~~~~~~~
+Columnar validation
+~~~~~~~~~~~~~~~~~~~
+
+Validating a large batch of flat records one by one means calling a
+validator for each field of each record.  :func:`validate_columns` instead
+splits the batch into per-key columns and checks each column at once with
+NumPy::
+
+    >>> spec = {'name': str, 'age': InRange(0, 150), opt_key('note'): str}
+    >>> validate_columns(spec, [
+    ...     {'name': 'john', 'age': 30},
+    ...     {'name': 'mary', 'age': 200},
+    ... ])
+    [(1, DictValueError("'age' value must belong to 0..150"))]
+
+Columns are checked for :class:`~monk.validators.IsA`,
+:class:`~monk.validators.InRange`, :class:`~monk.validators.Length`,
+:class:`~monk.validators.Equals`, :class:`~monk.validators.OneOf` and
+their combinations; other validators are called for each value of their
+column.  Records that may be invalid are then validated as usual, so the
+errors are exactly those raised by the validator itself.
+
+Requires `numpy`.  This module is not imported by the `monk` package.
+"""
+import numpy as np
+
+from .errors import ValidationError
+from .validators import (
+    All, Any, Anything, DictOf, Equals, InRange, IsA, Length, OneOf,
+    translate,
+    _matches_or_type_error,
+)
+
+
+__all__ = ['validate_columns']
+
+
+# integers beyond this are not exactly representable as float64
+EXACT_FLOAT_LIMIT = 2 ** 53
+
+SCALAR_TYPES = frozenset([int, float, bool, str, type(u''), type(None)])
+
+SIZED_TYPES = frozenset([str, type(u''), bytes, list, tuple, dict, set,
+                         frozenset])
+
+
+def validate_columns(spec, records):
+    """
+    Validates each of given records against given spec.  Returns a list of
+    pairs ``(index, error)`` for invalid records, i.e. the same as
+    ``validate_many(spec, records, on_error='collect')`` generates for them.
+
+    The columnar checks are used if the spec is a :class:`~monk.DictOf` with
+    literal keys only (e.g. ``{'a': int, opt_key('b'): str}``); otherwise
+    each record is validated as usual.
+    """
+    validator = translate(spec)
+    records = list(records)
+    valid = _valid_records(validator, records)
+    result = []
+    for index in np.flatnonzero(~valid):
+        index = int(index)
+        try:
+            validator(records[index])
+        except ValidationError as e:
+            result.append((index, e))
+    return result
+
+
+def _is_flat(validator):
+    if type(validator) is not DictOf or validator.negated:
+        return False
+    if any(literal is None for literal in validator._index):
+        return False
+    keys = [key for key, is_required in validator._index]
+    return len(set(keys)) == len(keys)
+
+
+def _valid_records(validator, records):
+    # Returns a mask of records which are known to be valid.  The rest may
+    # be invalid and must be checked row-wise.
+    size = len(records)
+    if not _is_flat(validator):
+        return np.zeros(size, dtype=bool)
+
+    valid = np.fromiter((type(x) is dict for x in records), bool, size)
+    rows = records if valid.all() else [x if type(x) is dict else {}
+                                        for x in records]
+    known_keys = np.zeros(size, dtype=np.int64)
+    for (_, v_validator), (key, is_required) in zip(validator._pairs,
+                                                    validator._index):
+        present = np.fromiter((key in row for row in rows), bool, size)
+        column = _Column([row.get(key) for row in rows])
+        # the values of missing keys are not checked
+        valid &= np.where(present, _mask(v_validator, column), not is_required)
+        known_keys += present
+
+    # unknown keys
+    valid &= np.fromiter(map(len, rows), np.int64, size) == known_keys
+    return valid
+
+
+class _Column(object):
+    "The values of a key with lazily computed NumPy views."
+    def __init__(self, values):
+        self.values = values
+        self.size = len(values)
+        self._objects = None
+        self._types = None
+        self._type_set = None
+
+    @property
+    def objects(self):
+        if self._objects is None:
+            self._objects = np.fromiter(self.values, object, self.size)
+        return self._objects
+
+    @property
+    def types(self):
+        if self._types is None:
+            self._types = np.fromiter(map(type, self.values), object,
+                                      self.size)
+            self._type_set = set(self._types)
+        return self._types
+
+    def of_types(self, accepted):
+        "Returns a mask of values which types are in `accepted`."
+        types = self.types
+        mask = np.zeros(self.size, dtype=bool)
+        for tp in self._type_set:
+            if tp in accepted:
+                mask |= types == tp
+        return mask
+
+    def subclasses_of(self, expected_type):
+        "Returns a mask of values which are instances of `expected_type`."
+        types = self.types
+        mask = np.zeros(self.size, dtype=bool)
+        for tp in self._type_set:
+            if issubclass(tp, expected_type):
+                mask |= types == tp
+        return mask
+
+
+def _mask(validator, column):
+    # Returns a mask of values which are known to pass `validator`.  It may
+    # be pessimistic but must never accept an invalid value.
+    if not validator.negated:
+        handler = _HANDLERS.get(type(validator))
+        if handler is not None:
+            result = handler(validator, column)
+            if result is not None:
+                return result
+    return np.fromiter((_matches_or_type_error(validator, x)
+                        for x in column.values), bool, column.size)
+
+
+def _mask_all(validator, column):
+    mask = np.ones(column.size, dtype=bool)
+    for spec in validator._specs:
+        mask &= _mask(spec, column)
+    return mask
+
+
+def _mask_any(validator, column):
+    mask = np.zeros(column.size, dtype=bool)
+    for spec in validator._specs:
+        mask |= _mask(spec, column)
+    return mask
+
+
+def _mask_anything(validator, column):
+    return np.ones(column.size, dtype=bool)
+
+
+def _mask_is_a(validator, column):
+    return column.subclasses_of(validator.expected_type)
+
+
+def _mask_equals(validator, column):
+    expected = validator._expected_value
+    if type(expected) not in SCALAR_TYPES:
+        return None
+    mask = column.of_types(SCALAR_TYPES)
+    mask[mask] = column.objects[mask] == expected
+    return mask
+
+
+def _mask_one_of(validator, column):
+    # values of scalar types are hashable
+    mask = column.of_types(SCALAR_TYPES)
+    found = map(validator._hashable_choices.__contains__, column.objects[mask])
+    mask[mask] = np.fromiter(found, bool, int(mask.sum()))
+    return mask
+
+
+def _mask_in_range(validator, column):
+    if not _is_exact_bound(validator._min) or not _is_exact_bound(
+            validator._max):
+        return None
+    mask = np.zeros(column.size, dtype=bool)
+    for tp, dtype in (int, np.int64), (float, np.float64):
+        selected = column.of_types([tp])
+        if not selected.any():
+            continue
+        try:
+            numbers = column.objects[selected].astype(dtype)
+        except OverflowError:
+            continue
+        mask[selected] = _within(numbers, validator._min, validator._max)
+    return mask
+
+
+def _mask_length(validator, column):
+    if not _is_exact_bound(validator._min) or not _is_exact_bound(
+            validator._max):
+        return None
+    mask = column.of_types(SIZED_TYPES)
+    lengths = np.fromiter(map(len, column.objects[mask]), np.int64,
+                          int(mask.sum()))
+    mask[mask] = _within(lengths, validator._min, validator._max)
+    return mask
+
+
+def _is_exact_bound(bound):
+    if bound is None:
+        return True
+    if type(bound) not in (int, float):
+        return False
+    return -EXACT_FLOAT_LIMIT <= bound <= EXACT_FLOAT_LIMIT
+
+
+def _within(numbers, min_, max_):
+    # large integers are compared as floats with float bounds
+    mask = np.abs(numbers) <= EXACT_FLOAT_LIMIT
+    if min_ is not None:
+        mask &= numbers >= min_
+    if max_ is not None:
+        mask &= numbers <= max_
+    return mask
+
+
+_HANDLERS = {
+    All: _mask_all,
+    Any: _mask_any,
+    Anything: _mask_anything,
+    IsA: _mask_is_a,
+    Equals: _mask_equals,
+    InRange: _mask_in_range,
+    Length: _mask_length,
+    OneOf: _mask_one_of,
+}
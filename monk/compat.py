@@ -38,13 +38,17 @@ func_types = (
 
 
 if sys.version_info < (3,0):
+    import __builtin__ as builtins
     text_types = unicode, str
     text_type = unicode
     binary_type = str
+    range = xrange
 else:
+    import builtins
     text_types = str,
     text_type = str
     binary_type = bytes
+    range = range
 
 
 def safe_str(value):
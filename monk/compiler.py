@@ -0,0 +1,655 @@
+# coding: utf-8
+#
+#    Monk is an unobtrusive data modeling, manipulation and validation library.
+#    Copyright © 2011—2015  Andrey Mikhaylenko
+#
+#    This file is part of Monk.
+#
+#    Monk is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published
+#    by the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Monk is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU Lesser General Public License
+#    along with Monk.  If not, see <http://gnu.org/licenses/>.
+"""
+~~~~~~~~
+Compiler
+~~~~~~~~
+
+Turns a validator tree into plain Python code.
+
+The interpreted validators are flexible but every node of the tree costs
+a few method calls and a ``try..except`` block.  :func:`compile` walks the
+tree once and generates a function where the checks of the well-known
+validators are inlined.  The compiled function raises the same exceptions
+with the same messages as the validator it was built from::
+
+    >>> check = compile({'name': str, 'age': InRange(0, 150)})
+    >>> check({'name': 'John', 'age': 25})
+    >>> check({'name': 'John', 'age': 200})
+    Traceback (most recent call last):
+    ...
+    DictValueError: 'age' value must belong to 0..150
+
+Validators of unknown classes (including subclasses of the built-in ones)
+are not inlined; the compiled code simply calls them.
+
+Merging defaults can be compiled as well: :func:`compile_merger` returns
+a function which gives the same result as
+:func:`~monk.manipulation.merge_defaults`::
+
+    >>> merge = compile_merger({'name': str, 'tags': [{'label': 'new'}]})
+    >>> merge({'tags': [{}]})
+    {'name': None, 'tags': [{'label': 'new'}]}
+"""
+from collections import OrderedDict
+
+from . import compat
+from . import validators
+from .errors import ValidationError, InvalidKeys, MissingKeys
+from .validators import (
+    MISSING, All, Any, Anything, BaseCombinator, BaseListOf, BaseValidator,
+    Contains, DictOf, Equals, Exists, HasAttr, InRange, IsA, Length,
+    ListOfAll, ListOfAny, OneOf, optimize, translate,
+    _FusedIsA,
+    _IsNone,
+    _current_sample,
+    _default_maker,
+    _defining_class,
+    _dict_value_error,
+    _is_collecting_all_errors,
+)
+
+
+__all__ = ['compile', 'compile_merger']
+
+
+#: Nested code is moved to a separate function at this indentation level
+#: (CPython refuses to compile too many statically nested blocks).
+MAX_INDENT = 12
+
+
+def compile(spec):
+    """
+    Returns a function which validates given value against given spec.
+    The function behaves exactly as the validator returned by
+    :func:`~monk.validators.translate` but is considerably faster.
+
+    :spec:
+        a validator instance or any value digestible by :func:`translate`.
+
+    The generated source code is available as the `source` attribute
+    of the returned function.
+
+    Within :func:`~monk.validators.collect_all_errors` or
+    :func:`~monk.validators.sampling` the compiled function simply calls
+    the validator.
+    """
+    validator = optimize(translate(spec))
+    emitter = _Emitter()
+    name = emitter.function(validator, entry=True)
+    return _build(emitter, name, validator)
+
+
+def compile_merger(spec):
+    """
+    Returns a function which merges defaults from given spec into a value.
+    The function returns the same as :func:`~monk.manipulation.merge_defaults`
+    but the literal keys of dictionaries and the defaults are inlined, so
+    only lists are walked in loops.
+
+    :spec:
+        a validator instance or any value digestible by :func:`translate`.
+
+    The returned function does not support merging in place.  Like with
+    :func:`compile`, the generated source code is available as the `source`
+    attribute.
+    """
+    validator = translate(spec)
+    emitter = _Emitter()
+    name = emitter.merge_function(validator)
+    return _build(emitter, name, validator)
+
+
+def _build(emitter, name, validator):
+    source = emitter.source()
+    code = compat.builtins.compile(source, '<monk: {0!r}>'.format(validator),
+                                   'exec')
+    exec(code, emitter.namespace)
+    func = emitter.namespace[name]
+    func.source = source
+    return func
+
+
+class _Emitter(object):
+    """
+    Collects the source code of generated functions and the objects they
+    refer to.
+    """
+    def __init__(self):
+        self.namespace = {
+            'MISSING': MISSING,
+            'ValidationError': ValidationError,
+            'InvalidKeys': InvalidKeys,
+            'MissingKeys': MissingKeys,
+            '_dict_value_error': _dict_value_error,
+            '_new_error': _new_error,
+            '_is_collecting_all_errors': _is_collecting_all_errors,
+            '_current_sample': _current_sample,
+        }
+        self._functions = []
+        self._lines = None
+        self._counter = 0
+
+    def name(self, prefix):
+        self._counter += 1
+        return '{0}{1}'.format(prefix, self._counter)
+
+    def const(self, value, prefix='c'):
+        name = self.name(prefix)
+        self.namespace[name] = value
+        return name
+
+    def line(self, indent, text):
+        self._lines.append('    ' * indent + text)
+
+    def function(self, validator, entry=False):
+        name = self.name('check_')
+        outer_lines = self._lines
+        self._lines = ['def {0}(value):'.format(name)]
+        if entry:
+            # the compiled code always stops early and checks all items
+            self.line(1, 'if _is_collecting_all_errors() or '
+                         '_current_sample():')
+            self.line(2, 'return {v}(value)'.format(
+                v=self.const(validator, 'v')))
+        _emit(self, validator, 'value', 1)
+        self.line(1, 'return None')
+        self._functions.append(self._lines)
+        self._lines = outer_lines
+        return name
+
+    def merge_function(self, validator):
+        name = self.name('merge_')
+        outer_lines = self._lines
+        self._lines = ['def {0}(value):'.format(name)]
+        self.line(1, 'return ' + _emit_merge(self, validator, 'value', 1))
+        self._functions.append(self._lines)
+        self._lines = outer_lines
+        return name
+
+    def source(self):
+        return '\n\n'.join('\n'.join(lines) for lines in self._functions)
+
+
+def _new_error(cls, validator, *args):
+    # see BaseValidator._raise_error
+    error = cls(*args)
+    error._validator = validator
+    return error
+
+
+def _error(emitter, validator, args=''):
+    return '_new_error({cls}, {v}{args})'.format(
+        cls=emitter.const(validator.error_class, 'E'),
+        v=emitter.const(validator, 'v'), args=args)
+
+
+def _predicate(emitter, validator, var):
+    """
+    Returns an expression which is true if the value passes given simple
+    validator, or `None` if the validator is not that simple.
+    """
+    cls = type(validator)
+    if cls is Anything:
+        expr = 'True'
+    elif cls is IsA or cls is _FusedIsA:
+        expr = 'isinstance({var}, {t})'.format(
+            var=var, t=emitter.const(validator.expected_type, 't'))
+    elif cls is _IsNone:
+        expr = '{var} is None'.format(var=var)
+    elif cls is Equals:
+        expr = 'not ({c} != {var})'.format(
+            var=var, c=emitter.const(validator._expected_value))
+    elif cls is Contains:
+        expr = '{c} in {var}'.format(
+            var=var, c=emitter.const(validator._expected_value))
+    elif cls is Exists:
+        expr = '{var} is not MISSING'.format(var=var)
+    elif cls is HasAttr:
+        expr = 'hasattr({var}, {c})'.format(
+            var=var, c=emitter.const(validator._attr_name))
+    elif cls is OneOf:
+        expr = '{v}._matches({var})'.format(
+            var=var, v=emitter.const(validator, 'v'))
+    else:
+        return None
+    if validator.negated:
+        expr = 'not ({0})'.format(expr)
+    return expr
+
+
+def _emit(emitter, validator, var, indent):
+    """
+    Emits code which raises an exception if the value stored in variable
+    `var` does not pass given validator.
+    """
+    if indent > MAX_INDENT:
+        func = emitter.function(validator)
+        emitter.line(indent, '{0}({1})'.format(func, var))
+        return
+
+    pred = _predicate(emitter, validator, var)
+    if pred is not None:
+        if pred != 'True':
+            emitter.line(indent, 'if not ({0}):'.format(pred))
+            emitter.line(indent + 1, 'raise ' + _error(emitter, validator))
+        return
+
+    handler = _HANDLERS.get(type(validator))
+    if handler is None:
+        emitter.line(indent, '{v}({var})'.format(
+            v=emitter.const(validator, 'v'), var=var))
+        return
+
+    # see BaseRequirement.__call__
+    implies = getattr(validator, 'implies', NotImplemented)
+    if implies is not NotImplemented:
+        _emit(emitter, implies, var, indent)
+
+    # see BaseValidator.__call__
+    if validator.negated:
+        emitter.line(indent, 'try:')
+        handler(emitter, validator, var, indent + 1)
+        emitter.line(indent, 'except ValidationError:')
+        emitter.line(indent + 1, 'pass')
+        emitter.line(indent, 'else:')
+        emitter.line(indent + 1, 'raise ' + _error(emitter, validator))
+    else:
+        handler(emitter, validator, var, indent)
+
+
+def _emit_all(emitter, validator, var, indent):
+    for spec in validator._specs:
+        _emit(emitter, spec, var, indent)
+    emitter.line(indent, 'pass')
+
+
+def _emit_any(emitter, validator, var, indent):
+    if validator._adaptive:
+        # the order of the checks changes at run time
+        emitter.line(indent, '{v}._check({var})'.format(
+            v=emitter.const(validator, 'v'), var=var))
+        return
+
+    # see Any._check: stop at the first nested validator that passes
+    preds = [_predicate(emitter, s, var) for s in validator._specs]
+    if None not in preds:
+        # all nested validators are simple; only build errors on failure
+        emitter.line(indent, 'if not ({0}):'.format(
+            ' or '.join('({0})'.format(p) for p in preds)))
+        errors = ''.join(', ' + _error(emitter, s) for s in validator._specs)
+        emitter.line(indent + 1, 'raise ' + _error(emitter, validator, errors))
+        return
+
+    errors = emitter.name('errors')
+    passed = emitter.name('passed')
+    emitter.line(indent, '{0} = []'.format(errors))
+    emitter.line(indent, '{0} = False'.format(passed))
+    for num, spec in enumerate(validator._specs):
+        e = emitter.name('e')
+        inner = indent
+        if num:
+            emitter.line(indent, 'if not {0}:'.format(passed))
+            inner += 1
+        emitter.line(inner, 'try:')
+        _emit(emitter, spec, var, inner + 1)
+        emitter.line(inner, 'except ValidationError as {0}:'.format(e))
+        emitter.line(inner + 1, '{0}.append({1})'.format(errors, e))
+        emitter.line(inner, 'else:')
+        emitter.line(inner + 1, '{0} = True'.format(passed))
+    emitter.line(indent, 'if not {0}:'.format(passed))
+    emitter.line(indent + 1, 'raise ' + _error(emitter, validator,
+                                               ', *' + errors))
+
+
+def _emit_in_range(emitter, validator, var, indent):
+    error = _error(emitter, validator)
+    if validator._min is not None:
+        emitter.line(indent, 'if {c} > {var}:'.format(
+            c=emitter.const(validator._min), var=var))
+        emitter.line(indent + 1, 'raise ' + error)
+    if validator._max is not None:
+        emitter.line(indent, 'if {c} < {var}:'.format(
+            c=emitter.const(validator._max), var=var))
+        emitter.line(indent + 1, 'raise ' + error)
+    emitter.line(indent, 'pass')
+
+
+def _emit_length(emitter, validator, var, indent):
+    length = emitter.name('length')
+    emitter.line(indent, '{0} = len({1})'.format(length, var))
+    _emit_in_range(emitter, validator, length, indent)
+
+
+def _emit_list_of(emitter, validator, var, indent):
+    if validator._sample is not None:
+        emitter.line(indent, '{v}._check({var})'.format(
+            v=emitter.const(validator, 'v'), var=var))
+        return
+
+    nested = validator._nested_validator
+    e = emitter.name('e')
+
+    # an empty list is a rare case; let the validator deal with it
+    emitter.line(indent, 'if not {0}:'.format(var))
+    emitter.line(indent + 1, 'try:')
+    emitter.line(indent + 2, '{v}(MISSING)'.format(
+        v=emitter.const(nested, 'v')))
+    emitter.line(indent + 1, 'except ValidationError as {0}:'.format(e))
+    emitter.line(indent + 2, "raise ValidationError._wrap("
+                             "{0}, 'lacks item: {{error}}')".format(e))
+
+    i = emitter.name('i')
+    item = emitter.name('item')
+    e = emitter.name('e')
+    annotated = ("ValidationError._wrap({e}, 'item #{{0}}: {{error}}', {i})"
+                 .format(i=i, e=e))
+    if type(validator) is ListOfAll:
+        emitter.line(indent, 'for {i}, {item} in enumerate({var}):'.format(
+            i=i, item=item, var=var))
+        emitter.line(indent + 1, 'try:')
+        _emit(emitter, nested, item, indent + 2)
+        emitter.line(indent + 1, 'except ValidationError as {0}:'.format(e))
+        emitter.line(indent + 2, 'raise ' + annotated)
+    else:
+        # stop at the first valid item; if there's none, let the validator
+        # collect the errors
+        passed = emitter.name('passed')
+        emitter.line(indent, '{0} = False'.format(passed))
+        emitter.line(indent, 'for {item} in {var}:'.format(item=item, var=var))
+        emitter.line(indent + 1, 'try:')
+        _emit(emitter, nested, item, indent + 2)
+        emitter.line(indent + 1, 'except ValidationError:')
+        emitter.line(indent + 2, 'continue')
+        emitter.line(indent + 1, '{0} = True'.format(passed))
+        emitter.line(indent + 1, 'break')
+        emitter.line(indent, 'if not {0}:'.format(passed))
+        emitter.line(indent + 1, '{v}._check({var})'.format(
+            v=emitter.const(validator, 'v'), var=var))
+
+
+def _emit_dict_of(emitter, validator, var, indent):
+    # see DictOf._check; the order of checks must be preserved
+    validated = emitter.name('validated')
+    missing = emitter.name('missing')
+    emitter.line(indent, '{0} = set()'.format(validated))
+    emitter.line(indent, '{0} = []'.format(missing))
+
+    pairs = zip(validator._pairs, validator._index)
+    for (k_validator, v_validator), literal in pairs:
+        if literal is not None:
+            _emit_dict_literal_pair(emitter, var, indent, validated, missing,
+                                    literal[0], literal[1], v_validator)
+        else:
+            _emit_dict_pattern_pair(emitter, var, indent, validated, missing,
+                                    k_validator, v_validator)
+
+    emitter.line(indent, 'if len({0}) < len({1}):'.format(validated, var))
+    emitter.line(indent + 1, 'raise InvalidKeys(*(set({0}) - {1}))'.format(
+        var, validated))
+    emitter.line(indent, 'if {0}:'.format(missing))
+    emitter.line(indent + 1, 'raise MissingKeys(*{0})'.format(missing))
+
+
+def _emit_dict_literal_pair(emitter, var, indent, validated, missing,
+                            key, required, v_validator):
+    k = emitter.const(key, 'k')
+    v = emitter.name('v')
+    e = emitter.name('e')
+    emitter.line(indent, 'if {k} in {var} and {k} not in {validated}:'.format(
+        k=k, var=var, validated=validated))
+    emitter.line(indent + 1, '{v} = {var}[{k}]'.format(v=v, var=var, k=k))
+    emitter.line(indent + 1, 'try:')
+    _emit(emitter, v_validator, v, indent + 2)
+    emitter.line(indent + 2, 'pass')
+    emitter.line(indent + 1, 'except (ValidationError, TypeError) as {0}:'
+                             .format(e))
+    emitter.line(indent + 2, 'raise _dict_value_error({k}, {e})'.format(
+        k=k, e=e))
+    emitter.line(indent + 1, '{0}.add({1})'.format(validated, k))
+    if required:
+        emitter.line(indent, 'else:')
+        emitter.line(indent + 1, '{0}.append({1})'.format(missing, k))
+
+
+def _emit_dict_pattern_pair(emitter, var, indent, validated, missing,
+                            k_validator, v_validator):
+    matched = emitter.name('matched')
+    k = emitter.name('k')
+    v = emitter.name('v')
+    e = emitter.name('e')
+    emitter.line(indent, '{0} = False'.format(matched))
+    emitter.line(indent, 'for {k}, {v} in {var}.items():'.format(
+        k=k, v=v, var=var))
+    emitter.line(indent + 1, 'if {k} in {validated}:'.format(
+        k=k, validated=validated))
+    emitter.line(indent + 2, 'continue')
+    emitter.line(indent + 1, 'try:')
+    _emit(emitter, k_validator, k, indent + 2)
+    emitter.line(indent + 2, 'pass')
+    emitter.line(indent + 1, 'except (TypeError, ValidationError):')
+    emitter.line(indent + 2, 'continue')
+    emitter.line(indent + 1, 'try:')
+    _emit(emitter, v_validator, v, indent + 2)
+    emitter.line(indent + 2, 'pass')
+    emitter.line(indent + 1, 'except (ValidationError, TypeError) as {0}:'
+                             .format(e))
+    emitter.line(indent + 2, 'raise _dict_value_error({k}, {e})'.format(
+        k=k, e=e))
+    emitter.line(indent + 1, '{0}.add({1})'.format(validated, k))
+    emitter.line(indent + 1, '{0} = True'.format(matched))
+
+    # same as DictOf._check: print the key if it's a literal
+    if isinstance(k_validator, Equals):
+        k_repr = k_validator._expected_value
+    else:
+        k_repr = k_validator
+    emitter.line(indent, 'if not {0}:'.format(matched))
+    emitter.line(indent + 1, 'try:')
+    _emit(emitter, k_validator, 'MISSING', indent + 2)
+    emitter.line(indent + 2, 'pass')
+    emitter.line(indent + 1, 'except ValidationError:')
+    emitter.line(indent + 2, '{0}.append({1})'.format(
+        missing, emitter.const(k_repr, 'k')))
+
+
+_HANDLERS = {
+    All: _emit_all,
+    Any: _emit_any,
+    InRange: _emit_in_range,
+    Length: _emit_length,
+    ListOfAll: _emit_list_of,
+    ListOfAny: _emit_list_of,
+    DictOf: _emit_dict_of,
+}
+
+
+#
+# Mergers
+#
+# `_emit_merge()` emits code which merges defaults into the value stored in
+# a variable and returns an expression for the result; see the merge plans
+# in the `validators` module for the logic.
+#
+
+def _merge_class(validator):
+    """
+    Returns the built-in class which defines how given validator merges
+    defaults or `None` if the validator must be called.
+    """
+    cls = type(validator)
+    if cls.__module__ != validators.__name__:
+        return None
+    owner = _defining_class(cls, '_merge')
+    if owner in _MERGE_HANDLERS:
+        return owner
+    return None
+
+
+def _emit_merge(emitter, validator, var, indent):
+    if indent > MAX_INDENT:
+        func = emitter.merge_function(validator)
+        return '{0}({1})'.format(func, var)
+
+    handler = _MERGE_HANDLERS.get(_merge_class(validator))
+    if handler is None:
+        return '{v}.get_default_for({var})'.format(
+            v=emitter.const(validator, 'v'), var=var)
+    return handler(emitter, validator, var, indent)
+
+
+def _default_expr(emitter, default):
+    "Returns an expression which creates given default value."
+    make = _default_maker(default)
+    if make is not None:
+        return '{0}()'.format(emitter.const(make, 'make'))
+    return emitter.const(default, 'default')
+
+
+def _emit_merge_plain(emitter, validator, var, indent):
+    # see `_plain_merger`
+    default = validator._default
+    if default is NotImplemented or default is None:
+        return var
+    return '({0} if {1} is None else {1})'.format(
+        _default_expr(emitter, default), var)
+
+
+def _emit_merge_one_of(emitter, validator, var, indent):
+    # see `_one_of_merger`
+    choices = validator._choices
+    if not (len(choices) == 1 or validator._first_is_default):
+        return var
+    return '({0} if {1} is None else {1})'.format(
+        _default_expr(emitter, choices[0]), var)
+
+
+def _emit_merge_combinator(emitter, validator, var, indent):
+    # see `_combinator_merger`; the choices are sorted out beforehand:
+    # those with plain defaults only have one for `None`, the others always
+    # return something
+    if validator._default:
+        return _default_expr(emitter, validator._default)
+
+    for_none = []
+    for_others = []
+    for spec in validator._specs:
+        cls = _merge_class(spec)
+        if cls is None:
+            # a custom validator may or may not have a default
+            return '{v}.get_default_for({var})'.format(
+                v=emitter.const(validator, 'v'), var=var)
+        if cls is BaseValidator:
+            if spec._default is not NotImplemented:
+                for_none.append(spec)
+        else:
+            for_none.append(spec)
+            for_others.append(spec)
+
+    result = emitter.name('merged')
+    for condition, specs in ('if {0} is None:', for_none), \
+            ('else:', for_others):
+        emitter.line(indent, condition.format(var))
+        if not specs or (len(specs) > 1 and not validator._first_is_default):
+            # no default or an ambiguous one
+            expr = var
+        else:
+            expr = _emit_merge(emitter, specs[0], var, indent + 1)
+        emitter.line(indent + 1, '{0} = {1}'.format(result, expr))
+    return result
+
+
+def _emit_merge_list_of(emitter, validator, var, indent):
+    # see `_list_merger`
+    result = emitter.name('merged')
+    emitter.line(indent, 'if not {0}:'.format(var))
+    emitter.line(indent + 1, '{0} = []'.format(result))
+    emitter.line(indent, 'elif not isinstance({0}, list):'.format(var))
+    emitter.line(indent + 1, '{0} = {1}'.format(result, var))
+    emitter.line(indent, 'else:')
+    nested = validator._nested_validator
+    if _merge_class(nested) is BaseValidator:
+        # existing items are never changed
+        emitter.line(indent + 1, '{0} = list({1})'.format(result, var))
+        return result
+
+    item = emitter.name('item')
+    emitter.line(indent + 1, '{0} = []'.format(result))
+    emitter.line(indent + 1, 'for {0} in {1}:'.format(item, var))
+    emitter.line(indent + 2, 'if {0} is not None:'.format(item))
+    expr = _emit_merge(emitter, nested, item, indent + 3)
+    emitter.line(indent + 3, '{0} = {1}'.format(item, expr))
+    emitter.line(indent + 2, '{0}.append({1})'.format(result, item))
+    return result
+
+
+def _emit_merge_dict_of(emitter, validator, var, indent):
+    # see `_dict_merger`
+    result = emitter.name('merged')
+    if not validator._pairs:
+        emitter.line(indent, 'if {0} is not None and not isinstance({0}, '
+                             'dict):'.format(var))
+        emitter.line(indent + 1, '{0} = {1}'.format(result, var))
+        emitter.line(indent, 'else:')
+        emitter.line(indent + 1, '{0} = {{}}'.format(result))
+        return result
+
+    # if a key is listed twice, the last value wins
+    plan = OrderedDict()
+    for k_validator, v_validator in validator._pairs:
+        key = k_validator.get_default_for(None)
+        if key is not None:
+            plan[key] = v_validator
+
+    emitter.line(indent, 'if {0} is not None and not isinstance({0}, dict):'
+                         .format(var))
+    emitter.line(indent + 1, '{0} = {1}'.format(result, var))
+    emitter.line(indent, 'else:')
+    source = emitter.name('source')
+    emitter.line(indent + 1, '{0} = {1} or {2}'.format(
+        source, var, emitter.const({}, 'empty')))
+    items = []
+    for key, v_validator in plan.items():
+        k = emitter.const(key, 'k')
+        v = emitter.name('v')
+        emitter.line(indent + 1, '{v} = {source}.get({k})'.format(
+            v=v, source=source, k=k))
+        items.append((k, _emit_merge(emitter, v_validator, v, indent + 1)))
+    emitter.line(indent + 1, '{0} = {{{1}}}'.format(
+        result, ', '.join('{0}: {1}'.format(k, v) for k, v in items)))
+    k = emitter.name('k')
+    v = emitter.name('v')
+    emitter.line(indent + 1, 'for {k}, {v} in {source}.items():'.format(
+        k=k, v=v, source=source))
+    emitter.line(indent + 2, 'if {k} not in {result}:'.format(
+        k=k, result=result))
+    emitter.line(indent + 3, '{result}[{k}] = {v}'.format(
+        result=result, k=k, v=v))
+    return result
+
+
+# the built-in class which defines `_merge()` → emitter
+_MERGE_HANDLERS = {
+    BaseValidator: _emit_merge_plain,
+    BaseCombinator: _emit_merge_combinator,
+    OneOf: _emit_merge_one_of,
+    BaseListOf: _emit_merge_list_of,
+    DictOf: _emit_merge_dict_of,
+}
@@ -22,16 +22,146 @@
 Exceptions
 ~~~~~~~~~~
 """
+# the arguments as passed to the constructor (see `ValidationError.args`)
+_exception_args = BaseException.args
+
+
 class ValidationError(Exception):
     """
     Raised when a document or its part cannot pass validation.
-    """
+
+    Apart from the message, the problem is described by these attributes:
+
+    `path`
+        a tuple of dictionary keys and list indices which leads from the
+        validated value to the invalid part of it;
+    `validator`
+        the validator which has failed (`None` if unknown);
+    `code`
+        a string which identifies the kind of problem, e.g. ``'is_a'``
+        (see `BaseValidator.error_code`) or ``'missing_keys'``; `None`
+        if unknown;
+    `sampled`
+        `True` if some list involved in the check was too long to be checked
+        completely (see `Sample` in :mod:`monk.validators`), so the result
+        may differ from the full check.
+
+    The message is only rendered when the error is converted to a string.
+    """
+    # These are only set when needed, so the unset ones are read with
+    # a default.  The validators set them directly instead of passing
+    # them to the constructor because errors are created in hot loops.
+    __slots__ = ('_validator', '_code', '_nested', '_step', '_template',
+                 '_sampled', '_combined')
+
+    _default_code = None
+
+    @classmethod
+    def _wrap(cls, error, template, *step):
+        """
+        Returns an error which describes given nested error in the context
+        of a container.  The message is `template` formatted with `step`
+        and `error`; the `step` (a dictionary key or a list index, if any)
+        is prepended to the path of the nested error.
+        """
+        self = cls()
+        self._nested = error
+        self._template = template
+        self._step = step
+        return self
+
+    def _innermost(self):
+        error = self
+        while isinstance(getattr(error, '_nested', None), ValidationError):
+            error = error._nested
+        return error
+
+    @property
+    def args(self):
+        # the message of a leaf or wrapped error is rendered on demand, so
+        # that `args[0]` is available as with a message passed explicitly
+        args = _exception_args.__get__(self)
+        if not args and (hasattr(self, '_nested') or
+                         (hasattr(self, '_validator') and
+                          not getattr(self, '_combined', False))):
+            return (str(self),)
+        return args
+
+    @args.setter
+    def args(self, value):
+        _exception_args.__set__(self, value)
+
+    @property
+    def path(self):
+        steps = []
+        error = self
+        while isinstance(error, ValidationError):
+            steps.extend(getattr(error, '_step', ()))
+            error = getattr(error, '_nested', None)
+        return tuple(steps)
+
+    @property
+    def validator(self):
+        return getattr(self._innermost(), '_validator', None)
+
+    @property
+    def code(self):
+        error = self._innermost()
+        code = getattr(error, '_code', None)
+        if code is not None:
+            return code
+        validator = getattr(error, '_validator', None)
+        code = getattr(validator, 'error_code', None)
+        if code is not None:
+            if validator.negated:
+                code = 'not_' + code
+            return code
+        return error._default_code
+
+    @property
+    def sampled(self):
+        if getattr(self, '_sampled', False):
+            return True
+        nested = getattr(self, '_nested', None)
+        if isinstance(nested, ValidationError):
+            return nested.sampled
+        # combined errors
+        return any(e.sampled for e in _exception_args.__get__(self)
+                   if isinstance(e, ValidationError))
+
+    def __str__(self):
+        nested = getattr(self, '_nested', None)
+        if nested is not None:
+            return self._template.format(*self._step, error=nested)
+        validator = getattr(self, '_validator', None)
+        if (validator is not None and not _exception_args.__get__(self) and
+                not getattr(self, '_combined', False)):
+            # a leaf error (see `BaseValidator._raise_error`)
+            return repr(validator)
+        return self._format_args()
+
+    def _format_args(self):
+        return super(ValidationError, self).__str__()
+
+    def __repr__(self):
+        if _exception_args.__get__(self):
+            return super(ValidationError, self).__repr__()
+        return '{cls}({msg!r})'.format(cls=self.__class__.__name__,
+                                       msg=str(self))
+
+    def __reduce__(self):
+        state = dict((name, getattr(self, name))
+                     for name in ValidationError.__slots__
+                     if hasattr(self, name))
+        state.update(getattr(self, '__dict__', None) or {})
+        return type(self), _exception_args.__get__(self), state
 
 
 class StructureSpecificationError(ValidationError):
     """
     Raised when malformed document structure is detected.
     """
+    __slots__ = ()
 
 
 class DictValueError(ValidationError):
@@ -39,13 +169,18 @@ class DictValueError(ValidationError):
     Raised when dictionary value fails validation.  Used to detect nested
     errors in order to format the human-readable messages unambiguously.
     """
+    __slots__ = ()
 
 
 class MissingKeys(ValidationError):
     """
     Raised when a required dictionary key is missing from the value dict.
     """
-    def __str__(self):
+    __slots__ = ()
+
+    _default_code = 'missing_keys'
+
+    def _format_args(self):
         keys_str = ', '.join(map(repr, self.args))
         return 'must have keys: {keys}'.format(keys=keys_str)
 
@@ -54,7 +189,11 @@ class InvalidKeys(ValidationError):
     """
     Raised whan the value dictionary contains an unexpected key.
     """
-    def __str__(self):
+    __slots__ = ()
+
+    _default_code = 'invalid_keys'
+
+    def _format_args(self):
         keys_str = ', '.join(map(repr, self.args))
         return 'must not have keys like {keys}'.format(keys=keys_str)
 
@@ -63,6 +202,8 @@ class CombinedValidationError(ValidationError):
     """
     Raised when a combination of specs has failed validation.
     """
+    __slots__ = ()
+
     _error_string_separator = '; '
 
     def _format_nested_error(self, e):
@@ -75,7 +216,7 @@ class CombinedValidationError(ValidationError):
             tmpl = '{cls}: {err}'
         return tmpl.format(cls=e.__class__.__name__, err=e)
 
-    def __str__(self):
+    def _format_args(self):
         err_strings = map(self._format_nested_error, self.args)
         return self._error_string_separator.join(err_strings)
 
@@ -84,6 +225,8 @@ class AllFailed(CombinedValidationError):
     """
     Raised when at least one validator was expected to pass but none did.
     """
+    __slots__ = ()
+
     _error_string_separator = ' or '
 
 
@@ -91,6 +234,8 @@ class AtLeastOneFailed(CombinedValidationError):
     """
     Raised when all validators were expected to pas but at least one didn't.
     """
+    __slots__ = ()
+
     _error_string_separator = ' and '
 
 
@@ -98,3 +243,4 @@ class NoDefaultValue(Exception):
     """
     Raised when the validator could not produce a default value.
     """
+    __slots__ = ()
@@ -22,13 +22,27 @@
 Helpers
 ~~~~~~~
 """
-from .validators import translate
+from collections import deque
+from itertools import islice
+import io
+import pickle
+from timeit import default_timer
+
+from .errors import ValidationError
+from .validators import (
+    BaseValidator, translate, _current_sample, _sampled_lists_count,
+    _using_sample,
+)
 
 
 __all__ = [
     # functions
     'validate',
+    'validate_many',
     'walk_dict',
+
+    # classes
+    'BatchStats',
 ]
 
 
@@ -67,6 +81,270 @@ def validate(spec, value):
     validator(value)
 
 
+class BatchStats(object):
+    """
+    Statistics collected by :func:`validate_many`:
+
+    `total`
+        the number of validated values;
+    `failed`
+        the number of invalid values;
+    `errors`
+        a dictionary which maps names of exception classes to the numbers
+        of values which failed with such exceptions;
+    `sampled`
+        the number of values in which some lists were only checked
+        partially (see :class:`~monk.validators.Sample`);
+    `seconds`
+        the time spent in validation;
+    `per_second`
+        the number of values validated per second.
+
+    """
+    def __init__(self):
+        self.total = 0
+        self.failed = 0
+        self.sampled = 0
+        self.errors = {}
+        self.seconds = 0.0
+
+    @property
+    def per_second(self):
+        if not self.seconds:
+            return 0.0
+        return self.total / self.seconds
+
+    def __repr__(self):
+        return ('<BatchStats total={s.total} failed={s.failed} '
+                '{s.per_second:.0f}/s>'.format(s=self))
+
+
+#: Valid values of the `on_error` argument of :func:`validate_many`.
+ON_ERROR_CHOICES = 'collect', 'raise', 'skip'
+
+
+def validate_many(spec, values, on_error='collect', stats=None, workers=None,
+                  chunk_size=1000, sample=None):
+    """
+    Validates each of given values against given specification.  The spec
+    is translated once.  Generates pairs ``(index, error)`` where `index`
+    is the position of the value in `values` and `error` is an instance
+    of :class:`~monk.errors.ValidationError` or `None` if the value is
+    valid::
+
+        >>> stats = BatchStats()
+        >>> for i, error in validate_many(int, [1, 'a', 3], stats=stats):
+        ...     print(i, error)
+        0 None
+        1 must be int
+        2 None
+        >>> stats.failed, stats.errors
+        (1, {'ValidationError': 1})
+
+    :spec:
+        a validator instance or any value digestible by :func:`translate`.
+    :values:
+        any iterable; it is consumed lazily, so it may be a stream.
+    :on_error:
+        what to do with invalid values:
+
+        `collect` (default)
+            yield ``(index, error)``;
+        `raise`
+            raise the error (the pairs for valid values preceding it are
+            yielded);
+        `skip`
+            don't yield anything for the value.
+
+    :stats:
+        a :class:`BatchStats` instance to update (optional).
+    :workers:
+        if given, the values are validated in this number of processes
+        (requires Python 3.7+).  The validator is sent to each process once;
+        the values are sent in chunks of `chunk_size` items, so they must be
+        picklable.  The results are still generated in order.
+    :sample:
+        a :class:`~monk.validators.Sample` to check long lists with (unless
+        the list validator has its own).  By default the one set by
+        :func:`~monk.validators.sampling` is used, if any.
+
+    """
+    if on_error not in ON_ERROR_CHOICES:
+        raise ValueError('on_error must be one of {0}, got {1!r}'
+                         .format(', '.join(ON_ERROR_CHOICES), on_error))
+
+    # translate now rather than on the first iteration to fail early
+    validator = translate(spec)
+    if stats is None:
+        stats = BatchStats()
+    if workers:
+        return _validate_many_in_processes(validator, values, on_error, stats,
+                                           workers, chunk_size,
+                                           sample or _current_sample())
+    return _validate_many(validator, values, on_error, stats, sample)
+
+
+def _validate_many(validator, values, on_error, stats, sample):
+    errors = stats.errors
+    collect = on_error == 'collect'
+    skip = on_error == 'skip'
+    if sample is not None:
+        plain_validator = validator
+
+        def validator(value):
+            with _using_sample(sample):
+                plain_validator(value)
+
+    for index, value in enumerate(values):
+        sampled_lists = _sampled_lists_count()
+        started = default_timer()
+        try:
+            validator(value)
+        except ValidationError as e:
+            stats.seconds += default_timer() - started
+            stats.total += 1
+            stats.failed += 1
+            if _sampled_lists_count() != sampled_lists:
+                stats.sampled += 1
+            name = type(e).__name__
+            errors[name] = errors.get(name, 0) + 1
+            if collect:
+                yield index, e
+            elif not skip:
+                raise
+        else:
+            stats.seconds += default_timer() - started
+            stats.total += 1
+            if _sampled_lists_count() != sampled_lists:
+                stats.sampled += 1
+            yield index, None
+
+
+def _validate_many_in_processes(validator, values, on_error, stats, workers,
+                                chunk_size, sample):
+    from concurrent.futures import ProcessPoolExecutor
+
+    nodes = _tree_nodes(validator)
+    values = iter(values)
+    pending = deque()
+    start = 0
+    resumed = default_timer()
+    executor = ProcessPoolExecutor(workers, initializer=_init_worker,
+                                   initargs=(validator, sample))
+    with executor:
+        while True:
+            # keep all processes busy without reading the whole stream
+            while len(pending) < workers * 2:
+                chunk = list(islice(values, chunk_size))
+                if not chunk:
+                    break
+                future = executor.submit(_validate_chunk, start, chunk)
+                pending.append((start, len(chunk), future))
+                start += len(chunk)
+            if not pending:
+                break
+
+            chunk_start, size, future = pending.popleft()
+            data, sampled = future.result()
+            errors = _load_errors(data, nodes)
+            stats.sampled += sampled
+            for index in range(chunk_start, chunk_start + size):
+                stats.total += 1
+                error = errors.get(index)
+                if error is not None:
+                    stats.failed += 1
+                    name = type(error).__name__
+                    stats.errors[name] = stats.errors.get(name, 0) + 1
+                    if on_error == 'skip':
+                        continue
+                    if on_error == 'raise':
+                        stats.seconds += default_timer() - resumed
+                        raise error
+                stats.seconds += default_timer() - resumed
+                yield index, error
+                resumed = default_timer()
+    stats.seconds += default_timer() - resumed
+
+
+def _tree_nodes(validator):
+    """
+    Returns a list of all validators in given tree.  The order is the same
+    for a pickled copy of the tree.
+    """
+    nodes = []
+    seen = set()
+
+    def visit(value):
+        if isinstance(value, BaseValidator):
+            if id(value) in seen:
+                return
+            seen.add(id(value))
+            nodes.append(value)
+            for name, attr in sorted(value._structure().items()):
+                visit(attr)
+        elif type(value) in (list, tuple):
+            for item in value:
+                visit(item)
+
+    visit(validator)
+    return nodes
+
+
+# the validator and its nodes in a worker process
+_worker_nodes = None
+_worker_sample = None
+
+
+def _init_worker(validator, sample):
+    global _worker_nodes, _worker_sample
+    _worker_nodes = _tree_nodes(validator)
+    _worker_sample = sample
+
+
+class _TreePickler(pickle.Pickler):
+    # errors refer to validators; send their positions in the tree instead
+    # of sending the subtrees again
+    def __init__(self, file, nodes):
+        pickle.Pickler.__init__(self, file, pickle.HIGHEST_PROTOCOL)
+        self._positions = dict((id(node), i) for i, node in enumerate(nodes))
+
+    def persistent_id(self, obj):
+        if isinstance(obj, BaseValidator):
+            return self._positions.get(id(obj))
+        return None
+
+
+class _TreeUnpickler(pickle.Unpickler):
+    def __init__(self, file, nodes):
+        pickle.Unpickler.__init__(self, file)
+        self._nodes = nodes
+
+    def persistent_load(self, pid):
+        return self._nodes[pid]
+
+
+def _validate_chunk(start, values):
+    validator = _worker_nodes[0]
+    errors = []
+    sampled = 0
+    with _using_sample(_worker_sample):
+        for index, value in enumerate(values, start):
+            sampled_lists = _sampled_lists_count()
+            try:
+                validator(value)
+            except ValidationError as e:
+                errors.append((index, e))
+            if _sampled_lists_count() != sampled_lists:
+                sampled += 1
+    stream = io.BytesIO()
+    _TreePickler(stream, _worker_nodes).dump(errors)
+    return stream.getvalue(), sampled
+
+
+def _load_errors(data, nodes):
+    return dict(_TreeUnpickler(io.BytesIO(data), nodes).load())
+
+
 def walk_dict(data):
     """ Generates pairs ``(keys, value)`` for each item in given dictionary,
     including nested dictionaries. Each pair contains:
@@ -24,17 +24,21 @@ Data manipulation
 """
 from .compat import text_type
 from . import translate
+from .validators import (
+    _current_sample, _is_collecting_all_errors, _normalizer_for,
+)
 
 
 __all__ = [
     # functions
     'merge_defaults',
+    'normalize',
     # helpers
     'normalize_to_list', 'normalize_list_of_dicts',
 ]
 
 
-def merge_defaults(spec, value):
+def merge_defaults(spec, value, inplace=False):
     """
     Returns a copy of `value` recursively updated to match the `spec`:
 
@@ -67,6 +71,12 @@ def merge_defaults(spec, value):
     :value:
         The value to merge into the `spec`.
 
+    :inplace:
+        If `True`, the dictionaries and lists of `value` are updated instead
+        of being copied: missing keys are added to the existing dictionaries
+        (after the existing keys) and merged items replace the original ones.
+        Returns `value` itself unless it's `None`.
+
     Examples::
 
         >>> merge_defaults('foo', None)
@@ -84,7 +94,31 @@ def merge_defaults(spec, value):
 
     validator = translate(spec)
 
-    return validator.get_default_for(value)
+    return validator.get_default_for(value, inplace=inplace)
+
+
+def normalize(spec, value):
+    """
+    Returns a copy of `value` merged with defaults from the `spec` (see
+    :func:`merge_defaults`) and validates it.  Raises the same exceptions as
+    :func:`~monk.helpers.validate` for the merged value, i.e. this::
+
+        document = normalize(spec, document)
+
+    is the same as::
+
+        document = merge_defaults(spec, document)
+        validate(spec, document)
+
+    but dictionaries and lists are walked once instead of twice.
+    """
+    validator = translate(spec)
+    if _is_collecting_all_errors() or _current_sample() is not None:
+        # the lists are checked differently
+        merged = validator.get_default_for(value)
+        validator(merged)
+        return merged
+    return (validator._normalizer or _normalizer_for(validator))(value)
 
 
 class UNDEFINED:
@@ -23,12 +23,17 @@ Shortcuts
 ~~~~~~~~~
 """
 from .compat import text_types
-from . import Any, Equals, Exists, InRange, translate
+from . import Any, Equals, Exists, InRange, OneOf, translate
+from .validators import _interned
 
 
 __all__ = ['nullable', 'optional', 'opt_key', 'one_of']
 
 
+# validators are immutable, so this one can be shared
+_NOT_EXISTS = ~Exists()
+
+
 def nullable(spec):
     """
     Returns a validator which allows the value to be `None`.
@@ -38,7 +43,7 @@ def nullable(spec):
         True
 
     """
-    return translate(spec) | Equals(None)
+    return _interned(translate(spec) | Equals(None))
 
 
 def optional(spec):
@@ -55,7 +60,7 @@ def optional(spec):
     Note that you should normally :func:`opt_key` to mark dictionary keys
     as optional.
     """
-    return translate(spec) | ~Exists()
+    return _interned(translate(spec) | _NOT_EXISTS)
 
 
 def opt_key(spec):
@@ -80,26 +85,24 @@ def opt_key(spec):
 
 def one_of(choices, first_is_default=False, as_rules=False):
     """
-    A wrapper for :class:`Any`.
+    A wrapper for :class:`OneOf` and :class:`Any`.
 
     :param as_rules:
-        `bool`.  If `False` (by default), each element of `choices`
-        is wrapped in the :class:`Equals` validator so they are interpreted
-        as literals.
+        `bool`.  If `False` (by default), the `choices` are interpreted
+        as literals (see :class:`OneOf`).  Otherwise they are interpreted
+        as specs (see :class:`Any`).
 
     .. deprecated:: 0.13
 
-       Use :class:`Any` instead.
+       Use :class:`OneOf` or :class:`Any` instead.
 
     """
     assert choices
 
     if as_rules:
-        None    # for coverage
-    else:
-        choices = [Equals(x) for x in choices]
+        return _interned(Any(choices, first_is_default=first_is_default))
 
-    return Any(choices, first_is_default=first_is_default)
+    return _interned(OneOf(choices, first_is_default=first_is_default))
 
 
 def in_range(start, stop, first_is_default=False):
@@ -0,0 +1,255 @@
+# coding: utf-8
+#
+#    Monk is an unobtrusive data modeling, manipulation and validation library.
+#    Copyright © 2011—2015  Andrey Mikhaylenko
+#
+#    This file is part of Monk.
+#
+#    Monk is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published
+#    by the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Monk is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU Lesser General Public License
+#    along with Monk.  If not, see <http://gnu.org/licenses/>.
+"""
+~~~~~~~~~~~~~~~~~~~~
+Streaming validation
+~~~~~~~~~~~~~~~~~~~~
+
+Large JSON exports are usually a single top-level array of similar items::
+
+    [
+        {"title": "foo", "tags": ["a", "b"]},
+        {"title": "bar", "tags": []},
+        ...
+    ]
+
+:func:`validate_json` reads such a file piece by piece and checks each item
+as soon as it is complete, so only one item at a time is kept in memory::
+
+    with open('export.json') as f:
+        validate_json([{'title': str, 'tags': [str]}], f)
+
+If the stream is already split into parser events (e.g. by `ijson`_), use
+:func:`validate_json_events`::
+
+    with open('export.json', 'rb') as f:
+        validate_json_events(spec, ijson.basic_parse(f, use_float=True))
+
+.. _ijson: https://pypi.python.org/pypi/ijson
+
+The errors are the same as raised by :func:`~monk.helpers.validate` for the
+fully loaded document.
+"""
+import codecs
+import json
+
+from . import compat
+from .validators import (
+    BaseListOf, ITEM_STRATEGY_ALL, ITEM_STRATEGY_ANY, translate,
+)
+
+
+__all__ = ['validate_json', 'validate_json_events']
+
+
+CHUNK_SIZE = 64 * 1024
+
+SCALAR_EVENTS = frozenset(['null', 'boolean', 'integer', 'double', 'number',
+                           'string'])
+KEY_EVENTS = frozenset(['map_key', 'key'])
+
+WHITESPACE = frozenset(' \t\n\r')
+
+# characters which may follow an array item
+DELIMITERS = frozenset(' \t\n\r,]')
+
+
+def validate_json(spec, stream, chunk_size=CHUNK_SIZE):
+    """
+    Validates the JSON document read from given file-like object against
+    given spec.  The stream may yield either text or UTF-8 encoded bytes.
+
+    If the document is an array and the spec is a :class:`~monk.ListOf`,
+    the items are decoded and checked one by one.  Otherwise the whole
+    document is loaded and validated as usual.  With :class:`~monk.ListOfAll`
+    the stream is only read up to the first invalid item.
+
+    Raises `ValueError` if the document is not valid JSON.
+    """
+    validator = translate(spec)
+    reader = _ArrayReader(stream, chunk_size)
+    if _is_streamable(validator) and reader.starts_array():
+        _check_items(validator, reader)
+    else:
+        validator(reader.load())
+
+
+def validate_json_events(spec, events):
+    """
+    Validates the JSON document represented by given parser events against
+    given spec.  The events are ``(event, value)`` pairs as produced by
+    ``ijson.basic_parse()``: ``start_map``, ``map_key``, ``end_map``,
+    ``start_array``, ``end_array`` and scalars (``string``, ``number``,
+    ``boolean``, ``null``, etc.).
+
+    As with :func:`validate_json`, items of a top-level array are assembled
+    and checked one by one.
+
+    Raises `ValueError` if the events do not form a valid document.
+    """
+    validator = translate(spec)
+    events = iter(events)
+    event, value = next(events, (None, None))
+    if event == 'start_array' and _is_streamable(validator):
+        _check_items(validator, _iter_array_events(events))
+    else:
+        validator(_build(event, value, events))
+    event, _ = next(events, (None, None))
+    if event is not None:
+        raise ValueError('Unexpected event {0!r} after document'
+                         .format(event))
+
+
+def _is_streamable(validator):
+    return (isinstance(validator, BaseListOf) and not validator.negated and
+            validator.item_strategy in (ITEM_STRATEGY_ALL, ITEM_STRATEGY_ANY))
+
+
+def _check_items(validator, items):
+    # the array is known to be a list, so `implies` is not checked
+    for item in validator.iterate(items):
+        pass
+
+
+def _iter_array_events(events):
+    # the start_array event has been consumed
+    for event, value in events:
+        if event == 'end_array':
+            return
+        yield _build(event, value, events)
+    raise ValueError('Unexpected end of events in array')
+
+
+def _build(event, value, events):
+    if event in SCALAR_EVENTS:
+        return value
+    if event == 'start_map':
+        result = {}
+        for event, value in events:
+            if event == 'end_map':
+                return result
+            if event not in KEY_EVENTS:
+                raise ValueError('Expected a key, got {0!r}'.format(event))
+            event, value_ = next(events, (None, None))
+            result[value] = _build(event, value_, events)
+        raise ValueError('Unexpected end of events in object')
+    if event == 'start_array':
+        return list(_iter_array_events(events))
+    if event is None:
+        raise ValueError('Unexpected end of events')
+    raise ValueError('Unexpected event {0!r}'.format(event))
+
+
+class _ArrayReader(object):
+    """
+    Decodes items of a top-level JSON array from a file-like object.  The
+    buffer only holds the item being decoded and the rest of the last chunk.
+    """
+    def __init__(self, stream, chunk_size):
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._bytes_decoder = None
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def _read(self, size):
+        if self._eof:
+            return False
+        chunk = self._stream.read(size)
+        while isinstance(chunk, compat.binary_type):
+            if self._bytes_decoder is None:
+                self._bytes_decoder = codecs.getincrementaldecoder('utf-8')()
+            text = self._bytes_decoder.decode(chunk, final=not chunk)
+            if text or not chunk:
+                chunk = text
+                break
+            # a multibyte character was split; keep reading
+            chunk = self._stream.read(size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self):
+        "Skips whitespace and returns the next character or ``''`` at EOF."
+        while True:
+            buf = self._buffer
+            pos = self._pos
+            while pos < len(buf) and buf[pos] in WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._read(self._chunk_size):
+                return ''
+
+    def starts_array(self):
+        return self._peek() == '['
+
+    def load(self):
+        "Decodes the rest of the stream as a whole."
+        while self._read(self._chunk_size):
+            pass
+        return json.loads(self._buffer[self._pos:])
+
+    def __iter__(self):
+        # the opening bracket has been peeked
+        self._pos += 1
+        if self._peek() == ']':
+            self._pos += 1
+            self._check_end()
+            return
+        while True:
+            yield self._decode_item()
+            char = self._peek()
+            self._pos += 1
+            if char == ']':
+                self._check_end()
+                return
+            if char != ',':
+                raise ValueError('Expected "," or "]" in array, got {0!r}'
+                                 .format(char or 'end of data'))
+
+    def _check_end(self):
+        # only whitespace may follow the top-level array
+        char = self._peek()
+        if char:
+            raise ValueError('Extra data after array, got {0!r}'.format(char))
+
+    def _decode_item(self):
+        self._peek()
+        while True:
+            try:
+                item, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except ValueError:
+                if self._eof:
+                    raise
+            else:
+                # a number may continue in the next chunk
+                if self._eof or self._buffer[end:end + 1] in DELIMITERS:
+                    self._pos = end
+                    return item
+            # read at least as much as already buffered so that a large item
+            # is not decoded over and over again
+            self._read(max(self._chunk_size, len(self._buffer) - self._pos))
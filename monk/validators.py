@@ -37,6 +37,7 @@ __all__ = [
     'IsA',
     'HasAttr',
     'Equals',
+    'OneOf',
     'Contains',
     'InRange',
     'Length',
@@ -47,13 +48,30 @@ __all__ = [
 
     # functions
     'translate',
+    'optimize',
+    'collect_all_errors',
+    'sampling',
+
+    # helper classes
+    'Sample',
+    'DefaultFactory',
 
     # special objects
     'MISSING',
+    'translation_cache',
+    'intern_table',
 ]
 
 
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
 import copy
+import hashlib
+import itertools
+import math
+import random
+import threading
+import weakref
 
 from . import compat
 from .errors import (
@@ -77,6 +95,180 @@ class MISSING:
     pass
 
 
+_state = threading.local()
+
+
+@contextmanager
+def collect_all_errors():
+    """
+    Returns a context manager which makes validators report all problems
+    they can find instead of stopping as soon as the outcome is known::
+
+        >>> v = ListOf(IsA(int))
+        >>> v([1, 'a', 'b'])
+        Traceback (most recent call last):
+        ...
+        ValidationError: item #1: must be int
+        >>> with collect_all_errors():
+        ...     v([1, 'a', 'b'])
+        Traceback (most recent call last):
+        ...
+        AtLeastOneFailed: item #1: must be int and item #2: must be int
+
+    This affects :class:`All`, :class:`Any`, :class:`ListOfAll` and
+    :class:`ListOfAny` in the current thread.  Note that it makes validation
+    slower.
+    """
+    previous = _is_collecting_all_errors()
+    _state.collect_all_errors = True
+    try:
+        yield
+    finally:
+        _state.collect_all_errors = previous
+
+
+def _is_collecting_all_errors():
+    return getattr(_state, 'collect_all_errors', False)
+
+
+class Sample(namedtuple('Sample', 'first last rate seed')):
+    """
+    Describes which items of a long list are validated: the `first` and the
+    `last` ones and a random part of the rest (`rate` is a fraction between
+    0 and 1).  The random generator is seeded with `seed`, so a list of given
+    length is always sampled the same way::
+
+        >>> v = ListOf(IsA(int), sample=Sample(first=2, last=2, rate=0.1))
+        >>> v(list(range(1000)) + ['a'])
+        Traceback (most recent call last):
+        ...
+        ValidationError: item #1000: must be int
+
+    An error raised by a sampled check is marked as such (see
+    :attr:`~monk.errors.ValidationError.sampled`).  Lists which are not
+    longer than the sample are checked completely.
+    """
+    __slots__ = ()
+
+    def __new__(cls, first=100, last=100, rate=0.01, seed=0):
+        return super(Sample, cls).__new__(cls, first, last, rate, seed)
+
+    def indexes(self, size):
+        """
+        Returns an iterable of sorted indexes of the items to check in a list
+        of given size or `None` if all items must be checked.
+        """
+        end = size - self.last
+        middle = end - self.first
+        count = int(math.ceil(middle * self.rate))
+        if middle <= 0 or count >= middle:
+            return None
+        picked = random.Random(self.seed).sample(
+            compat.range(self.first, end), count)
+        picked.sort()
+        return itertools.chain(compat.range(self.first), picked,
+                               compat.range(end, size))
+
+
+def sampling(first=100, last=100, rate=0.01, seed=0):
+    """
+    Returns a context manager which makes list validators in the current
+    thread only check a :class:`Sample` of each long list::
+
+        >>> with sampling(first=10, last=10, rate=0.05):
+        ...     validate([int], telemetry_points)
+
+    A sample given to the validator itself takes precedence.
+    """
+    return _using_sample(Sample(first, last, rate, seed))
+
+
+@contextmanager
+def _using_sample(sample):
+    previous = _current_sample()
+    _state.sample = sample
+    try:
+        yield
+    finally:
+        _state.sample = previous
+
+
+def _current_sample():
+    return getattr(_state, 'sample', None)
+
+
+def _sampled_lists_count():
+    # the number of lists which were sampled in the current thread
+    return getattr(_state, 'sampled_lists', 0)
+
+
+class DefaultFactory(object):
+    """
+    A default value which is created anew each time defaults are merged::
+
+        >>> now = DefaultFactory(datetime.utcnow)
+        >>> v = DictOf([(Equals('created'), IsA(datetime, default=now))])
+        >>> v.get_default_for({})
+        {'created': datetime.datetime(2015, 1, 1, 12, 0, 0, 1)}
+        >>> v.get_default_for({})
+        {'created': datetime.datetime(2015, 1, 1, 12, 0, 0, 2)}
+
+    Callables in natural specs are wrapped automatically, so the above is
+    the same as ``translate({'created': datetime.utcnow})``.
+
+    Note that mutable defaults (lists, dictionaries, sets) are copied on
+    each merge anyway, so there's no need to wrap them.
+    """
+    __slots__ = ('func',)
+
+    def __init__(self, func):
+        self.func = func
+
+    def __call__(self):
+        return self.func()
+
+    def __eq__(self, other):
+        return type(other) is type(self) and other.func == self.func
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.func)
+
+    def __repr__(self):
+        return 'DefaultFactory({0})'.format(_qualified_name(self.func))
+
+
+def _qualified_name(func):
+    name = getattr(func, '__qualname__', None) or func.__name__
+    return '{0}.{1}'.format(func.__module__, name)
+
+
+# types of default values which are copied instead of being shared between
+# merged documents
+_MUTABLE_DEFAULT_TYPES = frozenset([list, dict, set, bytearray])
+
+
+def _default_maker(default):
+    """
+    Returns a function which creates a fresh copy of given default value or
+    `None` if the value can be shared.
+    """
+    if isinstance(default, DefaultFactory):
+        return default.func
+    if type(default) in _MUTABLE_DEFAULT_TYPES:
+        if not default:
+            return type(default)
+        return lambda: copy.deepcopy(default)
+    return None
+
+
+def _fresh(default):
+    maker = _default_maker(default)
+    return default if maker is None else maker()
+
+
 def _reluctantly_translate(spec):
     # `translate()` can do it itself but some validators have the `implies`
     # attribute which can trigger instantiation of a BaseValidator subclass
@@ -95,9 +287,24 @@ def _reluctantly_translate(spec):
 
 
 class BaseValidator(object):
+    # `_digest` and `_hash` are computed by `fingerprint` on first use,
+    # `_merger` by `get_default_for` and `_normalizer` by `normalize`;
+    # subclasses list their own attributes in `__slots__`
+    __slots__ = ('negated', '_digest', '_hash', '_merger', '_normalizer',
+                 '__weakref__')
+
     error_class = ValidationError
+    #: Identifies the problem in :attr:`ValidationError.code`; prefixed
+    #: with ``not_`` if the validator is negated.
+    error_code = 'invalid'
     _default = NotImplemented
-    negated = False
+
+    def __new__(cls, *args, **kwargs):
+        self = super(BaseValidator, cls).__new__(cls)
+        self.negated = False
+        self._digest = self._hash = None
+        self._merger = self._normalizer = None
+        return self
 
     def _combine(self, other, combinator):
         # XXX should we flatten same-logic one-item combs?
@@ -109,14 +316,14 @@ class BaseValidator(object):
 
         return combinator([self, _reluctantly_translate(other)])
 
-    def _merge(self, value):
+    def _merge(self, value, inplace=False):
         if value is not None:
             raise NoDefaultValue('value is not None')
 
         if self._default is NotImplemented:
             raise NoDefaultValue('self._default is not implemented')
 
-        return self._default
+        return _fresh(self._default)
 
     def __and__(self, other):
         return self._combine(other, All)
@@ -125,10 +332,24 @@ class BaseValidator(object):
         return self._combine(other, Any)
 
     def __eq__(self, other):
-        return isinstance(other, type(self)) and self.__dict__ == other.__dict__
+        if self is other:
+            return True
+        if type(other) is not type(self):
+            return False
+        # validators with different fingerprints cannot be equal, and the
+        # nested validators compared below are short-circuited the same way
+        if hash(self) != hash(other):
+            return False
+        return (self.negated == other.negated and
+                self._structure() == other._structure())
+
+    def __ne__(self, other):
+        return not self == other
 
     def __invert__(self):
-        clone = copy.deepcopy(self)
+        # Validators are not modified after creation, so the clone can share
+        # nested validators with the original instead of copying the subtree.
+        clone = copy.copy(self)
         clone.negated = not self.negated
         return clone
 
@@ -144,28 +365,226 @@ class BaseValidator(object):
             if self.negated:
                 self._raise_error(value)
 
+    def matches(self, value):
+        """
+        Returns `True` if the value passes validation, `False` otherwise.
+
+        The result is the same as that of calling the validator but no
+        exceptions are created, so this is much cheaper for invalid values.
+        """
+        if _overrides_call(type(self)):
+            # a custom validator which checks the value in `__call__()`
+            try:
+                self(value)
+            except ValidationError:
+                return False
+            return True
+        if _has_own_matches(type(self)):
+            passed = self._matches(value)
+        else:
+            passed = BaseValidator._matches(self, value)
+        return passed != self.negated
+
     def __hash__(self):
-        # TODO think this over and check Python docs
-        #return hash(((k,v) for k,v in self.__dict__.items()))
-        return hash('validator_'+str(self.__dict__))
+        if self._hash is None:
+            self._hash = int(self.fingerprint[:16], 16)
+        return self._hash
+
+    def __getstate__(self):
+        # the cached fingerprint is not included: it's cheap to recompute
+        # and a clone may be modified (see `__invert__`)
+        state = self._structure()
+        state['negated'] = self.negated
+        return state
+
+    def __setstate__(self, state):
+        # `__new__` is not called when unpickling with protocols 0 and 1
+        self._digest = self._hash = None
+        self._merger = self._normalizer = None
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def _structure(self):
+        # the attributes that define the validator (both slots and, for
+        # subclasses without `__slots__`, the instance dictionary)
+        attrs = {}
+        for name in _slot_names(type(self)):
+            try:
+                attrs[name] = getattr(self, name)
+            except AttributeError:
+                pass
+        attrs.update(getattr(self, '__dict__', ()))
+        return attrs
 
-    def get_default_for(self, value, silent=True):
-        try:
-            return self._merge(value)
-        except NoDefaultValue:
+    @property
+    def fingerprint(self):
+        """
+        A hex digest of the validator's class and structure.  Equal validators
+        have equal fingerprints.  The fingerprint does not depend on object
+        identities or hash randomization, so it is the same in every process
+        (unless the validator holds objects with identity-based `repr()`).
+
+        The value is computed once and cached, so validators must not be
+        modified after the fingerprint has been requested.
+        """
+        if self._digest is None:
+            cls = type(self)
+            parts = ['{0}.{1}'.format(cls.__module__, cls.__name__),
+                     'negated={0!r}'.format(bool(self.negated))]
+            parts.extend('{0}={1}'.format(k, _canonical(v))
+                         for k, v in sorted(self._structure().items()))
+            data = ';'.join(parts).encode('utf-8')
+            self._digest = hashlib.sha1(data).hexdigest()
+        return self._digest
+
+    def get_default_for(self, value, silent=True, inplace=False):
+        """
+        Returns `value` merged with the defaults of this validator.  If there
+        are none, returns `value` as is or, if `silent` is false, raises
+        :class:`~monk.errors.NoDefaultValue`.
+
+        If `inplace` is true, the missing keys and items are inserted into
+        the dictionaries and lists of `value` instead of their copies.
+        """
+        # the merge plan is built once per validator (see `_merger_for`)
+        merger = self._merger or _merger_for(self)
+        # if a subclass overrides this method, its merger calls the override
+        # which may in turn call this method via `super()`
+        merger = getattr(merger, 'base', merger)
+        merged = merger(value, inplace)
+        if merged is NotImplemented:
             if silent:
                 return value
-            else:
-                raise
+            raise NoDefaultValue('{0!r} has no default value'.format(self))
+        return merged
 
     def _check(self, value):
         raise NotImplementedError
 
+    def _matches(self, value):
+        # Same as `_check()` (i.e. ignores negation) but returns a `bool`.
+        # Subclasses are encouraged to provide a cheaper implementation.
+        try:
+            self._check(value)
+        except ValidationError:
+            return False
+        return True
+
     def _raise_error(self, value):
-        raise self.error_class(repr(self))
+        # the message is rendered from the validator on demand
+        error = self.error_class()
+        error._validator = self
+        raise error
+
+
+# attributes that are not compared by `BaseValidator.__eq__`
+_NON_STRUCTURAL_ATTRS = frozenset(['negated', '_digest', '_hash', '_merger',
+                                   '_normalizer', '__weakref__', '__dict__',
+                                   # statistics of the adaptive `Any`
+                                   '_hits', '_order', '_countdown'])
+
+# validator class → names of its structural slots
+_slot_names_cache = {}
+
+
+def _slot_names(cls):
+    try:
+        return _slot_names_cache[cls]
+    except KeyError:
+        pass
+    names = []
+    for klass in reversed(cls.__mro__):
+        slots = vars(klass).get('__slots__', ())
+        if isinstance(slots, str):
+            slots = [slots]
+        names.extend(x for x in slots
+                     if x not in _NON_STRUCTURAL_ATTRS and x not in names)
+    _slot_names_cache[cls] = names
+    return names
+
+
+def _canonical(value):
+    """
+    Returns a string which represents given validator attribute in
+    `BaseValidator.fingerprint` and does not depend on the process.
+    """
+    if isinstance(value, BaseValidator):
+        return value.fingerprint
+    if isinstance(value, type):
+        return 'type:{0}.{1}'.format(value.__module__, value.__name__)
+    if isinstance(value, DefaultFactory):
+        return 'factory:{0}'.format(_qualified_name(value.func))
+    if isinstance(value, (list, tuple)):
+        return '{0}[{1}]'.format(type(value).__name__,
+                                 ','.join(_canonical(x) for x in value))
+    if isinstance(value, dict):
+        items = sorted('{0}:{1}'.format(_canonical(k), _canonical(v))
+                       for k, v in value.items())
+        return 'dict{{{0}}}'.format(','.join(items))
+    if isinstance(value, (set, frozenset)):
+        items = sorted(_canonical(x) for x in value)
+        return 'set{{{0}}}'.format(','.join(items))
+    return '{0}:{1!r}'.format(type(value).__name__, value)
+
+
+# methods that define the outcome of `_check()`
+_CHECK_METHODS = '_check', 'can_tolerate'
+
+# validator class → whether its `_matches()` can be trusted
+_own_matches_cache = {}
+
+
+def _has_own_matches(cls):
+    """
+    Returns `False` if `_matches()` is inherited from a class which is more
+    generic than the one that defines how the value is checked (e.g. when
+    a custom validator extends `IsA` and only overrides `_check()`).
+    """
+    try:
+        return _own_matches_cache[cls]
+    except KeyError:
+        pass
+    result = False
+    for klass in cls.__mro__:
+        attrs = vars(klass)
+        if '_matches' in attrs:
+            result = True
+            break
+        if any(name in attrs for name in _CHECK_METHODS):
+            break
+    _own_matches_cache[cls] = result
+    return result
+
+
+# validator class → whether `__call__()` is overridden below `matches()`
+_overrides_call_cache = {}
+
+
+def _overrides_call(cls):
+    """
+    Returns `True` if `__call__()` is overridden by a class which is more
+    specific than the one that defines `matches()`, i.e. the outcome of
+    validation may not depend on `_check()` at all.
+    """
+    try:
+        return _overrides_call_cache[cls]
+    except KeyError:
+        pass
+    result = False
+    for klass in cls.__mro__:
+        attrs = vars(klass)
+        if 'matches' in attrs:
+            break
+        if '__call__' in attrs:
+            result = True
+            break
+    _overrides_call_cache[cls] = result
+    return result
 
 
 class BaseCombinator(BaseValidator):
+    __slots__ = ('_specs', '_default', '_first_is_default')
+
     error_class = CombinedValidationError
     break_on_first_fail = False
     _repr_tmpl = '{not_}({items})'
@@ -191,12 +610,16 @@ class BaseCombinator(BaseValidator):
             try:
                 spec(value)
             except ValidationError as e:
-                if self.break_on_first_fail:
+                if (self.break_on_first_fail and
+                        not _is_collecting_all_errors()):
                     # don't even wrap the error
                     raise
                 errors.append(e)
         if not self.can_tolerate(errors):
-            raise self.error_class(*errors)
+            error = self.error_class(*errors)
+            error._validator = self
+            error._combined = True
+            raise error
 
 
     def __repr__(self):
@@ -209,16 +632,15 @@ class BaseCombinator(BaseValidator):
     def can_tolerate(self, errors):
         raise NotImplementedError
 
-    def _merge(self, value):
+    def _merge(self, value, inplace=False):
         if self._default:
-            return self._default
+            return _fresh(self._default)
+        # the value is only modified if a single choice can do that
+        inplace = inplace and _mutating_specs_count(self._specs) <= 1
         defaults = []
         for choice in self._specs:
-            try:
-                default = choice.get_default_for(value, silent=False)
-            except NoDefaultValue:
-                pass
-            else:
+            default = _merger_for(choice)(value, inplace)
+            if default is not NotImplemented:
                 defaults.append(default)
         if not defaults:
             return value
@@ -235,6 +657,9 @@ class All(BaseCombinator):
     """
     Requires that the value passes all nested validators.
     """
+    __slots__ = ()
+
+    error_code = 'all'
     error_class = AtLeastOneFailed
     break_on_first_fail = True
     _repr_items_sep = ' and '
@@ -245,20 +670,99 @@ class All(BaseCombinator):
         if not errors:
             return True
 
+    def _matches(self, value):
+        return all(spec.matches(value) for spec in self._specs)
+
 
 class Any(BaseCombinator):
     """
     Requires that the value passes at least one of nested validators.
+
+    The nested validators are tried in given order.  If `adaptive` is true,
+    the validator counts how many values have passed each of them (see
+    :attr:`hits`) and every :attr:`adapt_every` values tries the most
+    successful ones first.  Only the order of the checks changes; the
+    errors, the defaults and :attr:`first_is_default` stay the same.
+    The order is never changed if some nested validator may have side
+    effects (i.e. is not a built-in validator).
     """
+    __slots__ = ('_adaptive', '_hits', '_order', '_countdown')
+
+    error_code = 'any'
     error_class = AllFailed
     _repr_items_sep = ' or '
 
+    #: The number of checks between reorderings in the adaptive mode.
+    adapt_every = 1000
+
+    def __init__(self, specs, default=None, first_is_default=False,
+                 adaptive=False):
+        super(Any, self).__init__(specs, default=default,
+                                  first_is_default=first_is_default)
+        self._adaptive = adaptive
+        self._reset_hits()
+
+    def __setstate__(self, state):
+        super(Any, self).__setstate__(state)
+        self._reset_hits()
+
+    def _reset_hits(self):
+        self._hits = [0] * len(self._specs)
+        self._order = None
+        self._countdown = self.adapt_every
+
+    @property
+    def hits(self):
+        """
+        The number of values which have passed each nested validator (in the
+        original order) in the adaptive mode.
+        """
+        return list(self._hits)
+
+    def _check(self, value):
+        # stop at the first nested validator that passes; the errors are
+        # only collected if none has passed
+        if not _is_collecting_all_errors():
+            if self._adaptive:
+                if self._matches_adaptively(value):
+                    return
+            else:
+                for spec in self._specs:
+                    if spec.matches(value):
+                        return
+        super(Any, self)._check(value)
+
     def can_tolerate(self, errors):
         if len(errors) < len(self._specs):
             return True
 
+    def _matches(self, value):
+        if self._adaptive:
+            return self._matches_adaptively(value)
+        return any(spec.matches(value) for spec in self._specs)
+
+    def _matches_adaptively(self, value):
+        self._countdown -= 1
+        if self._countdown <= 0:
+            self._reorder()
+        specs = self._specs
+        for i in self._order or range(len(specs)):
+            if specs[i].matches(value):
+                self._hits[i] += 1
+                return True
+        return False
+
+    def _reorder(self):
+        self._countdown = self.adapt_every
+        if all(_is_side_effect_free(spec) for spec in self._specs):
+            hits = self._hits
+            # the sort is stable, so ties keep the original order
+            self._order = sorted(range(len(hits)), key=lambda i: -hits[i])
+
 
 class BaseRequirement(BaseValidator):
+    __slots__ = ()
+
     # a hint for combinators, see their code
     is_recursive = False
     implies = NotImplemented
@@ -268,8 +772,14 @@ class BaseRequirement(BaseValidator):
             self.implies(value)
         super(BaseRequirement, self).__call__(value)
 
+    def matches(self, value):
+        if self.implies is not NotImplemented:
+            if not self.implies.matches(value):
+                return False
+        return super(BaseRequirement, self).matches(value)
+
     def _represent(self):
-        return self.__dict__
+        return self._structure()
 
     def __repr__(self):
         return '{negated}{cls}({rep})'.format(
@@ -282,9 +792,16 @@ class Anything(BaseRequirement):
     """
     Any values passes validation.
     """
+    __slots__ = ()
+
+    error_code = 'anything'
+
     def _check(self, value):
         pass
 
+    def _matches(self, value):
+        return True
+
     def _represent(self):
         return ''
 
@@ -293,6 +810,10 @@ class IsA(BaseRequirement):
     """
     Requires that the value is an instance of given type.
     """
+    __slots__ = ('expected_type', '_default')
+
+    error_code = 'is_a'
+
     def __init__(self, expected_type, default=None):
         self.expected_type = expected_type
         self._default = default
@@ -301,6 +822,9 @@ class IsA(BaseRequirement):
         if not isinstance(value, self.expected_type):
             self._raise_error(value)
 
+    def _matches(self, value):
+        return isinstance(value, self.expected_type)
+
     def __repr__(self):
         s = 'must be {pattern_}'.format(pattern_=self.expected_type.__name__)
         if self.negated:
@@ -312,6 +836,10 @@ class Equals(BaseRequirement):
     """
     Requires that the value equals given expected value.
     """
+    __slots__ = ('_expected_value',)
+
+    error_code = 'equals'
+
     def __init__(self, expected_value):
         self._expected_value = expected_value
 
@@ -319,6 +847,9 @@ class Equals(BaseRequirement):
         if self._expected_value != value:
             self._raise_error(value)
 
+    def _matches(self, value):
+        return not self._expected_value != value
+
     def __repr__(self):
         s = 'must equal {pattern_!r}'.format(pattern_=self._expected_value)
         if self.negated:
@@ -330,10 +861,93 @@ class Equals(BaseRequirement):
         return self._expected_value
 
 
+class OneOf(BaseRequirement):
+    """
+    Requires that the value equals one of given choices.  Usage::
+
+        >>> v = OneOf(['new', 'in progress', 'closed'])
+
+        >>> v('new')
+
+        >>> v('rejected')
+        Traceback (most recent call last):
+        ...
+        AllFailed: must be one of 'new', 'in progress', 'closed'
+
+    This is a faster equivalent of ``Any([Equals(x) for x in choices])``:
+    hashable choices are looked up in a `frozenset`, so the number of choices
+    does not matter.  Unhashable choices are compared one by one.
+
+    :param first_is_default:
+        `bool`.  If `True`, the first choice is the default value.
+        Otherwise a default value is only available if there is exactly
+        one choice.
+
+    """
+    __slots__ = ('_choices', '_first_is_default', '_hashable_choices',
+                 '_unhashable_choices')
+
+    error_class = AllFailed
+    error_code = 'one_of'
+
+    #: The error message lists at most this number of choices.
+    max_choices_in_repr = 10
+
+    def __init__(self, choices, first_is_default=False):
+        assert choices
+        self._choices = list(choices)
+        self._first_is_default = first_is_default
+        hashable = []
+        self._unhashable_choices = []
+        for choice in self._choices:
+            try:
+                hash(choice)
+            except TypeError:
+                self._unhashable_choices.append(choice)
+            else:
+                hashable.append(choice)
+        self._hashable_choices = frozenset(hashable)
+
+    def _check(self, value):
+        if not self._matches(value):
+            self._raise_error(value)
+
+    def _matches(self, value):
+        try:
+            if value in self._hashable_choices:
+                return True
+        except TypeError:
+            # unhashable value; can only be compared directly
+            return any(not x != value for x in self._choices)
+        return any(not x != value for x in self._unhashable_choices)
+
+    def __repr__(self):
+        choices = self._choices[:self.max_choices_in_repr]
+        s = 'must be one of {choices}'.format(
+            choices=', '.join(repr(x) for x in choices))
+        if len(choices) < len(self._choices):
+            s += ', ... ({cnt} choices)'.format(cnt=len(self._choices))
+        if self.negated:
+            s = 'not ({s})'.format(s=s)
+        return s
+
+    def _merge(self, value, inplace=False):
+        # same as Any([Equals(x) for x in choices])
+        if value is not None:
+            return value
+        if len(self._choices) == 1 or self._first_is_default:
+            return _fresh(self._choices[0])
+        return value
+
+
 class Contains(BaseRequirement):
     """
     Requires that the value contains given expected value.
     """
+    __slots__ = ('_expected_value',)
+
+    error_code = 'contains'
+
     def __init__(self, expected_value):
         self._expected_value = expected_value
 
@@ -341,6 +955,9 @@ class Contains(BaseRequirement):
         if self._expected_value not in value:
             self._raise_error(value)
 
+    def _matches(self, value):
+        return self._expected_value in value
+
     def __repr__(self):
         s = 'must contain {pattern_!r}'.format(pattern_=self._expected_value)
         if self.negated:
@@ -358,6 +975,10 @@ class Exists(BaseRequirement):
     special cases like dictionary keys; otherwise there's simply nothing to
     validate.  Note that this is *not* a check against `None` or `False`.
     """
+    __slots__ = ('_default',)
+
+    error_code = 'exists'
+
     def __init__(self, default=None):
         self._default = default
 
@@ -365,6 +986,9 @@ class Exists(BaseRequirement):
         if value is MISSING:
             self._raise_error(value)
 
+    def _matches(self, value):
+        return value is not MISSING
+
     def __repr__(self):
         if self.negated:
             return 'must not exist'
@@ -378,38 +1002,169 @@ class BaseListOf(BaseRequirement):
     strategies which can be selected by subclasses.  In many aspects this is
     similar to :class:`BaseCombinator`.
     """
+    __slots__ = ('_nested_validator', '_default', '_sample')
+
     implies = IsA(list)
     item_strategy = NotImplemented
     error_class = CombinedValidationError
     is_recursive = True
 
-    def __init__(self, validator, default=None):
+    def __init__(self, validator, default=None, sample=None):
         self._nested_validator = translate(validator)
         self._default = default
+        self._sample = sample
+
+    def _sample_indexes(self, value):
+        # Returns a list of indexes of the items to check or `None` if all
+        # items must be checked.
+        sample = self._sample
+        if sample is None:
+            sample = _current_sample()
+            if sample is None:
+                return None
+        indexes = sample.indexes(len(value))
+        if indexes is None:
+            return None
+        _state.sampled_lists = _sampled_lists_count() + 1
+        return list(indexes)
 
     def _check(self, value):
         if not value:
             try:
                 self._nested_validator(MISSING)
             except ValidationError as e:
-                raise ValidationError('lacks item: {error}'
-                                      .format(error=e))
+                raise ValidationError._wrap(e, 'lacks item: {error}')
+
+        collect_all = _is_collecting_all_errors()
+        indexes = self._sample_indexes(value)
+        if indexes is None:
+            items = value
+        else:
+            items = [value[i] for i in indexes]
+
+        if self.item_strategy == ITEM_STRATEGY_ANY and not collect_all:
+            # stop at the first valid item; the errors are only collected
+            # if there's none
+            matches = self._nested_validator.matches
+            for nested_value in items:
+                if matches(nested_value):
+                    return
 
         errors = []
-        for i, nested_value in enumerate(value):
+        for i, nested_value in enumerate(items):
             try:
                 self._nested_validator(nested_value)
             except ValidationError as e:
-                annotated_error = ValidationError(
-                    'item #{elem}: {error}'.format(elem=i, error=e))
-                if self.item_strategy == ITEM_STRATEGY_ALL:
+                if indexes is None:
+                    annotated_error = ValidationError._wrap(
+                        e, 'item #{0}: {error}', i)
+                else:
+                    annotated_error = ValidationError._wrap(
+                        e, 'item #{0}: {error}', indexes[i])
+                    annotated_error._sampled = True
+                if (self.item_strategy == ITEM_STRATEGY_ALL and
+                        not collect_all):
                     raise annotated_error
                 errors.append(annotated_error)
 
-        if self.can_tolerate(errors, value):
+        # only the sampled items are taken into account
+        if self.can_tolerate(errors, items):
             return
 
-        raise self.error_class(*errors)
+        error = self.error_class(*errors)
+        error._validator = self
+        error._combined = True
+        if indexes is not None:
+            error._sampled = True
+        raise error
+
+    def iterate(self, items):
+        """
+        Returns an iterator over given items which validates them as they are
+        consumed.  This allows to check a lazily produced sequence (a database
+        cursor, a file reader, etc.) without building a list::
+
+            >>> v = ListOf(IsA(int))
+            >>> for item in v.iterate(iter([1, 2, 'a', 3])):
+            ...     print(item)
+            1
+            2
+            Traceback (most recent call last):
+            ...
+            ValidationError: item #2: must be int
+
+        The errors are the same as for a list.  An invalid item is reported
+        before it is yielded; with :class:`ListOfAny`,
+        :func:`collect_all_errors` or a negated validator the verdict is only
+        known when the items are exhausted.  Once it is known, the remaining
+        items are not checked.  The length of an iterator is unknown, so
+        a :class:`Sample` is not applied.
+        """
+        nested = self._nested_validator
+        is_any = self.item_strategy == ITEM_STRATEGY_ANY
+        collect_all = _is_collecting_all_errors() and not self.negated
+        checking = True
+        errors = []
+        count = 0
+        for item in items:
+            if checking:
+                try:
+                    nested(item)
+                except ValidationError as e:
+                    error = ValidationError._wrap(e, 'item #{0}: {error}',
+                                                  count)
+                    errors.append(error)
+                    if not is_any and not collect_all:
+                        if not self.negated:
+                            raise error
+                        checking = False
+                else:
+                    if is_any and not collect_all:
+                        checking = False
+            count += 1
+            yield item
+
+        # see `__call__`
+        try:
+            self._check_exhausted(errors, count)
+        except ValidationError:
+            if not self.negated:
+                raise
+        else:
+            if self.negated:
+                self._raise_error(None)
+
+    def _check_exhausted(self, errors, count):
+        # see `_check`
+        if not count:
+            try:
+                self._nested_validator(MISSING)
+            except ValidationError as e:
+                raise ValidationError._wrap(e, 'lacks item: {error}')
+
+        if self.item_strategy == ITEM_STRATEGY_ALL:
+            tolerated = not errors
+        else:
+            tolerated = len(errors) < count
+        if not tolerated:
+            error = self.error_class(*errors)
+            error._validator = self
+            error._combined = True
+            raise error
+
+    def _matches(self, value):
+        nested = self._nested_validator
+        if not value and not nested.matches(MISSING):
+            return False
+        indexes = self._sample_indexes(value)
+        if indexes is not None:
+            value = [value[i] for i in indexes]
+        if self.item_strategy == ITEM_STRATEGY_ALL:
+            return all(nested.matches(x) for x in value)
+        elif self.item_strategy == ITEM_STRATEGY_ANY:
+            return any(nested.matches(x) for x in value)
+        else:
+            raise ValueError('unknown strategy')
 
     def can_tolerate(self, errors, value):
         if self.item_strategy == ITEM_STRATEGY_ALL:
@@ -428,15 +1183,19 @@ class BaseListOf(BaseRequirement):
     def _represent(self):
         return repr(self._nested_validator)
 
-    def _merge(self, value):
+    def _merge(self, value, inplace=False):
         """ Returns a list based on `value`:
 
         * missing required value is converted to an empty list;
         * missing required items are never created;
         * nested items are merged recursively.
 
+        If `inplace` is true, the items of `value` are replaced with the
+        merged ones and `value` itself is returned.
         """
         if not value:
+            if inplace and isinstance(value, list):
+                return value
             return []
 
         if value is not None and not isinstance(value, list):
@@ -444,7 +1203,15 @@ class BaseListOf(BaseRequirement):
             return value
 
         item_spec = self._nested_validator
-        return [x if x is None else item_spec.get_default_for(x) for x in value]
+        if inplace:
+            for i, x in enumerate(value):
+                if x is not None:
+                    merged = _merge_nested(item_spec, x, inplace)
+                    if merged is not x:
+                        value[i] = merged
+            return value
+        return [x if x is None else _merge_nested(item_spec, x, inplace)
+                for x in value]
 
 
 class ListOfAll(BaseListOf):
@@ -462,7 +1229,10 @@ class ListOfAll(BaseListOf):
         ValidationError: item #2: must be int or must be str
 
     """
+    __slots__ = ()
+
     error_class = AtLeastOneFailed
+    error_code = 'list_of_all'
     item_strategy = ITEM_STRATEGY_ALL
 
 
@@ -471,13 +1241,64 @@ class ListOfAny(BaseListOf):
     Same as :class:`ListOfAll` but tolerates invalid items as long as there
     is at least one valid among them.
     """
+    __slots__ = ()
+
     error_class = AllFailed
+    error_code = 'list_of_any'
     item_strategy = ITEM_STRATEGY_ANY
 
 
 ListOf = ListOfAll
 
 
+def _literal_key(k_validator):
+    """
+    Returns a tuple ``(key, is_required)`` if given key validator only
+    accepts a single string, i.e. is either ``Equals('x')`` or
+    ``Equals('x') | ~Exists()``.  Otherwise returns `None`.
+    """
+    # Only strings are safe: a data key which equals a literal `1` may be
+    # `True` or `1.0` and we need the actual key for error messages.
+    is_required = True
+    if type(k_validator) is Any and not k_validator.negated:
+        specs = k_validator._specs
+        if len(specs) != 2:
+            return None
+        if type(specs[0]) is Exists:
+            specs = specs[::-1]
+        k_validator, exists = specs
+        if not (type(exists) is Exists and exists.negated):
+            return None
+        is_required = False
+    if type(k_validator) is not Equals or k_validator.negated:
+        return None
+    key = k_validator._expected_value
+    if not isinstance(key, compat.text_types):
+        return None
+    return key, is_required
+
+
+def _matches_or_type_error(validator, value):
+    # DictOf treats TypeError as a validation error
+    try:
+        return validator.matches(value)
+    except TypeError:
+        return False
+
+
+def _dict_value_error(key, error):
+    # same as DictValueError._wrap() but this is called at every level of
+    # nested dictionaries, so avoid the extra call
+    wrapper = DictValueError()
+    wrapper._nested = error
+    wrapper._step = key,
+    if isinstance(error, DictValueError):
+        wrapper._template = 'in {0!r} ({error})'
+    else:
+        wrapper._template = '{0!r} value {error}'
+    return wrapper
+
+
 #@requirement(implies=[IsA(dict)], is_recursive=True, vars=['key', 'req'])
 #def dict_contains(ctx, value):
 #    nested_value = value[ctx['key']]
@@ -517,19 +1338,41 @@ class DictOf(BaseRequirement):
     Note that this validator supports :class:`Exists` to mark keys that can
     be missing.
     """
+    __slots__ = ('_pairs', '_index')
+
+    error_code = 'dict_of'
+
     implies = IsA(dict)
 
     def __init__(self, pairs):
         self._pairs = pairs
 
+        # Literal keys are looked up in the value dictionary directly instead
+        # of matching each data key against them.  For each pair there's
+        # either a tuple ``(key, is_required)`` or `None` for patterns.
+        self._index = [_literal_key(k) for k, v in pairs]
+
     def _represent(self):
         return repr(self._pairs)
 
     def _check(self, value):
         value = value or {}
-        validated_data_keys = []
+        validated_data_keys = set()
         missing_key_specs = []
-        for k_validator, v_validator in self._pairs:
+        pairs = zip(self._pairs, self._index)
+        for (k_validator, v_validator), literal in pairs:
+            if literal is not None:
+                k, is_required = literal
+                if k in value and k not in validated_data_keys:
+                    try:
+                        v_validator(value[k])
+                    except (ValidationError, TypeError) as e:
+                        raise _dict_value_error(k, e)
+                    validated_data_keys.add(k)
+                elif is_required:
+                    missing_key_specs.append(k_validator)
+                continue
+
             # NOTE kspec.datatype can be None => any key of any datatype
             # NOTE kspec.default  can be None => any key of given datatype
 
@@ -543,9 +1386,7 @@ class DictOf(BaseRequirement):
                 # check if this key is described by current key validator;
                 # if it isn't, just skip it (and try another validator
                 # on it later on)
-                try:
-                    k_validator(k)
-                except (TypeError, ValidationError):
+                if not _matches_or_type_error(k_validator, k):
                     continue
 
                 # this key *is* described by current value validator;
@@ -553,28 +1394,21 @@ class DictOf(BaseRequirement):
                 try:
                     v_validator(v)
                 except (ValidationError, TypeError) as e:
-                    if isinstance(e, DictValueError):
-                        msg = 'in {k!r} ({e})'
-                    else:
-                        msg = '{k!r} value {e}'
-                    raise DictValueError(msg.format(k=k, e=e))
+                    raise _dict_value_error(k, e)
 
-                validated_data_keys.append(k)
+                validated_data_keys.add(k)
                 matched = True
 
 #            if not matched and not k_validator.optional:
-            if not matched:
-                try:
-                    k_validator(MISSING)
-                except ValidationError:
-                    missing_key_specs.append(k_validator)
+            if not matched and not k_validator.matches(MISSING):
+                missing_key_specs.append(k_validator)
 
         # TODO document that unknown keys are checked before missing ones
 
         # check if there are data keys that did not match any key spec;
         # if yes, raise InvalidKey for them
         if len(validated_data_keys) < len(value):
-            invalid_keys = set(value) - set(validated_data_keys)
+            invalid_keys = set(value) - validated_data_keys
             raise InvalidKeys(*invalid_keys)
 
         if missing_key_specs:
@@ -585,11 +1419,45 @@ class DictOf(BaseRequirement):
                      for spec in missing_key_specs)
             raise MissingKeys(*reprs)
 
+    def _matches(self, value):
+        value = value or {}
+        validated_data_keys = set()
+        pairs = zip(self._pairs, self._index)
+        for (k_validator, v_validator), literal in pairs:
+            if literal is not None:
+                k, is_required = literal
+                if k in value and k not in validated_data_keys:
+                    if not _matches_or_type_error(v_validator, value[k]):
+                        return False
+                    validated_data_keys.add(k)
+                elif is_required:
+                    return False
+                continue
+
+            matched = False
+            for k, v in value.items():
+                if k in validated_data_keys:
+                    continue
+                if not _matches_or_type_error(k_validator, k):
+                    continue
+                if not _matches_or_type_error(v_validator, v):
+                    return False
+                validated_data_keys.add(k)
+                matched = True
+
+            if not matched and not k_validator.matches(MISSING):
+                return False
 
-    def _merge(self, value):
+        return len(validated_data_keys) == len(value)
+
+
+    def _merge(self, value, inplace=False):
         """
         Returns a dictionary based on `value` with each value recursively
         merged with `spec`.
+
+        If `inplace` is true, the missing keys are added to `value` itself
+        (after the existing ones) and nothing is removed from it.
         """
 
         if value is not None and not isinstance(value, dict):
@@ -597,7 +1465,7 @@ class DictOf(BaseRequirement):
             return value
 
         if not self._pairs:
-            return {}
+            return value if inplace and value is not None else {}
 
         collected = {}
 #        collected.update(value)
@@ -611,9 +1479,15 @@ class DictOf(BaseRequirement):
                 v_for_this_k = value.get(k_default)
             else:
                 v_for_this_k = None
-            v_default = v_validator.get_default_for(v_for_this_k)
+            v_default = _merge_nested(v_validator, v_for_this_k, inplace)
             collected.update({k_default: v_default})
 
+        if inplace and value is not None:
+            for k, v in collected.items():
+                if k not in value or value[k] is not v:
+                    value[k] = v
+            return value
+
         if value:
             for k, v in value.items():
                 if k not in collected:
@@ -626,13 +1500,16 @@ class InRange(BaseRequirement):
     """
     Requires that the numeric value is in given boundaries.
     """
+    __slots__ = ('_min', '_max', '_default')
+
+    error_code = 'in_range'
+
     implies = IsA(int) | IsA(float)
 
     def __init__(self, min=None, max=None, default=NotImplemented):
         self._min = min
         self._max = max
-        if default is not NotImplemented:
-            self._default = default
+        self._default = default
 
     def _check(self, value):
         if self._min is not None and self._min > value:
@@ -640,6 +1517,13 @@ class InRange(BaseRequirement):
         if self._max is not None and self._max < value:
             self._raise_error(value)
 
+    def _matches(self, value):
+        if self._min is not None and self._min > value:
+            return False
+        if self._max is not None and self._max < value:
+            return False
+        return True
+
     def __repr__(self):
         if self.negated:
             must = 'must not'
@@ -656,6 +1540,10 @@ class HasAttr(BaseRequirement):
     """
     Requires that the value has given attribute.
     """
+    __slots__ = ('_attr_name',)
+
+    error_code = 'has_attr'
+
     def __init__(self, attr_name):
         self._attr_name = attr_name
 
@@ -663,6 +1551,9 @@ class HasAttr(BaseRequirement):
         if not hasattr(value, self._attr_name):
             self._raise_error(value)
 
+    def _matches(self, value):
+        return hasattr(value, self._attr_name)
+
     def __repr__(self):
         if self.negated:
             must = 'must not'
@@ -677,6 +1568,10 @@ class Length(InRange):
     """
     Requires that the value length is in given boundaries.
     """
+    __slots__ = ()
+
+    error_code = 'length'
+
     implies = HasAttr('__len__')
 
     def _check(self, value):
@@ -685,6 +1580,9 @@ class Length(InRange):
         except ValidationError as e:
             self._raise_error(value)
 
+    def _matches(self, value):
+        return super(Length, self)._matches(len(value))
+
     def __repr__(self):
         if self.negated:
             must = 'must not'
@@ -696,6 +1594,570 @@ class Length(InRange):
             must=must, min_=_fmt(self._min), max_=_fmt(self._max))
 
 
+#
+# Merge plans
+#
+# `get_default_for()` walks the same validator tree for every merged value,
+# so the decisions which only depend on the tree (which keys are literal,
+# which validators have defaults at all, etc.) are made once.  A merger is
+# a function which returns the merged value or `NotImplemented` where
+# `_merge()` would raise `NoDefaultValue`.
+#
+
+def _merger_for(validator):
+    merger = validator._merger
+    if merger is None:
+        cls = type(validator)
+        if _defining_class(cls, 'get_default_for') is BaseValidator:
+            merger = _base_merger(validator)
+        else:
+            merger = _overriding_merger(validator)
+        validator._merger = merger
+    return merger
+
+
+def _base_merger(validator):
+    # the merger used by `BaseValidator.get_default_for()`
+    builder = None
+    cls = type(validator)
+    if cls.__module__ == __name__:
+        builder = _MERGER_BUILDERS.get(_defining_class(cls, '_merge'))
+    if builder is None:
+        return _custom_merger(validator)
+    return builder(validator)
+
+
+def _defining_class(cls, name):
+    for klass in cls.__mro__:
+        if name in vars(klass):
+            return klass
+
+
+def _overriding_merger(validator):
+    # custom validators may override `get_default_for()`; it does not
+    # necessarily know about `inplace`
+    def merger(value, inplace):
+        try:
+            return validator.get_default_for(value, silent=False)
+        except NoDefaultValue:
+            return NotImplemented
+    merger.base = _base_merger(validator)
+    return merger
+
+
+def _custom_merger(validator):
+    # custom validators may override `_merge()`; only the built-in ones
+    # know about `inplace`
+    cls = type(validator)
+    if _defining_class(cls, '_merge').__module__ == __name__:
+        merge = validator._merge
+    else:
+        def merge(value, inplace):
+            return validator._merge(value)
+
+    def merger(value, inplace):
+        try:
+            return merge(value, inplace)
+        except NoDefaultValue:
+            return NotImplemented
+    return merger
+
+
+def _nested_merger_for(validator):
+    # dictionaries and lists merge their values silently, which makes
+    # a difference for validators that override `get_default_for()`
+    merger = validator._merger or _merger_for(validator)
+    if getattr(merger, 'base', None) is None:
+        return merger
+
+    def nested_merger(value, inplace):
+        return validator.get_default_for(value)
+    return nested_merger
+
+
+def _merge_nested(validator, value, inplace):
+    # same as `validator.get_default_for(value, inplace=inplace)`
+    merged = _nested_merger_for(validator)(value, inplace)
+    return value if merged is NotImplemented else merged
+
+
+def _mutating_specs_count(specs):
+    # the number of validators which may modify a container in place
+    return sum(1 for spec in specs if not _has_plain_default(spec))
+
+
+def _no_default(value, inplace):
+    return NotImplemented
+
+
+def _keep_value(value, inplace):
+    return value
+
+
+def _has_plain_default(validator):
+    "Returns `True` if given validator only has a default for `None`."
+    cls = type(validator)
+    return (cls.__module__ == __name__ and
+            _defining_class(cls, '_merge') is BaseValidator)
+
+
+def _plain_merger(validator):
+    # see BaseValidator._merge
+    default = validator._default
+    if default is NotImplemented:
+        return _no_default
+    make = _default_maker(default)
+    if make is not None:
+        def merger(value, inplace):
+            return make() if value is None else NotImplemented
+        return merger
+
+    def merger(value, inplace):
+        return default if value is None else NotImplemented
+    return merger
+
+
+def _combinator_merger(validator):
+    # see BaseCombinator._merge
+    if validator._default:
+        default = validator._default
+        make = _default_maker(default)
+        if make is not None:
+            return lambda value, inplace: make()
+        return lambda value, inplace: default
+
+    mergers = [_merger_for(spec) for spec in validator._specs]
+    mergers = [m for m in mergers if m is not _no_default]
+    first_is_default = validator._first_is_default
+    # the value is only modified if a single choice can do that
+    can_merge_inplace = _mutating_specs_count(validator._specs) <= 1
+
+    def merger(value, inplace):
+        inplace = inplace and can_merge_inplace
+        found = NotImplemented
+        for merge in mergers:
+            default = merge(value, inplace)
+            if default is NotImplemented:
+                continue
+            if first_is_default:
+                return default
+            if found is not NotImplemented:
+                # ambiguous
+                return value
+            found = default
+        return value if found is NotImplemented else found
+    return merger
+
+
+def _one_of_merger(validator):
+    # see OneOf._merge
+    choices = validator._choices
+    if not (len(choices) == 1 or validator._first_is_default):
+        return _keep_value
+    default = choices[0]
+    make = _default_maker(default)
+    if make is not None:
+        def merger(value, inplace):
+            return make() if value is None else value
+        return merger
+
+    def merger(value, inplace):
+        return default if value is None else value
+    return merger
+
+
+def _list_merger(validator):
+    # see BaseListOf._merge
+    nested = validator._nested_validator
+    if _has_plain_default(nested):
+        # existing items are never changed
+        merge_item = None
+    else:
+        merge_item = _nested_merger_for(nested)
+
+    def merger(value, inplace):
+        if not value:
+            if inplace and isinstance(value, list):
+                return value
+            return []
+        if not isinstance(value, list):
+            # bogus value; will not pass validation but should be preserved
+            return value
+        if merge_item is None:
+            return value if inplace else list(value)
+        if inplace:
+            for i, item in enumerate(value):
+                if item is not None:
+                    merged = merge_item(item, inplace)
+                    if merged is not NotImplemented and merged is not item:
+                        value[i] = merged
+            return value
+        result = []
+        for item in value:
+            if item is not None:
+                merged = merge_item(item, inplace)
+                if merged is not NotImplemented:
+                    item = merged
+            result.append(item)
+        return result
+    return merger
+
+
+def _dict_merger(validator):
+    # see DictOf._merge; the keys are known beforehand, so each value is
+    # looked up directly
+    if not validator._pairs:
+        def merger(value, inplace):
+            if value is not None and not isinstance(value, dict):
+                return value
+            if inplace and value is not None:
+                return value
+            return {}
+        return merger
+
+    # if a key is listed twice, the last value wins
+    plan = OrderedDict()
+    for k_validator, v_validator in validator._pairs:
+        key = k_validator.get_default_for(None)
+        if key is not None:
+            plan[key] = _nested_merger_for(v_validator)
+    plan = list(plan.items())
+
+    def merger(value, inplace):
+        if value is None:
+            value = {}
+        elif not isinstance(value, dict):
+            # bogus value; will not pass validation but should be preserved
+            return value
+        elif inplace:
+            for key, merge in plan:
+                existing = value.get(key)
+                merged = merge(existing, inplace)
+                if merged is NotImplemented:
+                    merged = existing
+                if merged is not existing or key not in value:
+                    value[key] = merged
+            return value
+        collected = {}
+        for key, merge in plan:
+            existing = value.get(key)
+            merged = merge(existing, inplace)
+            collected[key] = existing if merged is NotImplemented else merged
+        if value:
+            for k, v in value.items():
+                if k not in collected:
+                    collected[k] = v
+        return collected
+    return merger
+
+
+#
+# Normalizers
+#
+# A normalizer returns the value merged with defaults (see `_merger_for`)
+# and raises the same errors as the validator would for the merged value.
+# Dictionaries and lists are merged and checked in a single walk; other
+# validators merge their value and then check it.
+#
+
+def _normalizer_for(validator):
+    normalizer = validator._normalizer
+    if normalizer is None:
+        if not validator.negated:
+            builder = _NORMALIZER_BUILDERS.get(type(validator))
+            if builder is not None:
+                normalizer = builder(validator)
+        if normalizer is None:
+            normalizer = _two_pass_normalizer(validator)
+        validator._normalizer = normalizer
+    return normalizer
+
+
+def _two_pass_normalizer(validator):
+    merge = _merger_for(validator)
+
+    def normalizer(value):
+        merged = merge(value, False)
+        if merged is NotImplemented:
+            merged = value
+        validator(merged)
+        return merged
+    return normalizer
+
+
+def _dict_normalizer(validator):
+    # see DictOf._check and `_dict_merger`; only literal keys are supported
+    if not validator._pairs or None in validator._index:
+        return None
+    keys = [literal[0] for literal in validator._index]
+    if len(set(keys)) < len(keys):
+        return None
+
+    # required keys are always added by merging, so none can be missing
+    entries = []
+    for (k_validator, v_validator), (key, is_required) in zip(
+            validator._pairs, validator._index):
+        default_key = k_validator.get_default_for(None)
+        if default_key is None and not is_required:
+            entries.append((key, None, v_validator))
+        elif default_key == key:
+            entries.append((key, _normalizer_for(v_validator), v_validator))
+        else:
+            return None
+    known_keys = frozenset(keys)
+
+    def normalizer(value):
+        if value is None:
+            value = {}
+        elif not isinstance(value, dict):
+            validator(value)
+            return value
+        merged = {}
+        for key, normalize, v_validator in entries:
+            if normalize is not None:
+                try:
+                    merged[key] = normalize(value.get(key))
+                except (ValidationError, TypeError) as e:
+                    raise _dict_value_error(key, e)
+            elif key in value:
+                try:
+                    v_validator(value[key])
+                except (ValidationError, TypeError) as e:
+                    raise _dict_value_error(key, e)
+        for k, v in value.items():
+            if k not in merged:
+                merged[k] = v
+
+        validated_data_keys = known_keys.intersection(merged)
+        if len(validated_data_keys) < len(merged):
+            raise InvalidKeys(*(set(merged) - validated_data_keys))
+        return merged
+    return normalizer
+
+
+def _list_normalizer(validator):
+    # see BaseListOf._check and `_list_merger`; sampled lists are merged
+    # and then checked as usual
+    if validator._sample is not None:
+        return None
+    nested = validator._nested_validator
+    normalize_item = _normalizer_for(nested)
+
+    def normalizer(value):
+        if not value or not isinstance(value, list):
+            merged = [] if not value else value
+            validator(merged)
+            return merged
+        result = []
+        for i, item in enumerate(value):
+            try:
+                if item is None:
+                    nested(item)
+                else:
+                    item = normalize_item(item)
+            except ValidationError as e:
+                raise ValidationError._wrap(e, 'item #{0}: {error}', i)
+            result.append(item)
+        return result
+    return normalizer
+
+
+class TranslationCache(object):
+    """
+    A bounded LRU cache of validators created by :func:`translate`.
+
+    Natural specs are identified by their structure, so two equal dicts
+    share the same validator even if they are different objects.  Callables
+    (e.g. ``datetime.utcnow``) become :class:`DefaultFactory` defaults which
+    are called on each merge, so specs with them are cached too, except for
+    callables used as dictionary keys: these are called on translation.
+
+    The cache used by :func:`translate` is available as
+    :data:`translation_cache`::
+
+        >>> translation_cache.stats()
+        {'hits': 98, 'misses': 2, 'skipped': 0, 'size': 2, 'maxsize': 512}
+        >>> translation_cache.clear()
+
+    Set `maxsize` to `0` to disable caching.
+    """
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.skipped = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        with self._lock:
+            try:
+                entry = self._data.pop(key)
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data[key] = entry
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, validator, refs=()):
+        # `refs` are the objects identified by `id()` in the key; the entry
+        # keeps them alive so that their ids cannot be reused while it exists
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = validator, tuple(refs)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        "Removes all items from the cache and resets the counters."
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.skipped = 0
+
+    def stats(self):
+        return dict(hits=self.hits, misses=self.misses, skipped=self.skipped,
+                    size=len(self._data), maxsize=self.maxsize)
+
+
+#: The cache used by :func:`translate`.
+translation_cache = TranslationCache()
+
+
+class InternTable(object):
+    """
+    A table of canonical validators.  A validator is replaced with a shared
+    instance which is structurally equal to it (see
+    :attr:`BaseValidator.fingerprint`); nested validators are interned, too.
+    A registry of schemas which reuse the same substructures then keeps
+    a single copy of each of them.
+
+    Interning is off by default.  When it is turned on, :func:`translate`
+    and the shortcuts (:func:`~monk.shortcuts.nullable` and so on) return
+    canonical instances.  The table used by them is available as
+    :data:`intern_table`::
+
+        >>> intern_table.enabled = True
+        >>> a = translate({'street': str, 'city': str})
+        >>> b = translate({'address': {'street': str, 'city': str}})
+        >>> b._pairs[0][1] is a
+        True
+        >>> intern_table.stats()
+        {'hits': 2, 'misses': 6, 'size': 6}
+
+    `hits` is the number of validators which were replaced by a canonical
+    instance and `misses` is the number of validators which became canonical.
+
+    The table keeps weak references, so it does not prevent unused
+    validators from being garbage-collected.  Validators must not be modified
+    after they have been interned.
+    """
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._data = weakref.WeakValueDictionary()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def intern(self, validator):
+        "Returns the canonical instance for given validator."
+        with self._lock:
+            return self._intern(validator)
+
+    def _intern(self, validator):
+        key = validator.fingerprint
+        canonical = self._data.get(key)
+        if canonical is validator:
+            return validator
+        if canonical is not None:
+            if canonical == validator:
+                self.hits += 1
+                return canonical
+            # same fingerprint but not equal (e.g. some attribute has
+            # a non-informative repr); leave it alone
+            return validator
+        for name, value in validator._structure().items():
+            interned = self._intern_value(value)
+            if interned is not value:
+                setattr(validator, name, interned)
+        self._data[key] = validator
+        self.misses += 1
+        return validator
+
+    def _intern_value(self, value):
+        if isinstance(value, BaseValidator):
+            return self._intern(value)
+        if type(value) in (list, tuple):
+            items = [self._intern_value(x) for x in value]
+            if any(a is not b for a, b in zip(items, value)):
+                return type(value)(items)
+        return value
+
+    def clear(self):
+        "Removes all items from the table and resets the counters."
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        return dict(hits=self.hits, misses=self.misses, size=len(self._data))
+
+
+#: The table used by :func:`translate` and the shortcuts.
+intern_table = InternTable()
+
+
+def _interned(validator):
+    if intern_table.enabled:
+        return intern_table.intern(validator)
+    return validator
+
+
+class _Uncacheable(Exception):
+    pass
+
+
+_SCALAR_TYPES = (
+    (bool, int, complex, type(None), compat.binary_type) + compat.text_types)
+
+
+def _fingerprint(value, refs):
+    """
+    Returns a hashable representation of given natural spec.  Raises
+    `_Uncacheable` if the spec contains callable dictionary keys.
+
+    Objects which are identified by `id()` are appended to the list `refs`.
+    """
+    if isinstance(value, BaseValidator):
+        # the resulting validator may not keep this one (e.g. if it was
+        # replaced by a canonical instance), so the cache entry must keep it
+        # to prevent reuse of the id by another object
+        refs.append(value)
+        return ('validator', id(value))
+    if isinstance(value, type):
+        return ('type', value)
+    if isinstance(value, list):
+        return ('list',) + tuple(_fingerprint(x, refs) for x in value)
+    if isinstance(value, dict):
+        if any(type(k) in compat.func_types for k in value):
+            raise _Uncacheable()
+        return ('dict',) + tuple((_fingerprint(k, refs), _fingerprint(v, refs))
+                                 for k, v in value.items())
+    if type(value) is float:
+        # 0.0 == -0.0 but we want to keep the default as is
+        return (float, repr(value))
+    if type(value) in _SCALAR_TYPES:
+        return (type(value), value)
+    refs.append(value)
+    return ('object', id(value))
+
+
 def translate(value):
     """
     Translates given schema from "pythonic" syntax to a validator.
@@ -708,7 +2170,32 @@ def translate(value):
         >>> translate('hello')
         IsA(str, default='hello')
 
+    The validators are cached (see :class:`TranslationCache`), so the same
+    validator instance may be returned for equal specs.  If interning is
+    enabled (see :class:`InternTable`), canonical instances are returned.
     """
+    if isinstance(value, BaseValidator):
+        return _interned(value)
+
+    cache = translation_cache
+    if not cache.maxsize:
+        return _interned(_translate(value))
+
+    refs = []
+    try:
+        key = _fingerprint(value, refs)
+    except _Uncacheable:
+        cache.skipped += 1
+        return _interned(_translate(value))
+
+    validator = cache.get(key)
+    if validator is None:
+        validator = _interned(_translate(value))
+        cache.put(key, validator, refs)
+    return _interned(validator)
+
+
+def _translate(value):
     if isinstance(value, BaseValidator):
         return value
 
@@ -719,8 +2206,9 @@ def translate(value):
         return IsA(value)
 
     if type(value) in compat.func_types:
+        # the function is only called here to find out the type
         real_value = value()
-        return IsA(type(real_value), default=real_value)
+        return IsA(type(real_value), default=DefaultFactory(value))
 
     if isinstance(value, list):
         if value == []:
@@ -728,7 +2216,7 @@ def translate(value):
             return IsA(list)
         elif len(value) == 1:
             # the only item as spec for each item of the collection
-            return ListOf(translate(value[0]))
+            return ListOf(_translate(value[0]))
         else:
             raise StructureSpecificationError(
                 'Expected a list containing exactly 1 item; '
@@ -742,12 +2230,271 @@ def translate(value):
             if isinstance(k, BaseValidator):
                 k_validator = k
             else:
-                k_validator = translate(k)
+                k_validator = _translate(k)
                 default = k_validator.get_default_for(None)
                 if default is not None:
                     k_validator = Equals(default)
-            v_validator = translate(v)
+            v_validator = _translate(v)
             items.append((k_validator, v_validator))
         return DictOf(items)
 
     return IsA(type(value), default=value)
+
+
+class _FusedIsA(IsA):
+    """
+    A run of sibling ``IsA(t)`` and ``Equals(None)`` branches of :class:`Any`
+    checked with a single `isinstance()` call.  The error message is the
+    same as for the original branches.  See :func:`optimize`.
+    """
+    __slots__ = ('_branches',)
+
+    def __init__(self, branches):
+        types = []
+        for branch in branches:
+            if isinstance(branch, Equals):
+                types.append(type(None))
+            else:
+                types.append(branch.expected_type)
+        super(_FusedIsA, self).__init__(tuple(types))
+        self._branches = branches
+
+    def __call__(self, value):
+        if isinstance(value, self.expected_type) == self.negated:
+            self._raise_error(value)
+
+    def matches(self, value):
+        return isinstance(value, self.expected_type) != self.negated
+
+    def __repr__(self):
+        s = ' or '.join(repr(x) for x in self._branches)
+        if self.negated:
+            s = 'not ({s})'.format(s=s)
+        return s
+
+
+class _IsNone(Equals):
+    """
+    Same as ``Equals(None)`` but compares by identity.  See :func:`optimize`.
+    """
+    __slots__ = ()
+
+    def __init__(self):
+        super(_IsNone, self).__init__(None)
+
+    def __call__(self, value):
+        if (value is None) == self.negated:
+            self._raise_error(value)
+
+    def matches(self, value):
+        return (value is None) != self.negated
+
+
+def optimize(validator, adaptive=False):
+    """
+    Returns a validator which checks values exactly as given one does but
+    faster.  Errors have the same messages; defaults are the same.  The
+    original tree is not modified.
+
+    The following rewrites are made:
+
+    * ``Equals(None)`` compares by identity;
+    * sibling ``IsA`` (without defaults) and ``Equals(None)`` branches of
+      :class:`Any` are checked with a single `isinstance()` call, e.g.
+      ``IsA(int) | IsA(float)`` becomes ``isinstance(value, (int, float))``;
+    * an :class:`All` nested in an :class:`All` (or an :class:`Any` in an
+      :class:`Any`) is merged into the outer one unless either of them is
+      negated or has defaults of its own, or this would change the defaults
+      (e.g. if none or several of the inner validators have defaults).
+
+    Dictionary keys are not optimized.
+
+    If `adaptive` is true, each :class:`Any` with several nested validators
+    is switched to the adaptive mode.
+
+    The optimized tree is used by :func:`~monk.compiler.compile`.
+    """
+    return _optimize(validator, {}, adaptive)
+
+
+def _optimize(validator, seen, adaptive):
+    key = id(validator)
+    if key in seen:
+        return seen[key]
+    optimized = validator
+    for name, value in validator._structure().items():
+        if name == '_pairs' and isinstance(validator, DictOf):
+            # the keys are left as is: their reprs are used in messages
+            new_value = [(k, _optimize(v, seen, adaptive)) for k, v in value]
+            if all(a[1] is b[1] for a, b in zip(new_value, value)):
+                new_value = value
+        else:
+            new_value = _optimize_value(value, seen, adaptive)
+        if new_value is not value:
+            if optimized is validator:
+                optimized = copy.copy(validator)
+            setattr(optimized, name, new_value)
+
+    cls = type(optimized)
+    if cls is Equals and optimized._expected_value is None:
+        negated = optimized.negated
+        optimized = _IsNone()
+        optimized.negated = negated
+    elif cls in (All, Any):
+        specs = _flatten(optimized)
+        if cls is Any:
+            specs = _fuse_types(specs)
+        make_adaptive = (cls is Any and adaptive and len(specs) > 1 and
+                         not optimized._adaptive)
+        if specs != optimized._specs or make_adaptive:
+            if optimized is validator:
+                optimized = copy.copy(validator)
+            optimized._specs = specs
+            if make_adaptive:
+                optimized._adaptive = True
+            if cls is Any:
+                optimized._reset_hits()
+    seen[key] = optimized
+    return optimized
+
+
+def _optimize_value(value, seen, adaptive):
+    if isinstance(value, BaseValidator):
+        return _optimize(value, seen, adaptive)
+    if type(value) in (list, tuple):
+        items = [_optimize_value(x, seen, adaptive) for x in value]
+        if any(a is not b for a, b in zip(items, value)):
+            return type(value)(items)
+    return value
+
+
+def _flatten(combinator):
+    # see BaseCombinator._merge: the defaults are only the same if neither
+    # the outer nor the inner combinator have defaults of their own;
+    # a negated combinator is described by its repr which would change
+    if combinator._first_is_default or combinator.negated:
+        return combinator._specs
+    specs = []
+    for i, spec in enumerate(combinator._specs):
+        if (type(spec) is type(combinator) and not spec.negated and
+                not spec._default and not spec._first_is_default and
+                _can_flatten(spec, specs + combinator._specs[i+1:])):
+            specs.extend(spec._specs)
+        else:
+            specs.append(spec)
+    return specs
+
+
+def _can_flatten(inner, others):
+    # The outer combinator counts the inner one as a single candidate
+    # default (which is the value itself if the inner one has no default).
+    # The branches may replace it unless they can yield no candidates while
+    # the other validators yield a single one which differs from the value.
+    for is_none in True, False:
+        if any(_yields_default(spec, is_none)[0] == 'sure'
+               for spec in inner._specs):
+            continue
+        yields = [_yields_default(spec, is_none) for spec in others]
+        sure = [changes for kind, changes in yields if kind == 'sure']
+        if len(sure) > 1:
+            continue
+        if sure[0] if sure else any(changes for _, changes in yields):
+            return False
+    return True
+
+
+def _yields_default(validator, is_none):
+    """
+    Tells how given validator takes part in the merge of a combinator (see
+    `BaseCombinator._merge`) for `None` or for other values.  Returns a tuple
+    `(kind, changes)` where `kind` is ``'no'``, ``'maybe'`` or ``'sure'``
+    depending on whether a candidate default is yielded and `changes` is
+    `True` if it may differ from the value itself.
+    """
+    if _merger_for(validator) is _no_default:
+        return 'no', False
+    if _has_plain_default(validator):
+        return ('sure', True) if is_none else ('no', False)
+    cls = type(validator)
+    if (cls.__module__ != __name__ or
+            _defining_class(cls, '_merge') not in _MERGER_BUILDERS):
+        return 'maybe', True
+    # the built-in mergers except the plain one always yield a value
+    if is_none:
+        return 'sure', True
+    if isinstance(validator, OneOf):
+        return 'sure', False
+    if isinstance(validator, BaseCombinator) and not validator._default:
+        return 'sure', any(_yields_default(spec, is_none)[1]
+                           for spec in validator._specs)
+    return 'sure', True
+
+
+def _is_fusable(spec):
+    if spec.negated:
+        return False
+    if type(spec) is IsA:
+        return spec._default is None
+    return type(spec) in (_IsNone, _FusedIsA)
+
+
+def _fuse_types(specs):
+    result = []
+    run = []
+    for spec in specs + [None]:
+        if spec is not None and _is_fusable(spec):
+            run.append(spec)
+            continue
+        if len(run) > 1:
+            branches = []
+            for x in run:
+                branches.extend(x._branches if type(x) is _FusedIsA else [x])
+            result.append(_FusedIsA(branches))
+        else:
+            result.extend(run)
+        run = []
+        if spec is not None:
+            result.append(spec)
+    return result
+
+
+def _is_side_effect_free(validator):
+    """
+    Returns `True` if given validator and the nested ones only run the code
+    of built-in validators (except :class:`HasAttr` which may call property
+    getters).
+    """
+    cls = type(validator)
+    if cls.__module__ != __name__ or cls is HasAttr:
+        return False
+    values = list(validator._structure().values())
+    while values:
+        value = values.pop()
+        if isinstance(value, BaseValidator):
+            if not _is_side_effect_free(value):
+                return False
+        elif type(value) in (list, tuple):
+            values.extend(value)
+    return True
+
+
+# validator class that defines `_merge()` → merger factory
+_MERGER_BUILDERS = {
+    BaseValidator: _plain_merger,
+    BaseCombinator: _combinator_merger,
+    OneOf: _one_of_merger,
+    BaseListOf: _list_merger,
+    DictOf: _dict_merger,
+}
+
+
+# validator class → normalizer factory (which may return `None` if the
+# validator is not supported)
+_NORMALIZER_BUILDERS = {
+    DictOf: _dict_normalizer,
+    ListOfAll: _list_normalizer,
+}
+
+
+# checked before each InRange
+InRange.implies = optimize(InRange.implies)
@@ -0,0 +1,23 @@
+"""
+Helpers for the tests which compare an alternative way of validation
+(compiled, asynchronous, streaming, columnar) with the usual one.
+"""
+from monk.compat import text_type as t
+from monk import MISSING
+
+
+SCALARS = [None, MISSING, True, 0, 1, 5, -3, 2.5, t(''), t('foo'), t('x'*10),
+           [], [1], {}, {'a': 1}]
+
+
+def describe(error):
+    "Returns the properties of an error which must be the same."
+    return type(error), str(error), getattr(error, 'path', None)
+
+
+def outcome(func, value):
+    try:
+        func(value)
+    except Exception as e:
+        return describe(e)
+    return None
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+#
+#    Monk is an unobtrusive data modeling, manipulation and validation library.
+#    Copyright © 2011—2015  Andrey Mikhaylenko
+#
+#    This file is part of Monk.
+#
+#    Monk is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published
+#    by the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Monk is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU Lesser General Public License
+#    along with Monk.  If not, see <http://gnu.org/licenses/>.
+"""
+Asyncio tests
+=============
+
+Each spec is checked against a number of values both synchronously and
+by :func:`validate_async`; the outcomes must be identical.  Requires Python
+3.5+ (see `conftest.py`).
+"""
+import asyncio
+
+import pytest
+
+from monk.compat import text_type as t
+from monk import (
+    Anything, IsA, Equals, InRange, Length, DictOf, ListOf, ListOfAny,
+    Exists, ValidationError, translate, nullable, optional, opt_key,
+    one_of, collect_all_errors,
+)
+from monk.aio import validate_async
+
+from . import SCALARS, outcome
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def assert_same(spec, values):
+    validator = translate(spec)
+
+    async def check(value):
+        await validate_async(spec, value, nodes=2)
+
+    for value in values:
+        expected = outcome(validator, value)
+        assert outcome(lambda v: run(check(v)), value) == expected, \
+            (spec, value)
+
+
+def test_leaves():
+    assert_same(IsA(int), SCALARS)
+    assert_same(~Equals(1), SCALARS)
+    assert_same(InRange(2, 4), SCALARS)
+
+
+def test_combinators():
+    assert_same(IsA(int) | IsA(t), SCALARS)
+    assert_same(~(IsA(int) | IsA(t)), SCALARS)
+    assert_same(IsA(int) & InRange(2), SCALARS)
+    assert_same(nullable(int), SCALARS)
+    assert_same(one_of([1, 2]), SCALARS)
+    assert_same(Length(2) | ListOf(int), SCALARS + [[1, t('a')]])
+
+
+def test_lists():
+    values = SCALARS + [[1, 2, 3], [1, t('a')], [t('a'), 1], [None],
+                        [[1], [2, 3]], [[1], []], [[t('a')]]]
+    assert_same([int], values)
+    assert_same([optional(int)], values)
+    assert_same([[int]], values)
+    assert_same(ListOfAny(IsA(int)), values)
+    assert_same(ListOfAny(ListOf(IsA(int))), values)
+    assert_same(~ListOf(int), values)
+
+
+def test_dicts():
+    spec = {
+        'name': t,
+        opt_key('tags'): [t],
+        'meta': {'created': int, opt_key('note'): nullable(t)},
+    }
+    valid = {'name': t('x'), 'meta': {'created': 1}}
+    assert_same(spec, SCALARS + [
+        valid,
+        dict(valid, tags=[t('a'), 1]),
+        dict(valid, extra=1),
+        dict(valid, meta={}),
+        dict(valid, meta={'created': 1, 'note': 1}),
+        {},
+    ])
+    values = SCALARS + [{t('a'): 1}, {t('a'): t('b')}, {1: 1}]
+    assert_same({t: int}, values)
+    assert_same({IsA(t) | ~Exists(): int}, values)
+    assert_same(DictOf([(IsA(t), IsA(int)), (Equals(t('a')), IsA(t))]),
+                values)
+
+
+def test_collect_all_errors():
+    with collect_all_errors():
+        with pytest.raises(ValidationError) as excinfo:
+            run(validate_async([int], [1, 'a', 'b']))
+    assert str(excinfo.value) == 'item #1: must be int and item #2: must be int'
+
+
+def test_yields_to_event_loop():
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(None)
+            await asyncio.sleep(0)
+
+    async def main():
+        task = asyncio.ensure_future(ticker())
+        await asyncio.sleep(0)
+        before = len(ticks)
+        await validate_async([{'a': int}], [{'a': i} for i in range(1000)],
+                             nodes=100, microseconds=10 ** 6)
+        during = len(ticks) - before
+        task.cancel()
+        return during
+
+    # 2000 values are checked (the list items and their dict values)
+    assert run(main()) >= 15
+
+
+def test_yields_to_event_loop_on_failed_items():
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(None)
+            await asyncio.sleep(0)
+
+    async def main():
+        task = asyncio.ensure_future(ticker())
+        await asyncio.sleep(0)
+        before = len(ticks)
+        with pytest.raises(ValidationError):
+            await validate_async(ListOfAny(IsA(int)), [t('x')] * 1000,
+                                 nodes=100, microseconds=10 ** 6)
+        during = len(ticks) - before
+        task.cancel()
+        return during
+
+    assert run(main()) >= 5
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+#
+#    Monk is an unobtrusive data modeling, manipulation and validation library.
+#    Copyright © 2011—2015  Andrey Mikhaylenko
+#
+#    This file is part of Monk.
+#
+#    Monk is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published
+#    by the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Monk is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU Lesser General Public License
+#    along with Monk.  If not, see <http://gnu.org/licenses/>.
+"""
+Columnar validation tests
+=========================
+
+Each batch is validated both row-wise and by columns; the reported records
+and errors must be identical.
+"""
+import pytest
+
+pytest.importorskip('numpy')
+
+from monk.compat import text_type as t
+from monk import (
+    Contains, Equals, InRange, IsA, Length, Exists, validate_many, nullable,
+    one_of, opt_key,
+)
+from monk.columnar import validate_columns
+
+from . import describe
+
+
+def assert_same(spec, records):
+    expected = [(i, describe(e))
+                for i, e in validate_many(spec, records) if e is not None]
+    actual = [(i, describe(e)) for i, e in validate_columns(spec, records)]
+    assert actual == expected
+
+
+VALUES = [None, True, False, 0, 1, -5, 200, 2 ** 53 + 1, 2 ** 70, 1.5, 1e300,
+          float('nan'), t(''), t('abc'), t('abcdef'), [], [1, 2], {},
+          {'a': 1}]
+
+
+def test_leaves():
+    for value_spec in [
+        int, float, t, bool, dict, list, IsA(int) | IsA(float),
+        InRange(0, 150), InRange(min=1.5), InRange(max=2 ** 60),
+        InRange(0, 150) & IsA(int), Length(1, 3), Length(min=4),
+        Equals(1), Equals(t('abc')), Equals(None), Equals([1, 2]),
+        nullable(int), one_of([1, t('abc')]), ~IsA(int), ~Equals(1),
+        None, Exists(),
+    ]:
+        spec = {'a': value_spec, opt_key('b'): value_spec}
+        records = [{'a': value} for value in VALUES]
+        records += [{'a': 1, 'b': value} for value in VALUES]
+        assert_same(spec, records)
+
+
+def test_records():
+    spec = {'name': t, 'age': InRange(0, 150), opt_key('note'): nullable(t)}
+    assert_same(spec, [
+        {'name': t('john'), 'age': 30},
+        {'name': t('mary'), 'age': 200},
+        {'name': t('mary'), 'age': 20, 'note': None},
+        {'name': t('mary'), 'age': 20, 'note': 5},
+        {'name': t('mary')},
+        {'name': t('mary'), 'age': 20, 'extra': 1},
+        {},
+        None,
+        [],
+        t('foo'),
+    ])
+    assert_same(spec, [])
+
+
+def test_fallback():
+    # not flat: the records are validated one by one
+    assert_same({t: int}, [{t('a'): 1}, {t('a'): t('b')}, {1: 1}])
+    assert_same([int], [[1], [t('a')], None])
+    assert_same(~IsA(dict), [{}, None])
+
+    # no columnar check: the values are checked one by one
+    assert_same({'a': Contains(t('x'))}, [{'a': 5}, {'a': t('x')}, {'a': []}])
@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+#
+#    Monk is an unobtrusive data modeling, manipulation and validation library.
+#    Copyright © 2011—2015  Andrey Mikhaylenko
+#
+#    This file is part of Monk.
+#
+#    Monk is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published
+#    by the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Monk is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU Lesser General Public License
+#    along with Monk.  If not, see <http://gnu.org/licenses/>.
+"""
+Compiler tests
+==============
+
+Each spec is checked against a number of values both by the interpreted
+validators and by the compiled function; the outcomes must be identical.
+"""
+import copy
+
+from monk.compat import text_type as t
+from monk import (
+    All, Any, Anything, IsA, HasAttr, Equals, Contains, InRange, Length,
+    DictOf, ListOf, ListOfAny, Exists, OneOf, translate, compile,
+    ValidationError, AtLeastOneFailed, nullable, optional, opt_key, one_of,
+    collect_all_errors, Sample, sampling, compile_merger, merge_defaults,
+    DefaultFactory,
+)
+
+from . import SCALARS, outcome
+
+
+def assert_same(spec, values):
+    validator = translate(spec)
+    compiled = compile(spec)
+    for value in values:
+        expected = outcome(validator, value)
+        assert outcome(compiled, value) == expected, (spec, value)
+
+
+def test_star_import_keeps_builtin_compile():
+    namespace = {}
+    exec('from monk import *', namespace)
+    assert 'compile' not in namespace
+    assert 'compile_merger' in namespace
+    assert 'translate' in namespace
+
+
+def test_leaves():
+    assert_same(Anything(), SCALARS)
+    assert_same(IsA(int), SCALARS)
+    assert_same(IsA(t, default=t('x')), SCALARS)
+    assert_same(Equals(1), SCALARS)
+    assert_same(Equals(None), SCALARS)
+    assert_same(Exists(), SCALARS)
+    assert_same(HasAttr('__len__'), SCALARS)
+    assert_same(Contains(1), [[1], [2], t('abc'), {1: 2}])
+    assert_same(InRange(2, 4), SCALARS)
+    assert_same(InRange(min=2), SCALARS)
+    assert_same(InRange(max=4), SCALARS)
+    assert_same(Length(2, 4), SCALARS)
+    assert_same(Length(max=0), SCALARS)
+
+
+def test_negated():
+    assert_same(~Anything(), SCALARS)
+    assert_same(~IsA(int), SCALARS)
+    assert_same(~Equals(1), SCALARS)
+    assert_same(~Exists(), SCALARS)
+    assert_same(~InRange(2, 4), SCALARS)
+    assert_same(~Length(2, 4), SCALARS)
+    assert_same(~(IsA(int) | IsA(t)), SCALARS)
+    assert_same(~(IsA(int) & InRange(2)), SCALARS)
+    assert_same(~ListOf(int), SCALARS + [[1, 2], [1, t('a')]])
+    assert_same(~DictOf([(Equals('a'), IsA(int))]), SCALARS)
+
+
+def test_combinators():
+    assert_same(IsA(int) | IsA(t), SCALARS)
+    assert_same(nullable(int), SCALARS)
+    assert_same(optional(t), SCALARS)
+    assert_same(one_of([1, 2, t('foo')]), SCALARS)
+    assert_same(All([Length(min=2), Length(max=3)]), SCALARS)
+    assert_same(InRange(2) | Length(2), SCALARS)
+    assert_same(InRange(2) & ~Equals(3), SCALARS)
+    assert_same(Any([IsA(int) | IsA(t), Length(2) & IsA(list)]), SCALARS)
+
+
+def test_lists():
+    values = SCALARS + [[1, 2, 3], [1, t('a')], [t('a'), 1], [None],
+                        [[1], [2, 3]], [[1], []], [[t('a')]]]
+    assert_same([int], values)
+    assert_same([nullable(int)], values)
+    assert_same([optional(int)], values)
+    assert_same([[int]], values)
+    assert_same(ListOfAny(IsA(int)), values)
+    assert_same(ListOfAny(optional(int)), values)
+    assert_same(ListOfAny(ListOf(IsA(int))), values)
+    assert_same([InRange(1, 2)], values)
+
+
+def test_dicts():
+    spec = {
+        'name': t,
+        'age': InRange(0, 150),
+        opt_key('tags'): [t],
+        'meta': {
+            'created': int,
+            opt_key('note'): nullable(t),
+        },
+    }
+    meta = {'created': 1}
+    valid = {'name': t('John'), 'age': 25, 'meta': meta}
+    values = SCALARS + [
+        valid,
+        dict(valid, tags=[t('a')]),
+        dict(valid, tags=[t('a'), 1]),
+        dict(valid, tags=t('a')),
+        dict(valid, age=200),
+        dict(valid, age=t('old')),
+        dict(valid, extra=1),
+        dict(valid, meta={}),
+        dict(valid, meta=dict(meta, note=None)),
+        dict(valid, meta=dict(meta, note=1)),
+        dict(valid, meta=dict(meta, created=t('x'))),
+        dict(valid, meta=dict(meta, x=1, y=2)),
+        dict(valid, meta=None),
+        {'age': 25},
+        {},
+        {1: 2},
+    ]
+    assert_same(spec, values)
+
+
+def test_dict_patterns():
+    values = SCALARS + [
+        {t('a'): 1}, {t('a'): t('b')}, {t('a'): 1, t('b'): None},
+        {1: 1}, {t('a'): 1, 2: 3}, {t('a'): 1, t('b'): 1.5},
+    ]
+    assert_same({t: int}, values)
+    assert_same({t: nullable(int)}, values)
+    assert_same({IsA(t) | ~Exists(): int}, values)
+    assert_same({Equals(t('a')) | Equals(t('b')): int}, values)
+    assert_same({t('a'): int, t: Anything()}, values)
+    assert_same({opt_key(t('a')): int, int: int}, values)
+    assert_same({~Exists() | Equals(t('a')): int}, values)
+    assert_same({Equals(1): int, Equals(2): int}, values)
+    assert_same({~IsA(t): int}, values)
+    assert_same(DictOf([(IsA(t), IsA(int)), (Equals(t('a')), IsA(t))]),
+                values)
+    assert_same(DictOf([]), values)
+
+
+def test_unknown_validator():
+    class Even(IsA):
+        def __init__(self):
+            super(Even, self).__init__(int)
+
+        def _check(self, value):
+            super(Even, self)._check(value)
+            if value % 2:
+                self._raise_error(value)
+
+    assert_same({'x': Even()}, [{'x': 1}, {'x': 2}, {'x': t('a')}])
+    assert_same([Even()], [[1], [2], [t('a')]])
+
+
+def test_deep_nesting():
+    spec = int
+    for i in range(30):
+        spec = {t('x'): [spec]}
+    value = 1
+    for i in range(30):
+        value = {t('x'): [value]}
+    assert_same(spec, [value, {}, {t('x'): []}])
+
+    bad = t('a')
+    for i in range(30):
+        bad = {t('x'): [bad]}
+    assert_same(spec, [bad])
+
+
+def test_collect_all_errors():
+    spec = [int]
+    with collect_all_errors():
+        assert outcome(compile(spec), [1, 'a', 'b']) == (
+            AtLeastOneFailed, 'item #1: must be int and item #2: must be int',
+            ())
+
+
+def test_sample():
+    values = [list(range(50)) + ['x'], ['x'] + list(range(50))]
+    assert_same({'a': ListOf(IsA(int), sample=Sample(1, 1, 0))},
+                [{'a': v} for v in values])
+    with sampling(first=1, last=1, rate=0):
+        assert_same([int], values)
+        assert outcome(compile([int]), [1] * 25 + ['x'] + [1] * 25) is None
+
+
+def test_adaptive_any():
+    spec = Any([IsA(int), IsA(str), Equals(None)], adaptive=True)
+    assert_same({'a': spec}, [{'a': 1}, {'a': 'x'}, {'a': None}, {'a': 1.5}])
+
+
+def test_source():
+    check = compile({'a': int})
+    assert 'def ' in check.source
+
+
+def merged(func, spec, value):
+    try:
+        result = func(spec, copy.deepcopy(value))
+    except Exception as e:
+        return type(e), str(e)
+    # the key order matters too
+    return result, repr(result)
+
+
+def assert_same_merge(spec, values):
+    merge = compile_merger(spec)
+    for value in values:
+        expected = merged(merge_defaults, spec, value)
+        assert merged(lambda s, v: merge(v), spec, value) == expected, \
+            (spec, value)
+
+
+MERGED_VALUES = [None, 0, 1, t('x'), [], [None, 1], [{}], {}, {'a': None},
+                 {'a': 5, 'z': 1}, {'b': [{}, None, {'c': 1, 'y': 2}]},
+                 {'b': t('bogus')}, {'d': {}}, {'d': {'e': 0, 'f': 1}}]
+
+
+def test_merge_leaves():
+    for spec in (Anything(), IsA(int), IsA(int, default=1), Equals(t('x')),
+                 InRange(0, 5, default=3), Exists(), HasAttr('x'),
+                 OneOf([1, 2]), OneOf([1, 2], first_is_default=True),
+                 OneOf([[1]]), IsA(list, default=[1, {'a': []}]),
+                 IsA(int, default=DefaultFactory(lambda: 7))):
+        assert_same_merge(spec, MERGED_VALUES)
+
+
+def test_merge_containers():
+    assert_same_merge({'a': 1, 'b': [{'c': 2, opt_key('x'): 3}],
+                       'd': {'e': t('x'), opt_key('f'): [int]}},
+                      MERGED_VALUES)
+    assert_same_merge([int], MERGED_VALUES)
+    assert_same_merge([[{'a': 1}]], MERGED_VALUES + [[[{}, None]], [[]]])
+    assert_same_merge(ListOfAny(IsA(int, default=1)), MERGED_VALUES)
+    assert_same_merge({}, MERGED_VALUES)
+    assert_same_merge(DictOf([]), MERGED_VALUES)
+    assert_same_merge({IsA(t): int, 'a': 1}, MERGED_VALUES)
+    assert_same_merge(DictOf([(Equals('a'), IsA(int, default=1)),
+                              (Equals('a'), IsA(int, default=2))]),
+                      MERGED_VALUES)
+    assert_same_merge(DictOf([(IsA(t, default=t('a')), IsA(int, default=1))]),
+                      MERGED_VALUES)
+
+
+def test_merge_combinators():
+    dict_a = DictOf([(Equals('a'), IsA(int, default=1))])
+    dict_b = DictOf([(Equals('b'), IsA(int, default=2))])
+    for first_is_default in False, True:
+        for specs in ([IsA(int, default=1), IsA(t, default=t('a'))],
+                      [IsA(int), IsA(t, default=t('a'))],
+                      [Anything(), IsA(t, default=t('a'))],
+                      [dict_a, Equals(None)], [Equals(None), dict_a],
+                      [dict_a, dict_b], [dict_a, IsA(int, default=5)],
+                      [ListOf(dict_a), dict_b],
+                      [Any([dict_a, dict_b]), IsA(int)],
+                      [OneOf([3, 4], first_is_default=True), dict_a],
+                      [HasAttr('x'), Exists()], [~Exists()]):
+            for cls in Any, All:
+                assert_same_merge(cls(specs, first_is_default=first_is_default),
+                                  MERGED_VALUES)
+    assert_same_merge(Any([IsA(int), IsA(t)], default=5), MERGED_VALUES)
+    assert_same_merge(Any([dict_a], default={'x': []}), MERGED_VALUES)
+    assert_same_merge({'a': nullable(int), 'b': optional([{'c': 1}]),
+                       'd': nullable({'e': 1}), opt_key('f'): one_of([1, 2])},
+                      MERGED_VALUES)
+
+
+def test_merge_custom_validator():
+    class Upper(IsA):
+        def _merge(self, value, inplace=False):
+            return value.upper() if value else t('DEFAULT')
+
+    spec = {'a': Upper(t), 'b': Any([Upper(t), IsA(int, default=1)])}
+    assert_same_merge(spec, [{}, {'a': t('x'), 'b': t('y')}])
+    assert 'get_default_for' in compile_merger(spec).source
+
+
+def test_merge_is_a_copy():
+    merge = compile_merger({'a': {'b': [1]}, 'c': IsA(list, default=[1])})
+    value = {'a': {}}
+    first = merge(value)
+    assert value == {'a': {}}
+    assert first == {'a': {'b': []}, 'c': [1]}
+    assert merge(value)['c'] is not first['c']
+
+
+def test_merge_deep_nesting():
+    spec = {t('x'): 1}
+    value = {}
+    for i in range(30):
+        spec = {t('x'): [spec], t('y'): nullable(IsA(int, default=i))}
+        value = {t('x'): [value, None]}
+    assert_same_merge(spec, [value, {}, None])
@@ -21,6 +21,9 @@
 Exception Formatting Tests
 ~~~~~~~~~~~~~~~~~~~~~~~~~~
 """
+import pickle
+
+from monk import Any, Anything, IsA, ListOfAny, opt_key, translate
 from monk.errors import (
     ValidationError,
     MissingKeys, InvalidKeys,
@@ -28,6 +31,14 @@ from monk.errors import (
 )
 
 
+def catch(spec, value):
+    try:
+        translate(spec)(value)
+    except ValidationError as e:
+        return e
+    raise AssertionError('expected an error')
+
+
 def test_validation_error():
     e = ValidationError('ima a-thinking ye is wrong')
     assert str(e) == 'ima a-thinking ye is wrong'
@@ -58,3 +69,89 @@ def test_at_least_one_failed():
     errors = ValidationError('w00t'), ValidationError('haX0r')
     e = AtLeastOneFailed(*errors)
     assert str(e) == "w00t and haX0r"
+
+
+def test_structured():
+    spec = {'a': {'b': [{'c': int}]}}
+    e = catch(spec, {'a': {'b': [{'c': 1}, {'c': 'x'}]}})
+    assert str(e) == "in 'a' ('b' value item #1: 'c' value must be int)"
+    assert e.path == ('a', 'b', 1, 'c')
+    assert e.validator == IsA(int)
+    assert e.code == 'is_a'
+
+    e = catch(spec, {'a': {'b': [{}]}})
+    assert str(e) == "in 'a' ('b' value item #0: must have keys: 'c')"
+    assert e.path == ('a', 'b', 0)
+    assert e.validator is None
+    assert e.code == 'missing_keys'
+
+    e = catch({opt_key('a'): ~IsA(int)}, {'a': 1})
+    assert e.path == ('a',)
+    assert e.code == 'not_is_a'
+
+    e = catch(IsA(int) | IsA(str), None)
+    assert str(e) == 'must be int or must be str'
+    assert e.path == ()
+    assert e.code == 'any'
+    assert [x.code for x in e.args] == ['is_a', 'is_a']
+
+    e = ValidationError('custom')
+    assert e.path == ()
+    assert e.validator is None
+    assert e.code is None
+
+
+def test_lazy_message():
+    class Spy(IsA):
+        reprs = 0
+
+        def __repr__(self):
+            Spy.reprs += 1
+            return super(Spy, self).__repr__()
+
+    e = catch({'a': [Spy(int)]}, {'a': ['x']})
+    assert Spy.reprs == 0
+    assert str(e) == "'a' value item #0: must be int"
+    assert Spy.reprs == 1
+    assert repr(e) == 'DictValueError({0!r})'.format(str(e))
+
+
+def test_args():
+    # the message is rendered when `args` are accessed
+    assert catch(int, 'x').args == ('must be int',)
+    assert catch({'a': int}, {'a': 'x'}).args == ("'a' value must be int",)
+    assert catch([int], ['x']).args == ('item #0: must be int',)
+
+    e = catch(IsA(int) | IsA(str), None)
+    assert [str(x) for x in e.args] == ['must be int', 'must be str']
+    assert MissingKeys('a', 'b').args == ('a', 'b')
+
+    e = ValidationError('custom')
+    e.args = ('changed',)
+    assert str(e) == 'changed'
+
+
+def test_empty_combined_error():
+    # no nested errors: the message is empty, not the validator's repr
+    e = catch(ListOfAny(Anything()), [])
+    assert type(e) is AllFailed
+    assert str(e) == ''
+    assert e.args == ()
+    assert e.code == 'list_of_any'
+
+    # a negated combinator is described by its repr
+    e = catch(~Any([IsA(int)]), 1)
+    assert str(e) == 'not (must be int)'
+    assert e.args == ('not (must be int)',)
+
+
+def test_pickle():
+    e = catch({'a': [int]}, {'a': ['x']})
+    clone = pickle.loads(pickle.dumps(e))
+    assert type(clone) is type(e)
+    assert str(clone) == str(e)
+    assert clone.path == e.path
+    assert clone.code == e.code
+
+    e = pickle.loads(pickle.dumps(MissingKeys('a')))
+    assert str(e) == "must have keys: 'a'"
@@ -21,7 +21,13 @@
 Helpers tests
 =============
 """
-from monk.helpers import walk_dict
+from pytest import raises
+
+from monk import (
+    ValidationError, StructureSpecificationError, Sample, nullable, opt_key,
+    sampling, translate,
+)
+from monk.helpers import BatchStats, validate_many, walk_dict
 
 
 class TestDataWalking:
@@ -59,3 +65,88 @@ class TestDataWalking:
             (('i',), None),
         ]
         assert sorted(walk_dict(data)) == sorted(paths)
+
+
+class TestBatchValidation:
+
+    def test_collect(self):
+        stats = BatchStats()
+        results = list(validate_many({'a': int}, [{'a': 1}, {'a': 'x'}, {}],
+                                     stats=stats))
+        assert [i for i, e in results] == [0, 1, 2]
+        assert results[0][1] is None
+        assert str(results[1][1]) == "'a' value must be int"
+        assert str(results[2][1]) == "must have keys: 'a'"
+        assert stats.total == 3
+        assert stats.failed == 2
+        assert stats.errors == {'DictValueError': 1, 'MissingKeys': 1}
+        assert stats.per_second > 0
+
+    def test_skip(self):
+        results = validate_many(int, iter([1, 'a', 3]), on_error='skip')
+        assert list(results) == [(0, None), (2, None)]
+
+    def test_raise(self):
+        results = validate_many(int, [1, 'a', 3], on_error='raise')
+        assert next(results) == (0, None)
+        with raises(ValidationError):
+            next(results)
+
+    def test_fail_early(self):
+        with raises(ValueError):
+            validate_many(int, [], on_error='ignore')
+        with raises(StructureSpecificationError):
+            validate_many([int, str], [])
+
+    def test_processes(self):
+        spec = {'a': [{'b': int, opt_key('c'): nullable(str)}]}
+        values = [{'a': [{'b': i, 'c': 'x' if i % 3 else i}]}
+                  for i in range(50)]
+
+        def describe(results):
+            return [(i, str(e), e and e.path, e and e.code)
+                    for i, e in results]
+
+        expected = describe(validate_many(spec, values))
+        stats = BatchStats()
+        results = list(validate_many(spec, values, workers=2, chunk_size=7,
+                                     stats=stats))
+        assert describe(results) == expected
+        assert stats.total == 50
+        assert stats.failed == 17
+
+        # errors refer to the nodes of the original tree
+        nested = translate(spec)._pairs[0][1]._nested_validator
+        assert results[0][1].validator is nested._pairs[1][1]
+
+        results = validate_many(spec, values, on_error='skip', workers=2)
+        assert [i for i, e in results] == [i for i in range(50) if i % 3]
+
+    def test_sample(self):
+        spec = {'points': [int]}
+        values = [{'points': list(range(size)) + ['x']}
+                  for size in (2, 300, 3000)]
+        stats = BatchStats()
+        sample = Sample(first=10, last=10, rate=0)
+        results = list(validate_many(spec, values, sample=sample,
+                                     stats=stats))
+        assert [(i, e and e.sampled) for i, e in results] == [
+            (0, False), (1, True), (2, True)]
+        assert stats.sampled == 2
+        assert stats.failed == 3
+
+        # the sample is only used for the batch
+        assert not translate(spec).matches(values[2])
+        with raises(ValidationError) as excinfo:
+            translate(spec)(values[2])
+        assert not excinfo.value.sampled
+
+        # items in the middle are not checked
+        values = [{'points': ['x'] + list(range(3000)) + ['x']}]
+        with sampling(first=0, last=0, rate=0.001):
+            assert list(validate_many(spec, values)) == [(0, None)]
+            stats = BatchStats()
+            results = list(validate_many(spec, values, workers=2,
+                                         stats=stats))
+            assert results == [(0, None)]
+            assert stats.sampled == 1
@@ -22,10 +22,19 @@
 Tests for Merging Defaults
 ~~~~~~~~~~~~~~~~~~~~~~~~~~
 """
+import copy
+from itertools import product
+
+import pytest
+
 from monk.compat import text_type as t
+from monk import validators
+from monk.modeling import StructuredDictMixin
 from monk import (
-    Any, Anything, IsA, DictOf, ListOf, Equals, Exists, translate,
-    merge_defaults, optional
+    All, Any, Anything, IsA, DictOf, ListOf, Equals, Exists, OneOf,
+    DefaultFactory, NoDefaultValue, ValidationError, translate,
+    merge_defaults, normalize, optional, nullable, opt_key, validate,
+    collect_all_errors, sampling, Sample
 )
 
 
@@ -441,3 +450,263 @@ class TestMisc:
 
         # make sure merging works as expected for nested *and* root dicts
         assert raw_spec == spec.get_default_for({})
+
+
+def merge_specs():
+    # the validators are created anew for each call because merge plans
+    # are cached by the instances
+    return [
+        Anything(), IsA(int), IsA(int, default=1), Equals('x'),
+        nullable(int), optional(IsA(int, default=1)),
+        Any([IsA(int, default=1), IsA(str, default='a')]),
+        Any([IsA(int, default=1), IsA(str, default='a')],
+            first_is_default=True),
+        Any([Anything(), IsA(str, default='a')]),
+        Any([IsA(int), IsA(str)], default=5),
+        All([IsA(int, default=1), IsA(str, default='a')]),
+        OneOf(['a', 'b']), OneOf(['a', 'b'], first_is_default=True),
+        OneOf(['a']),
+        ListOf(IsA(int)), ListOf(IsA(int, default=1)),
+        translate({'a': 1, 'b': [{'c': 'x', optional('d'): 2}],
+                   IsA(str): IsA(int), 'e': {}, 'f': {'g': None}}),
+        translate({'a': nullable(int), 'b': OneOf([1, 2], first_is_default=True)}),
+        DictOf([]),
+        DictOf([(Equals('a'), IsA(int, default=1)),
+                (Equals('a'), IsA(int, default=2))]),
+        IsA(int, default=DefaultFactory(int)),
+        IsA(list, default=[1, [2]]), Equals({'a': set([1])}),
+        Any([IsA(int), IsA(str)], default={'a': []}),
+        OneOf([[1], [2]], first_is_default=True),
+    ]
+
+
+MERGED_VALUES = [
+    None, 0, 1, 'a', [], [None, 1, None], [{}], {}, {'a': None},
+    {'a': 5, 'x': 1}, {'b': [{}, None, {'c': 'y', 'z': 1}]}, {'b': 'bogus'},
+    {'f': {'g': 1, 'h': 2}}, {'e': {'x': 1}},
+]
+
+
+class TestMergePlans:
+    """
+    Merge plans give the same results as `_merge()` methods
+    """
+    def merge_all(self):
+        results = []
+        for spec in merge_specs():
+            for value in MERGED_VALUES:
+                for silent, inplace in product([True, False], repeat=2):
+                    value = copy.deepcopy(value)
+                    try:
+                        result = spec.get_default_for(value, silent=silent,
+                                                      inplace=inplace)
+                    except NoDefaultValue:
+                        result = NoDefaultValue
+                    results.append((spec, value, silent, inplace, result,
+                                    result is value))
+        return results
+
+    def test_same_as_merge_methods(self, monkeypatch):
+        monkeypatch.setattr(validators.translation_cache, 'maxsize', 0)
+        expected = self.merge_all()
+        # fall back to `_merge()` for all validators
+        monkeypatch.setattr(validators, '_MERGER_BUILDERS', {})
+        assert self.merge_all() == expected
+
+    def test_result_is_a_copy(self):
+        spec = translate({'a': {'b': 1}, 'c': [int]})
+        value = {'a': {}, 'c': [1]}
+        merged = spec.get_default_for(value)
+        assert merged == {'a': {'b': 1}, 'c': [1]}
+        assert merged['c'] is not value['c']
+        assert value == {'a': {}, 'c': [1]}
+        assert spec.get_default_for(None) is not spec.get_default_for(None)
+
+    def test_custom_validator(self):
+        class Upper(IsA):
+            def _merge(self, value):
+                if value is None:
+                    raise NoDefaultValue()
+                return value.upper()
+
+        spec = DictOf([(Equals('a'), Upper(str)), (Equals('b'), Upper(str))])
+        assert spec.get_default_for({'a': 'x'}) == {'a': 'X', 'b': None}
+        with pytest.raises(NoDefaultValue):
+            Upper(str).get_default_for(None, silent=False)
+        assert Upper(str).get_default_for(None) is None
+
+    def test_custom_get_default_for_calls_super(self):
+        class Doubled(IsA):
+            def get_default_for(self, value, silent=True):
+                value = super(Doubled, self).get_default_for(value,
+                                                             silent=silent)
+                return value * 2
+
+        assert Doubled(int, default=3).get_default_for(None) == 6
+        assert Doubled(int, default=3).get_default_for(1) == 2
+        spec = DictOf([(Equals('a'), Doubled(int, default=3))])
+        assert spec.get_default_for({}) == {'a': 6}
+        assert spec.get_default_for({'a': 2}) == {'a': 4}
+        assert ListOf(Doubled(int)).get_default_for([1, 2]) == [2, 4]
+
+
+class TestDefaultFactories:
+    """
+    Defaults are created anew for each merged value
+    """
+    def test_factory(self):
+        counter = iter(range(100))
+        spec = translate({'a': lambda: next(counter), 'b': [{'c': lambda: []}]})
+        assert merge_defaults(spec, {}) == {'a': 1, 'b': []}
+        assert merge_defaults(spec, {}) == {'a': 2, 'b': []}
+        assert merge_defaults(spec, {'a': 0}) == {'a': 0, 'b': []}
+        assert merge_defaults(spec, {'b': [{}]}) == {'a': 3, 'b': [{'c': []}]}
+
+    def test_factory_in_combinators(self):
+        factory = DefaultFactory(lambda: [1])
+        for spec in (Any([IsA(int), IsA(str)], default=factory),
+                     Any([IsA(list, default=factory), IsA(str)],
+                         first_is_default=True)):
+            assert spec.get_default_for(None) == [1]
+            assert spec.get_default_for(None) is not spec.get_default_for(None)
+
+    def test_mutable_defaults_are_not_shared(self):
+        defaults = [1, {'a': [2]}], {'a': [2]}, set([1]), [], {}
+        for default in defaults:
+            spec = translate({'x': IsA(type(default), default=default)})
+            first = merge_defaults(spec, {})['x']
+            second = merge_defaults(spec, {})['x']
+            assert first == second == default
+            assert first is not second
+            assert first is not default
+        first = merge_defaults({'x': Equals([1])}, {})['x']
+        assert first == [1]
+        assert first is not merge_defaults({'x': Equals([1])}, {})['x']
+
+    def test_equality(self):
+        func = lambda: 1
+        assert translate(func) == IsA(int, default=DefaultFactory(func))
+        assert translate(func) != IsA(int, default=DefaultFactory(lambda: 1))
+        assert translate(func) != IsA(int, default=1)
+        assert (IsA(int, default=DefaultFactory(int)).fingerprint ==
+                IsA(int, default=DefaultFactory(int)).fingerprint)
+        assert repr(DefaultFactory(int)) == 'DefaultFactory(builtins.int)'
+
+
+NORMALIZED_SPECS = [
+    {'a': 1, 'b': [{'c': 'x', opt_key('d'): 2}], opt_key('e'): {'f': 0}},
+    {'a': nullable(int), 'b': [int], 'c': {}, 'd': None},
+    {'a': optional(IsA(int, default=1)), 'b': {'c': {'d': int}}},
+    {IsA(str): int},
+    {'a': [[{'b': 1}]], 'c': Any([IsA(int), IsA(str)]) | Equals(None)},
+    DictOf([(Equals('a'), IsA(int, default=1)),
+            (Equals('a'), IsA(int, default=2))]),
+    DictOf([(IsA(str, default='a'), IsA(int, default=1))]),
+    ~DictOf([(Equals('a'), IsA(int, default=1))]),
+    [{'a': 1}], ListOf(IsA(int), sample=Sample(1, 1, 0)),
+]
+
+NORMALIZED_VALUES = MERGED_VALUES + [
+    {'a': 1, 'b': [{'c': 'x'}, {'c': 5}]}, {'b': [None]}, {'b': [{'d': 'x'}]},
+    {'a': 1, 'b': [], 'e': {}}, {'e': {'f': 'x'}, 'z': 1}, {'x': 1, 'y': 2},
+    {'a': 'x', 'c': {}}, {'b': {'c': {}}}, {'b': {'c': {'d': 1}}},
+    [{'a': 2}, {'a': 'x'}, {}], [1, 'x', 2], [[{}]], {'a': [[{'b': 'x'}]]},
+]
+
+
+def outcome(func):
+    try:
+        return func()
+    except ValidationError as e:
+        return type(e), str(e), e.path
+
+
+def two_pass(spec, value):
+    merged = merge_defaults(spec, value)
+    validate(spec, merged)
+    return merged
+
+
+class TestNormalize:
+    """
+    `normalize()` is the same as `merge_defaults()` followed by `validate()`
+    """
+    def assert_same(self):
+        for spec in NORMALIZED_SPECS + merge_specs():
+            for value in NORMALIZED_VALUES:
+                expected = outcome(lambda: two_pass(spec, value))
+                actual = outcome(lambda: normalize(spec, value))
+                assert actual == expected, (spec, value)
+
+    def test_same_as_two_passes(self):
+        self.assert_same()
+
+    def test_collect_all_errors(self):
+        with collect_all_errors():
+            self.assert_same()
+
+    def test_sampling(self):
+        with sampling(first=1, last=1, rate=0):
+            self.assert_same()
+
+    def test_key_order(self):
+        spec = {'a': 1, opt_key('b'): int, 'c': 2, opt_key('x'): int}
+        value = {'x': 0, 'b': 1}
+        assert list(normalize(spec, value)) == ['a', 'c', 'x', 'b']
+        assert list(merge_defaults(spec, value)) == ['a', 'c', 'x', 'b']
+
+
+class TestInplace:
+    """
+    Merging in place gives the same results as merging into a copy
+    """
+    def test_same_as_copy(self):
+        for spec in merge_specs() + NORMALIZED_SPECS:
+            spec = translate(spec)
+            for value in NORMALIZED_VALUES:
+                if isinstance(spec, DictOf) and not spec._pairs:
+                    continue
+                expected = spec.get_default_for(copy.deepcopy(value))
+                value = copy.deepcopy(value)
+                assert spec.get_default_for(value, inplace=True) == expected, \
+                    (spec, value)
+
+    def test_containers_are_updated(self):
+        spec = {'a': 1, 'b': [{'c': 2, opt_key('x'): {'y': 3}}],
+                'd': nullable({'e': 4})}
+        value = {'b': [{}, {'x': {}}, None], 'd': {}, 'z': 0}
+        b = value['b']
+        b0, b1, x, d = b[0], b[1], b[1]['x'], value['d']
+        assert merge_defaults(spec, value, inplace=True) is value
+        assert value == {'a': 1, 'b': [{'c': 2}, {'c': 2, 'x': {}}, None],
+                         'd': {'e': 4}, 'z': 0}
+        # the existing keys come first
+        assert list(value) == ['b', 'd', 'z', 'a']
+        assert value['b'] is b and b[0] is b0 and b[1] is b1
+        assert b1['x'] is x and x == {}    # optional keys are not merged
+        assert value['d'] is d
+
+        # nothing is ever removed
+        value = {'a': 1}
+        assert DictOf([]).get_default_for(value, inplace=True) == {'a': 1}
+        assert DictOf([]).get_default_for(value) == {}
+
+    def test_ambiguous_combinator(self):
+        # two branches could modify the value, so none does
+        spec = Any([DictOf([(Equals('a'), IsA(int, default=1))]),
+                    DictOf([(Equals('b'), IsA(int, default=2))])])
+        value = {}
+        assert spec.get_default_for(value, inplace=True) is value
+        assert value == {}
+
+    def test_structured_dict(self):
+        class Entry(StructuredDictMixin, dict):
+            structure = {'foo': 1, 'bar': {'quux': 123}}
+
+        bar = {}
+        obj = Entry(bar=bar)
+        obj._insert_defaults()
+        assert obj == {'foo': 1, 'bar': {'quux': 123}}
+        # nested containers passed by the caller are not modified
+        assert obj['bar'] is not bar
+        assert bar == {}
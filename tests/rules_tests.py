@@ -27,7 +27,7 @@ import sys
 
 from monk import compat, errors
 from monk import (
-    Any, Anything, IsA, Equals, Exists, DictOf, translate,
+    Any, Anything, IsA, Equals, Exists, DictOf, OneOf, translate,
     one_of, optional, opt_key
 )
 
@@ -116,13 +116,13 @@ class TestShortcuts:
     def test_one_of(self):
         # literals (behaviour implicitly turned on)
 
-        assert one_of(['foo', 'bar']) == Equals('foo') | Equals('bar')
+        assert one_of(['foo', 'bar']) == OneOf(['foo', 'bar'])
 
         v = one_of(['foo', 'bar'])
         v('foo')
         with pytest.raises(errors.ValidationError) as excinfo:
             v('quux')
-        assert "AllFailed: must equal 'foo' or must equal 'bar'" in excinfo.exconly()
+        assert "AllFailed: must be one of 'foo', 'bar'" in excinfo.exconly()
 
         # non-literals → rules (behaviour explicitly turned on)
 
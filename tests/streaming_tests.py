@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+#
+#    Monk is an unobtrusive data modeling, manipulation and validation library.
+#    Copyright © 2011—2015  Andrey Mikhaylenko
+#
+#    This file is part of Monk.
+#
+#    Monk is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published
+#    by the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Monk is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU Lesser General Public License
+#    along with Monk.  If not, see <http://gnu.org/licenses/>.
+"""
+Streaming tests
+===============
+
+Each document is validated both after loading and as a stream; the outcomes
+must be identical.
+"""
+import io
+import json
+
+import pytest
+
+from monk.compat import text_type as t
+from monk import (
+    ListOf, ListOfAny, IsA, InRange, ValidationError, translate, nullable,
+    opt_key, collect_all_errors, validate_json, validate_json_events,
+)
+
+from . import outcome
+
+
+def events(value):
+    "Emulates ``ijson.basic_parse()``."
+    if isinstance(value, dict):
+        yield 'start_map', None
+        for k, v in value.items():
+            yield 'map_key', k
+            for event in events(v):
+                yield event
+        yield 'end_map', None
+    elif isinstance(value, list):
+        yield 'start_array', None
+        for v in value:
+            for event in events(v):
+                yield event
+        yield 'end_array', None
+    elif value is None:
+        yield 'null', None
+    elif isinstance(value, bool):
+        yield 'boolean', value
+    elif isinstance(value, int):
+        yield 'integer', value
+    elif isinstance(value, float):
+        yield 'double', value
+    else:
+        yield 'string', value
+
+
+def assert_same(spec, docs):
+    validator = translate(spec)
+    for doc in docs:
+        expected = outcome(validator, json.loads(doc))
+        for chunk_size in 1, 3, 1000:
+            stream = io.StringIO(t(doc))
+            assert outcome(lambda s: validate_json(spec, s, chunk_size),
+                           stream) == expected, (spec, doc, chunk_size)
+            stream = io.BytesIO(t(doc).encode('utf-8'))
+            assert outcome(lambda s: validate_json(spec, s, chunk_size),
+                           stream) == expected, (spec, doc, chunk_size)
+        assert outcome(lambda v: validate_json_events(spec, events(v)),
+                       json.loads(doc)) == expected, (spec, doc)
+
+
+DOCS = [
+    '[]',
+    ' [ ] ',
+    '[1]',
+    '[1, 2, 345678]',
+    '[1, "a", 2]',
+    '["a", 1]',
+    '[null]',
+    '[1.5, 2]',
+    '[[1], [2, 3]]',
+    '{"a": 1}',
+    '123',
+    'null',
+    u'["тест"]',
+    '[{"name": "x", "tags": ["a", "b"]}, {"name": "y"}]',
+    '[{"name": "x"}, {"name": 1}]',
+    '[{"name": "x", "extra": 1}]',
+    '[{"tags": []}]',
+    '[{"name": "a \\" ] , b", "tags": ["[", "{"]}]',
+]
+
+
+def test_lists():
+    assert_same([int], DOCS)
+    assert_same([nullable(int)], DOCS)
+    assert_same([[int]], DOCS)
+    assert_same(ListOf(IsA(int) & InRange(2)), DOCS)
+    assert_same(ListOfAny(IsA(int)), DOCS)
+    assert_same(~ListOf(IsA(int)), DOCS)
+    assert_same(ListOf(IsA(int), default=[1]), DOCS)
+
+
+def test_dicts():
+    assert_same([{'name': t, opt_key('tags'): [t]}], DOCS)
+    assert_same({'a': int}, DOCS)
+    assert_same(list, DOCS)
+    assert_same(None, DOCS)
+
+
+def test_collect_all_errors():
+    with collect_all_errors():
+        assert_same([int], DOCS + ['[1, "a", "b"]'])
+        assert_same(ListOfAny(IsA(int)), DOCS + ['["a", "b"]'])
+
+
+def test_malformed():
+    for doc in '[1,]', '[1 2]', '[1', '[{"a": 1]', '[1 }':
+        with pytest.raises(ValueError):
+            validate_json([int], io.StringIO(t(doc)), 2)
+    # extra data after the array
+    for doc in '[1] garbage', '[1, 2]]', '[] []', '[1],':
+        for chunk_size in 1, 2, 1000:
+            with pytest.raises(ValueError):
+                validate_json([int], io.StringIO(t(doc)), chunk_size)
+            with pytest.raises(ValueError):
+                validate_json(ListOfAny(IsA(int)), io.StringIO(t(doc)),
+                              chunk_size)
+    with pytest.raises(ValueError):
+        validate_json_events([int], iter([('start_array', None)]))
+    with pytest.raises(ValueError):
+        validate_json_events([int], iter([('start_array', None),
+                                          ('integer', 1),
+                                          ('end_array', None),
+                                          ('integer', 2)]))
+    with pytest.raises(ValueError):
+        validate_json_events([int], iter([]))
+
+
+class EndlessStream(object):
+    "An array of valid items followed by an invalid one and then forever."
+    def __init__(self):
+        self.chunks = iter(['[1'] + [', 2'] * 100 + [', "x"'])
+
+    def read(self, size):
+        return next(self.chunks, ', 3')
+
+
+def test_reads_lazily():
+    with pytest.raises(ValidationError) as excinfo:
+        validate_json([int], EndlessStream())
+    assert str(excinfo.value) == 'item #101: must be int'
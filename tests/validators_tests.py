@@ -21,15 +21,24 @@
 Validators tests
 ================
 """
+import gc
+import os
+import pickle
+import subprocess
+import sys
+import weakref
+
 from pytest import raises_regexp
 
 from monk import (
-    All, Any, Anything, IsA, HasAttr, Equals, Contains, InRange, Length,
+    BaseValidator, All, Any, Anything, IsA, HasAttr, Equals, OneOf, Contains, InRange, Length,
     DictOf, ListOf, ListOfAll, ListOfAny,
-    Exists, MISSING, translate,
-    ValidationError, MissingKeys, InvalidKeys,
+    Exists, MISSING, translate, translation_cache, collect_all_errors,
+    ValidationError, AllFailed, AtLeastOneFailed, MissingKeys, InvalidKeys, DictValueError,
     StructureSpecificationError,
-    optional,
+    optional, nullable, intern_table, Sample, sampling, optimize,
+    DefaultFactory,
+    merge_defaults,
 )
 
 
@@ -75,6 +84,45 @@ def test_equals():
         v('bar')
 
 
+def test_one_of():
+    v = OneOf(['foo', 1, [2]])
+
+    assert repr(v) == "must be one of 'foo', 1, [2]"
+
+    v('foo')
+    v(1)
+    v(True)    # same as Equals(1)
+    v([2])
+
+    with raises_regexp(AllFailed, "^must be one of 'foo', 1, \\[2\\]$"):
+        v('bar')
+    with raises_regexp(AllFailed, "^must be one of 'foo', 1, \\[2\\]$"):
+        v([3])
+
+    # same as Any([Equals(x), ...])
+    equals = Any([Equals(x) for x in v._choices])
+    for value in ['foo', 'bar', 1, 1.0, 2, None, [2], [3], {}]:
+        assert v.matches(value) == equals.matches(value)
+
+    # negated
+    with raises_regexp(ValidationError, "^not \\(must be one of 'foo', 1, \\[2\\]\\)$"):
+        (~v)('foo')
+    (~v)('bar')
+
+
+def test_one_of_repr_is_compact():
+    v = OneOf(range(5000))
+    assert repr(v) == ('must be one of 0, 1, 2, 3, 4, 5, 6, 7, 8, 9, '
+                       '... (5000 choices)')
+
+
+def test_one_of_defaults():
+    assert OneOf(['a']).get_default_for(None) == 'a'
+    assert OneOf(['a', 'b']).get_default_for(None) == None
+    assert OneOf(['a', 'b'], first_is_default=True).get_default_for(None) == 'a'
+    assert OneOf(['a', 'b'], first_is_default=True).get_default_for('c') == 'c'
+
+
 def test_contains():
     v = Contains('tech')
 
@@ -266,6 +314,55 @@ def test_dictof():
         dict_of_str_to_int({'foo': 123, 'bar': 456, 'quux': 4.2})
 
 
+def test_dictof_literal_keys():
+    v = DictOf([
+        (Equals('a'), IsA(int)),
+        (Equals('b') | ~Exists(), IsA(int)),
+        (~Exists() | Equals('c'), IsA(int)),
+        (IsA(str) | ~Exists(), IsA(str)),
+    ])
+    assert v._index == [('a', True), ('b', False), ('c', False), None]
+
+    v({'a': 1})
+    v({'a': 1, 'b': 2, 'c': 3, 'd': 'x'})
+    with raises_regexp(MissingKeys, "^must have keys: 'a'$"):
+        v({'b': 2})
+    with raises_regexp(DictValueError, "^'b' value must be int$"):
+        v({'a': 1, 'b': 'x'})
+    with raises_regexp(DictValueError, "^'d' value must be str$"):
+        v({'a': 1, 'd': 4})
+
+    # errors are reported in the order of pairs, not data keys
+    with raises_regexp(DictValueError, "^'a' value must be int$"):
+        v({'b': 'x', 'a': 'x'})
+
+    # invalid keys win over missing ones
+    with raises_regexp(InvalidKeys, '^must not have keys like 5$'):
+        v({5: 1})
+
+
+def test_dictof_pattern_before_literal():
+    # a pattern which comes first claims the key
+    v = DictOf([
+        (IsA(str), IsA(str)),
+        (Equals('a'), IsA(int)),
+    ])
+    with raises_regexp(DictValueError, "^'a' value must be str$"):
+        v({'a': 1})
+    with raises_regexp(MissingKeys, "^must have keys: 'a'$"):
+        v({'a': 'x'})
+
+
+def test_dictof_non_string_literal_keys():
+    v = DictOf([
+        (Equals(1), IsA(int)),
+    ])
+    assert v._index == [None]
+    v({1: 1})
+    with raises_regexp(DictValueError, '^True value must be int$'):
+        v({True: 'x'})
+
+
 def test_exists():
     must_exist = Exists()
 
@@ -319,6 +416,177 @@ def test_combinator_all():
         v('fooo')
 
 
+class Spy(IsA):
+    "Counts the checks; only implements _check()"
+    def __init__(self, expected_type):
+        super(Spy, self).__init__(expected_type)
+        self.calls = []
+
+    def _check(self, value):
+        self.calls.append(value)
+        super(Spy, self)._check(value)
+
+
+def test_any_stops_at_first_success():
+    spy = Spy(int)
+    v = Any([IsA(str), Equals(None), spy])
+    v('foo')
+    v(None)
+    assert spy.calls == []
+
+    v(1)
+    assert spy.calls == [1]
+
+    with raises_regexp(AllFailed,
+                       '^must be str or must equal None or must be int$'):
+        v(1.5)
+
+
+def test_list_of_any_stops_at_first_success():
+    spy = Spy(int)
+    v = ListOfAny(spy)
+    v([1, 'a', 'b'])
+    assert spy.calls == [1]
+
+    with raises_regexp(AllFailed, '^item #0: must be int or item #1: must be int$'):
+        v(['a', 'b'])
+
+
+def _outcome(func):
+    try:
+        func()
+    except ValidationError as e:
+        return type(e), str(e)
+
+
+def test_list_of_iterate():
+    values = [[], [1], [1, 2], ['a'], [1, 'a'], ['a', 1], ['a', 'b'], [None]]
+    validators = [
+        ListOf(IsA(int)), ListOfAny(IsA(int)), ListOf(optional(int)),
+        ListOfAny(optional(int)), ~ListOf(IsA(int)), ~ListOfAny(IsA(int)),
+        ListOf(ListOf(IsA(int))),
+    ]
+    for v in validators:
+        for value in values:
+            consume = lambda: list(v.iterate(iter(value)))
+            assert _outcome(consume) == _outcome(lambda: v(value)), (v, value)
+            with collect_all_errors():
+                assert (_outcome(consume) ==
+                        _outcome(lambda: v(value))), (v, value)
+
+    # items are passed through as they are checked
+    v = ListOf(IsA(int))
+    seen = []
+    with raises_regexp(ValidationError, '^item #2: must be int$'):
+        for item in v.iterate(x for x in [1, 2, 'a', 3]):
+            seen.append(item)
+    assert seen == [1, 2]
+
+    # the rest is not checked once the outcome is known
+    spy = Spy(int)
+    items = ListOfAny(spy).iterate(iter(['a', 1, 'b', 'c']))
+    assert list(items) == ['a', 1, 'b', 'c']
+    assert spy.calls == ['a', 1]
+
+
+def test_list_of_sample():
+    sample = Sample(first=3, last=2, rate=0.1, seed=1)
+    assert sample.indexes(5) is None
+    assert sample.indexes(6) is None
+    indexes = list(sample.indexes(100))
+    assert indexes[:3] == [0, 1, 2]
+    assert indexes[-2:] == [98, 99]
+    assert len(indexes) == 3 + 2 + 10
+    assert indexes == sorted(set(indexes))
+    assert list(sample.indexes(100)) == indexes
+    assert list(Sample(first=3, last=2, rate=0.1, seed=2).indexes(100)) != \
+        indexes
+
+    spy = Spy(int)
+    v = ListOf(spy, sample=sample)
+    v(list(range(100)))
+    assert spy.calls == indexes
+    v = ListOf(IsA(int), sample=sample)
+    assert v != ListOf(IsA(int))
+    assert v == ListOf(IsA(int), sample=Sample(3, 2, 0.1, 1))
+
+    # short lists are checked completely
+    with raises_regexp(ValidationError, '^item #5: must be int$') as excinfo:
+        v(list(range(5)) + ['x'])
+    assert not excinfo.value.sampled
+
+    # the errors report real indexes
+    with raises_regexp(ValidationError, '^item #99: must be int$') as excinfo:
+        v(list(range(99)) + ['x'])
+    assert excinfo.value.sampled
+    assert excinfo.value.path == (99,)
+
+    v = ListOfAny(IsA(str), sample=Sample(first=1, last=1, rate=0))
+    v(['a'] + list(range(10)))
+    with raises_regexp(AllFailed, '^item #0: must be str or item #10: must '
+                                  'be str$') as excinfo:
+        v([1, 'a'] + list(range(9)))
+    assert excinfo.value.sampled
+    assert not v.matches([1, 'a'] + list(range(9)))
+
+    # global setting; the nested error is marked, too
+    v = translate({'a': [int]})
+    value = {'a': ['x'] + list(range(1000))}
+    with raises_regexp(ValidationError, "^'a' value item #0: must be int$"):
+        v(value)
+    with sampling(first=0, last=10):
+        v(value)
+        assert v.matches(value)
+        value['a'].append('x')
+        with raises_regexp(ValidationError,
+                           "^'a' value item #1001: must be int$") as excinfo:
+            v(value)
+        assert excinfo.value.sampled
+        # the validator's own sample takes precedence
+        v = ListOf(IsA(int), sample=Sample(first=1, last=0, rate=0))
+        with raises_regexp(ValidationError, '^item #0: must be int$'):
+            v(value['a'])
+
+
+def test_collect_all_errors():
+    spy = Spy(int)
+    v = Any([IsA(str), spy])
+    with collect_all_errors():
+        v('foo')
+    assert spy.calls == ['foo']
+
+    v = ListOfAny(Spy(int))
+    with collect_all_errors():
+        v([1, 'a', 'b'])
+    assert v._nested_validator.calls == [1, 'a', 'b']
+
+    v = ListOf(IsA(int))
+    with raises_regexp(ValidationError, '^item #1: must be int$'):
+        v([1, 'a', 'b'])
+    with collect_all_errors():
+        with raises_regexp(AtLeastOneFailed,
+                           '^item #1: must be int and item #2: must be int$'):
+            v([1, 'a', 'b'])
+
+    v = All([Length(min=2), IsA(list)])
+    with raises_regexp(ValidationError, r'^must have length of 2\.\.$'):
+        v('a')
+    with collect_all_errors():
+        with raises_regexp(AtLeastOneFailed,
+                           r'^must have length of 2\.\. and must be list$'):
+            v('a')
+
+        # nested contexts
+        with collect_all_errors():
+            pass
+        with raises_regexp(AtLeastOneFailed, 'and'):
+            v('a')
+
+    # back to normal
+    with raises_regexp(ValidationError, r'^must have length of 2\.\.$'):
+        v('a')
+
+
 def test_magic_eq():
     assert IsA(str) == IsA(str)
     assert IsA(str) != IsA(str, default='foo')
@@ -360,6 +628,78 @@ def test_magic_hash():
     assert hash(IsA(str)) != hash(IsA(str, default='foo'))
     assert hash(IsA(str)) != hash(IsA(int))
     assert hash(IsA(str)) != hash(IsA(str) | IsA(int))
+    assert hash(IsA(str)) != hash(~IsA(str))
+    assert hash(IsA(str)) == hash(~~IsA(str))
+
+    # same attributes, different classes
+    assert InRange(1, 2) != Length(1, 2)
+    assert hash(InRange(1, 2)) != hash(Length(1, 2))
+
+    class MyIsA(IsA):
+        pass
+
+    assert MyIsA(int) != IsA(int)
+    assert IsA(int) != MyIsA(int)
+
+    # equal attributes of different types
+    assert Equals(1) != Equals(1.0)
+    assert Equals(1) != Equals(True)
+
+    # usable as dictionary keys
+    memo = {translate({'foo': [int]}): 1}
+    assert memo[translate({'foo': [int]})] == 1
+    assert translate({'foo': [str]}) not in memo
+
+
+def test_slots():
+    validators = [
+        Anything(), IsA(str), Equals(1), OneOf([1, 2]), Contains(1), Exists(),
+        HasAttr('x'), InRange(1, 2), Length(1, 2), IsA(str) | IsA(int),
+        IsA(str) & IsA(int), ListOf(int), ListOfAny(int),
+        DictOf([(Equals('a'), IsA(int))]), ~IsA(str),
+    ]
+    for v in validators:
+        assert not hasattr(v, '__dict__'), v
+
+    # subclasses without __slots__ still work
+    class Even(IsA):
+        def __init__(self, note):
+            super(Even, self).__init__(int)
+            self.note = note
+
+    assert Even('a') == Even('a')
+    assert Even('a') != Even('b')
+    assert hash(~Even('a')) != hash(Even('a'))
+
+
+def test_pickle():
+    validators = [
+        Anything(), IsA(str), Equals(1), OneOf([1, [2]]), Contains(1),
+        ~Exists(), HasAttr('x'), InRange(1, 2), Length(max=2),
+        IsA(str) | ~IsA(int), All([IsA(int), InRange(2)]), ListOf(int),
+        ~ListOfAny(int), translate({'a': [{'b': int}], optional('c'): str}),
+    ]
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        for v in validators:
+            clone = pickle.loads(pickle.dumps(v, protocol))
+            assert clone == v
+            assert clone.negated == v.negated
+            assert clone.fingerprint == v.fingerprint
+        assert pickle.loads(pickle.dumps(MISSING, protocol)) is MISSING
+
+
+def test_fingerprint_is_stable():
+    code = ('from monk import translate, opt_key, nullable; '
+            'print(translate({"a": [int], opt_key("b"): nullable(str), '
+            '"c": {"d": 1.5}}).fingerprint)')
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    fingerprints = set()
+    for seed in '1', '2':
+        env = dict(os.environ, PYTHONHASHSEED=seed)
+        output = subprocess.check_output([sys.executable, '-c', code],
+                                         cwd=root, env=env)
+        fingerprints.add(output.strip())
+    assert len(fingerprints) == 1
 
 
 def test_combinator_edge_cases():
@@ -387,10 +727,11 @@ def test_translate_type():
 
 
 def test_translate_func():
-    # FIXME things like datetime.now() imply transient defaults
+    # the function is called on each merge, not once
     def func():
         return 'hello'
-    assert translate(func) == IsA(str, default='hello')
+    assert translate(func) == IsA(str, default=DefaultFactory(func))
+    assert translate(func).get_default_for(None) == 'hello'
 
 
 def test_translate_list():
@@ -437,6 +778,251 @@ def test_translate_fallback():
     assert translate('hello') == IsA(str, default='hello')
 
 
+def test_translate_cache():
+    translation_cache.clear()
+
+    # equal specs share the validator even if they are different objects
+    v = translate({'a': [int], 'b': {'c': 'x'}})
+    assert translate({'a': [int], 'b': {'c': 'x'}}) is v
+    assert translation_cache.stats() == dict(hits=1, misses=1, skipped=0,
+                                             size=1, maxsize=512)
+
+    # the structure matters, including key order and literal types
+    assert translate({'b': {'c': 'x'}, 'a': [int]}) is not v
+    assert translate(1) is not translate(True)
+    assert translate(1.0) == IsA(float, default=1.0)
+    assert translate(0.0) is not translate(-0.0)
+
+    # callable defaults are called on merge, so they can be cached...
+    values = iter([1, 2, 3])
+    func = lambda: next(values)
+    v = translate({'a': func})
+    assert translate({'a': func}) is v
+    assert v.get_default_for({}) == {'a': 2}
+    assert v.get_default_for({}) == {'a': 3}
+
+    # ...but callable keys are called on translation
+    key_func = lambda: 'b'
+    assert translate({key_func: int}) == DictOf([(Equals('b'), IsA(int))])
+    translate({key_func: int})
+    assert translation_cache.stats()['skipped'] == 2
+
+    translation_cache.clear()
+    assert translation_cache.stats() == dict(hits=0, misses=0, skipped=0,
+                                             size=0, maxsize=512)
+
+
+def test_translate_cache_lru():
+    translation_cache.clear()
+    translation_cache.maxsize = 2
+    try:
+        a = translate({'a': int})
+        b = translate({'b': int})
+        assert translate({'a': int}) is a    # "a" is now the most recent
+        translate({'c': int})                # "b" is evicted
+        assert len(translation_cache) == 2
+        assert translate({'a': int}) is a
+        assert translate({'b': int}) is not b
+
+        translation_cache.maxsize = 0        # disabled
+        assert translate({'a': int}) is not translate({'a': int})
+    finally:
+        translation_cache.maxsize = 512
+        translation_cache.clear()
+
+
+def test_intern_table():
+    intern_table.clear()
+    intern_table.enabled = True
+    try:
+        address = {'street': str, 'city': str}
+        a = translate(address)
+        b = translate({'home': address, 'work': dict(address)})
+        assert b._pairs[0][1] is a
+        assert b._pairs[1][1] is a
+        assert intern_table.hits > 0
+
+        # shortcuts
+        assert nullable(str) is nullable(str)
+        assert optional(int) is optional(int)
+        assert optional(int) is not ~optional(int)
+
+        # explicitly created validators
+        v = DictOf([(Equals('street'), IsA(str)), (Equals('city'), IsA(str))])
+        assert translate(v) is a
+
+        intern_table.enabled = False
+        assert nullable(str) is not nullable(str)
+    finally:
+        intern_table.enabled = False
+        intern_table.clear()
+
+
+def test_intern_table_translate_cache_keeps_nested_specs():
+    # the translation cache identifies nested validators by `id()`; if the
+    # interned result does not refer to such a validator, the cache entry
+    # must keep it alive, otherwise its id could be reused by another one
+    translation_cache.clear()
+    intern_table.clear()
+    intern_table.enabled = True
+    try:
+        canonical = translate(int)
+        spec = IsA(int)
+        ref = weakref.ref(spec)
+        v = translate({'a': spec})
+        assert v._pairs[0][1] is canonical
+        del spec
+        gc.collect()
+        assert ref() is not None
+
+        for _ in range(100):
+            v = translate({'a': IsA(str)})
+            v({'a': 'hello'})
+    finally:
+        intern_table.enabled = False
+        intern_table.clear()
+        translation_cache.clear()
+
+
+def test_optimize():
+    values = [None, MISSING, True, 0, 1, 5, 1.5, 'a', 'x', [], [1, None], {},
+              {'a': None}, {'a': 1}, {'a': 'x'}, {'b': 1}]
+    specs = [
+        nullable(int), optional(int), ~nullable(int),
+        IsA(int) | IsA(float) | Equals('x') | IsA(str) | Equals(None),
+        Any([Any([IsA(int), IsA(float)]), Equals(None)]),
+        ~Any([Any([IsA(int), ~IsA(bool)]), Equals(None)]),
+        All([All([IsA(int), InRange(0)]), InRange(max=3)]),
+        All([IsA(list), ~All([Length(1), Length(max=1)])]),
+        Any([IsA(int, default=1), IsA(float)]), ~Equals(None), InRange(0, 3),
+        {'a': nullable(int), optional('b'): [IsA(int) | IsA(str)]},
+        {Any([Any([Equals('a'), Equals('b')]), Equals('c')]): int},
+        [nullable(int)],
+        # flattening must not change the defaults
+        Any([Any([Anything(), Anything()]), IsA(int, default=5)]),
+        All([All([Anything(), Anything()]), IsA(int, default=5)]),
+        Any([Any([IsA(int, default=1), Anything()]), IsA(str, default='a')]),
+        Any([Any([translate({'a': 1}), Anything()]), IsA(int, default=5)]),
+        Any([Any([IsA(int), IsA(float)]), IsA(str, default='a')]),
+    ]
+    for spec in specs:
+        v = translate(spec)
+        optimized = optimize(v)
+        for value in values:
+            def outcome(func):
+                try:
+                    func(value)
+                except ValidationError as e:
+                    return type(e), str(e)
+            for collect_all in False, True:
+                if collect_all:
+                    with collect_all_errors():
+                        expected, actual = outcome(v), outcome(optimized)
+                else:
+                    expected, actual = outcome(v), outcome(optimized)
+                assert actual == expected, (spec, value)
+            assert optimized.matches(value) == v.matches(value), (spec, value)
+            if value is not MISSING:
+                assert (merge_defaults(optimized, value) ==
+                        merge_defaults(v, value)), (spec, value)
+
+    # rewrites
+    v = Any([Any([IsA(int), IsA(float)]), Equals(None), IsA(str, default='a')])
+    optimized = optimize(v)
+    assert type(optimized) is Any
+    fused, default = optimized._specs
+    assert fused.expected_type == (int, float, type(None))
+    assert default is v._specs[2]
+    assert type(v._specs[0]) is Any    # the original is not modified
+    assert optimize(optimized) == optimized
+
+    v = All([All([IsA(int), InRange(0)]), ~All([IsA(bool)])])
+    assert len(optimize(v)._specs) == 3
+
+    # the inner combinator is kept if its branches may have no defaults
+    # while the other validators have one
+    v = Any([Any([Anything(), Anything()]), IsA(int, default=5)])
+    assert len(optimize(v)._specs) == 2
+    v = Any([Any([translate({'a': 1}), Anything()]), IsA(int, default=5)])
+    assert len(optimize(v)._specs) == 3
+
+    assert optimize(Any([IsA(int), IsA(float)], first_is_default=True)) == \
+        Any([IsA(int), IsA(float)], first_is_default=True).__class__(
+            optimize(Any([IsA(int), IsA(float)]))._specs,
+            first_is_default=True)
+    assert len(optimize(Any([Any([IsA(int)], first_is_default=True),
+                             IsA(str)]))._specs) == 2
+
+    # unchanged subtrees are shared
+    v = translate({'a': [int], 'b': nullable(int)})
+    optimized = optimize(v)
+    assert optimized._pairs[0][1] is v._pairs[0][1]
+    assert optimized._pairs[1][1] is not v._pairs[1][1]
+
+
+
+class QuickAny(Any):
+    __slots__ = ()
+    adapt_every = 10
+
+
+def test_adaptive_any():
+    v = QuickAny([Equals(1), IsA(float), IsA(str)], adaptive=True)
+    for _ in range(20):
+        v('x')
+    v(1.5)
+    assert v.hits == [0, 1, 20]
+    assert v._order == [2, 0, 1]
+
+    # the errors and their order are the same
+    for value in None, 2:
+        with raises_regexp(AllFailed,
+                           '^must equal 1 or must be float or must be str$'):
+            v(value)
+    with collect_all_errors():
+        v('y')
+        with raises_regexp(AllFailed, '^must equal 1 or must be float'):
+            v(None)
+    assert v.matches(1) and not v.matches(None)
+
+    # the defaults are the same
+    v = QuickAny([IsA(int, default=0), IsA(str)], first_is_default=True,
+                 adaptive=True)
+    for _ in range(20):
+        v('x')
+    assert v._order == [1, 0]
+    assert merge_defaults(v, None) == 0
+    assert merge_defaults(v, None) == merge_defaults(
+        Any([IsA(int, default=0), IsA(str)], first_is_default=True), None)
+
+    # statistics are not part of the structure and are not copied
+    assert v == QuickAny([IsA(int, default=0), IsA(str)], first_is_default=True,
+                         adaptive=True)
+    assert v != QuickAny([IsA(int, default=0), IsA(str)], first_is_default=True)
+    assert (~v).hits == [0, 0]
+    assert pickle.loads(pickle.dumps(Any([IsA(int)], adaptive=True))).hits == [0]
+
+    # nested validators that may have side effects are never reordered
+    v = QuickAny([Equals(1), HasAttr('real')], adaptive=True)
+    for _ in range(20):
+        v(1.5)
+    assert v.hits == [0, 20]
+    assert v._order is None
+
+
+def test_optimize_adaptive():
+    v = translate({'a': IsA(int) | Equals('x'), 'b': nullable(int),
+                   'c': Any([IsA(str)])})
+    optimized = optimize(v, adaptive=True)
+    a, b, c = [value for key, value in optimized._pairs]
+    assert a._adaptive
+    assert not b._adaptive    # fused into a single check
+    assert not c._adaptive
+    assert not v._pairs[0][1]._adaptive    # the original is not modified
+    optimized({'a': 'x', 'b': None, 'c': 'y'})
+    assert a.hits == [0, 1]
+
+
 def test_invert_requirement():
     says_hello = Equals('hello')
     says_hello('hello')
@@ -483,6 +1069,78 @@ def test_double_invert_requirement():
         c('bye')
 
 
+def test_matches():
+    values = [None, MISSING, True, 0, 5, 2.5, '', 'foo', [], [1], ['a', 1],
+              {}, {'a': 1}, {'a': 'b'}, {'b': 1}, {1: 2}]
+    validators = [
+        Anything(), IsA(int), Equals(5), Contains(1), Exists(), ~Exists(),
+        HasAttr('__len__'), InRange(1, 4), Length(max=1), ~IsA(str),
+        IsA(int) | IsA(str), IsA(int) & InRange(1), ~(IsA(int) | IsA(str)),
+        ListOf(IsA(int)), ListOfAny(IsA(int)), ListOf(optional(int)),
+        ~ListOf(IsA(int)),
+        DictOf([(Equals('a'), IsA(int))]),
+        DictOf([(Equals('a') | ~Exists(), IsA(int))]),
+        DictOf([(IsA(str), IsA(int))]),
+        DictOf([(IsA(int), InRange(1))]),
+        ~DictOf([(Equals('a'), IsA(int))]),
+    ]
+    for v in validators:
+        for value in values:
+            try:
+                v(value)
+            except ValidationError:
+                expected = False
+            except TypeError:
+                continue
+            else:
+                expected = True
+            assert v.matches(value) == expected, (v, value)
+
+
+def test_matches_custom_check():
+    class Even(IsA):
+        def __init__(self):
+            super(Even, self).__init__(int)
+
+        def _check(self, value):
+            super(Even, self)._check(value)
+            if value % 2:
+                self._raise_error(value)
+
+    assert Even().matches(2)
+    assert not Even().matches(3)
+    assert not Even().matches('a')
+    assert (~Even()).matches(3)
+
+
+def test_matches_custom_call():
+    class Prefixed(BaseValidator):
+        def __call__(self, value):
+            if not str(value).startswith('x_'):
+                raise ValidationError('must start with x_')
+
+    assert Prefixed().matches('x_a')
+    assert not Prefixed().matches('a')
+
+    DictOf([(Prefixed(), IsA(int))])({'x_a': 1})
+    with raises_regexp(InvalidKeys, "^must not have keys like 'a'$"):
+        DictOf([(Prefixed(), IsA(int))])({'a': 1})
+    Any([Prefixed(), IsA(int)])(5)
+    Any([Prefixed(), IsA(int)])('x_a')
+    ListOfAny(Prefixed())([1, 'x_a'])
+
+
+def test_invert_shares_nested_validators():
+    v = DictOf([(Equals('a'), ListOf(IsA(int)))])
+    inverted = ~v
+    assert inverted.negated
+    assert not v.negated
+    assert inverted._pairs is v._pairs
+    assert inverted != v
+    assert ~inverted == ~~v
+    assert repr(inverted) == "~DictOf([(must equal 'a', ListOfAll(must be int))])"
+
+
 def test_regression_22():
     ~Anything()
     ~IsA(str)